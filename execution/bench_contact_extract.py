@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+bench_contact_extract.py
+------------------------
+Micro-benchmark: regex antigua de emails vs extractor anclado en '@'
+(contact_extract.extract_emails) sobre páginas sintéticas del tamaño de
+las que sirven los portales inmobiliarios: HTML de listados, JS inline
+minificado e imágenes en base64 (data URIs).
+
+Uso:
+    python bench_contact_extract.py [--sizes 100 500 2000] [--repeat 3]
+
+Los tamaños son KB de página. La regex antigua es cuadrática en las rachas
+largas sin '@', así que en las páginas grandes puede tardar bastante.
+"""
+
+import argparse
+import base64
+import random
+import re
+import time
+
+from contact_extract import extract_emails, is_valid_email
+
+# La regex que usaban scrape_emails_from_webs.py y final_lead_builder*.py
+LEGACY_EMAIL_REGEX = re.compile(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}")
+
+
+def legacy_extract(html: str) -> list[str]:
+    return [e for e in set(LEGACY_EMAIL_REGEX.findall(html)) if is_valid_email(e)]
+
+
+def synthetic_page(kb: int, seed: int = 0) -> str:
+    """Mezcla realista: ~50% listados, ~30% JS minificado, ~20% base64."""
+    rnd = random.Random(seed)
+    target = kb * 1024
+    listing = (
+        '<div class="card"><h3>Piso en {barrio}</h3><p>{m2} m² · {hab} hab · '
+        '{precio} €/mes</p><a href="/inmueble/{ref}">Ver ficha</a></div>\n'
+    )
+    barrios = ["Delicias", "Actur", "Centro", "Universidad", "San José", "Torrero"]
+    parts: list[str] = ["<html><head><title>Inmobiliaria</title></head><body>"]
+    size = 0
+    while size < target:
+        roll = rnd.random()
+        if roll < 0.5:
+            chunk = "".join(listing.format(barrio=rnd.choice(barrios), m2=rnd.randint(40, 140),
+                                           hab=rnd.randint(1, 5), precio=rnd.randint(300, 1500),
+                                           ref=rnd.randint(10000, 99999)) for _ in range(20))
+        elif roll < 0.8:
+            # Identificadores largos sin espacios, como en un bundle minificado
+            ident = "".join(rnd.choice("abcdefghijklmnopqrstuvwxyz_0123456789") for _ in range(4000))
+            chunk = f"<script>var {ident}=function(a,b){{return a.b+b.c}};</script>\n"
+        else:
+            blob = base64.b64encode(rnd.randbytes(6000)).decode()
+            chunk = f'<img src="data:image/png;base64,{blob}">\n'
+        parts.append(chunk)
+        size += len(chunk)
+    parts.append('<footer>Contacto: <a href="mailto:info@inmobiliaria-demo.es">info@inmobiliaria-demo.es</a>'
+                 ' · ventas [at] inmobiliaria-demo [dot] es</footer></body></html>')
+    return "".join(parts)
+
+
+def timed(fn, html: str, repeat: int) -> tuple[float, list[str]]:
+    best = float("inf")
+    result: list[str] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(html)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de extracción de emails.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000], help="KB por página")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'KB':>6} {'regex antigua':>14} {'extractor':>10} {'x':>7}  emails")
+    for kb in args.sizes:
+        html = synthetic_page(kb)
+        t_old, old = timed(legacy_extract, html, args.repeat)
+        t_new, new = timed(extract_emails, html, args.repeat)
+        print(f"{kb:>6} {t_old * 1000:>12.1f}ms {t_new * 1000:>8.1f}ms {t_old / t_new:>6.0f}x  "
+              f"antigua={sorted(old)} nueva={sorted(new)}")
+
+
+if __name__ == "__main__":
+    main()
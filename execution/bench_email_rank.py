@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+bench_email_rank.py
+-------------------
+Benchmark: elección del mejor email por lead con los bucles por fila
+(best_email() de antes + regex de clean_bad_leads.py por fila, y el
+best_email() actual llamado lead a lead) frente al motor vectorizado de
+email_rank.py, sobre candidatos sintéticos (varios por lead, con dominios
+propios, gratuitos, desechables y basura).
+
+Comprueba además que el motor vectorizado elige exactamente lo mismo que
+contact_extract.best_email.
+
+Uso:
+    python bench_email_rank.py [--candidates 1000000] [--per-lead 3] [--repeat 1]
+"""
+
+import argparse
+import random
+import re
+import time
+
+import pandas as pd
+
+from contact_extract import best_email
+from email_rank import best_contacts
+
+# Lo que había antes: prefijos en bucle y la regex de clean_bad_leads.py sin compilar
+LEGACY_PREFIXES = ("info", "contacto", "contact", "hola", "inmobiliaria", "oficina", "admin")
+
+
+def legacy_best_email(emails: list[str]) -> str:
+    for prefix in LEGACY_PREFIXES:
+        for e in emails:
+            if e.startswith(prefix):
+                return e
+    return emails[0] if emails else ""
+
+
+def legacy_loop(emails: list[list[str]], domains: list[str]) -> list[str]:
+    out = []
+    for candidates in emails:
+        valid = [e for e in candidates
+                 if re.match(r"^[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}$", e.strip())]
+        out.append(legacy_best_email(valid))
+    return out
+
+
+def scalar_loop(emails: list[list[str]], domains: list[str]) -> list[str]:
+    return [best_email(candidates, domain) for candidates, domain in zip(emails, domains)]
+
+
+def vectorized(emails: list[list[str]], domains: list[str]) -> list[str]:
+    return best_contacts(pd.Series(emails), pd.Series(domains)).tolist()
+
+
+def synthetic_candidates(total: int, per_lead: int, seed: int = 0) -> tuple[list[list[str]], list[str]]:
+    rnd = random.Random(seed)
+    locals_ = ["info", "contacto", "hola", "oficina", "admin", "ventas", "juan.perez", "maria", "alquileres"]
+    free = ["gmail.com", "hotmail.com", "yahoo.es", "outlook.es"]
+    junk = ["sin-arroba.es", "a@b", "x@@y.es", "foto@2x.png", "   ", " Info@Inmo.ES ", "a b@c.es",
+            "info@x.c0m", "ñoño@x.es", "info@example.com", "yourdomain@x.es", "@x.es", "x@.es"]
+    emails, domains = [], []
+    for lead in range(max(1, total // per_lead)):
+        own = f"inmo{lead}.es"
+        candidates = []
+        for _ in range(per_lead):
+            roll = rnd.random()
+            if roll < 0.45:
+                candidates.append(f"{rnd.choice(locals_)}@{own}")
+            elif roll < 0.7:
+                candidates.append(f"{rnd.choice(locals_)}{lead}@{rnd.choice(free)}")
+            elif roll < 0.85:
+                candidates.append(f"{rnd.choice(locals_)}@agencia{rnd.randint(1, 500)}.com")
+            elif roll < 0.9:
+                candidates.append(f"{rnd.choice(locals_)}@yopmail.com")
+            else:
+                candidates.append(rnd.choice(junk))
+        emails.append(candidates)
+        domains.append(own if rnd.random() < 0.8 else "")
+    return emails, domains
+
+
+def timed(fn, emails, domains, repeat: int) -> tuple[float, list[str]]:
+    best = float("inf")
+    result: list[str] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(emails, domains)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del ranking de emails.")
+    parser.add_argument("--candidates", type=int, default=1_000_000)
+    parser.add_argument("--per-lead", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    emails, domains = synthetic_candidates(args.candidates, max(1, args.per_lead))
+    total = sum(map(len, emails))
+    print(f"📋 {len(emails)} leads, {total} candidatos")
+
+    t_legacy, _ = timed(legacy_loop, emails, domains, args.repeat)
+    t_scalar, scalar = timed(scalar_loop, emails, domains, args.repeat)
+    t_vector, vector = timed(vectorized, emails, domains, args.repeat)
+    mismatches = sum(a != b for a, b in zip(scalar, vector))
+
+    print(f"{'método':<28} {'tiempo':>9} {'cand/s':>12}")
+    for name, t in (("bucle antiguo (por fila)", t_legacy), ("best_email() lead a lead", t_scalar),
+                    ("email_rank vectorizado", t_vector)):
+        print(f"{name:<28} {t:>8.2f}s {total / t:>12,.0f}")
+    print(f"{'✅' if not mismatches else '❌'} vectorizado vs best_email(): {mismatches} diferencias")
+
+
+if __name__ == "__main__":
+    main()
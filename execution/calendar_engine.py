@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+calendar_engine.py
+------------------
+Motor de calendarios de contenido: N días × canales × ciudades a partir de
+una configuración (fases, rotación de pilares, KPI, temas), en vez del
+bucle día a día con "day <= 30 / <= 60" repetido en cada generador.
+
+- Fases por límites: `end` es el último día de la fase en un plan de
+  `base_days` días y se escala al número de días pedido (un plan de 365
+  días mantiene las proporciones del de 90). La fase de cada día sale de un
+  np.searchsorted sobre los límites.
+- Rotación de pilares por fase: todas las rotaciones van a un único array
+  y el pilar de cada día es un índice (offset de su fase + (día-1) % largo
+  de la rotación), igual que el `p_rotation[(day - 1) % 7]` de antes.
+- Temas y KPI se reparten por índice; las columnas de texto salen como
+  pd.Categorical (códigos + categorías): un año × 10 ciudades × 3 canales
+  son unos milisegundos.
+- render() escribe CSV o XLSX (una hoja por canal, vía workbook_export).
+
+Uso:
+    from calendar_engine import SPECS, build_calendar, render
+    calendar = build_calendar({"tiktok": SPECS["tiktok"]}, days=365, cities=["Zaragoza", "Madrid"])
+    render(calendar, "calendario.xlsx")
+
+    python calendar_engine.py --days 365 --channels tiktok linkedin --cities Zaragoza Madrid \\
+        [--start 2026-01-05] -o calendario.xlsx
+"""
+
+import argparse
+import os
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+# ── Config ─────────────────────────────────────────────────────────────────
+DEFAULT_THEME = "Contenido variado"
+
+COLUMNS = ["Ciudad", "Canal", "Día", "Fecha", "Semana", "Fase", "Pilar", "Tema / Ángulo", "Objetivo / KPI", "Formato"]
+
+
+@dataclass(frozen=True)
+class Phase:
+    name: str
+    end: int | None            # último día en un plan de base_days días (None = hasta el final)
+    kpi: str
+    rotation: tuple[str, ...]  # pilares que se van turnando, por día del plan
+
+
+@dataclass(frozen=True)
+class CalendarSpec:
+    phases: tuple[Phase, ...]
+    themes: dict[str, str] = field(default_factory=dict)
+    format: str = ""
+    base_days: int = 90
+
+
+TIKTOK_ROTATIONS = (
+    # Más contenido viral / de vida en Zaragoza
+    ("Zaragoza Life", "Relatable/Humor", "Housing Hacks", "Zaragoza Life", "Relatable/Humor", "Livix Club",
+     "Zaragoza Life"),
+    # Más educativo / de autoridad
+    ("Housing Hacks", "Housing Hacks", "Livix Club", "Zaragoza Life", "Housing Hacks", "Livix Club", "Landlord POV"),
+    # Más producto / conversión
+    ("Product/Tour", "Livix Club", "Housing Hacks", "Product/Tour", "Livix Club", "Landlord POV", "UGC/Testimonial"),
+)
+
+TIKTOK_THEMES = {
+    "Housing Hacks": "Hack de alquiler / Contratos / Estafas",
+    "Livix Club": "Descuento destacado / Ahorro estudiante",
+    "Zaragoza Life": "Guía de Barrio / Transporte / Ocio",
+    "Relatable/Humor": "Dramas de estudiante / Memes locales",
+    "Product/Tour": "Tour de piso premium / Review App",
+    "Landlord POV": "Rentabilidad / Seguridad para propietarios",
+    "UGC/Testimonial": "Historia de éxito de usuario real",
+}
+
+SPECS = {
+    # generate_elite_matrix.py
+    "elite": CalendarSpec(
+        phases=(
+            Phase("1: Discovery (Viral)", 30, "Alcance", TIKTOK_ROTATIONS[0]),
+            Phase("2: Authority (Value)", 60, "Engagement", TIKTOK_ROTATIONS[1]),
+            Phase("3: Acquisition (Convert)", None, "Conversión", TIKTOK_ROTATIONS[2]),
+        ),
+        themes=TIKTOK_THEMES,
+        format="Reel / TikTok Vertical",
+    ),
+    # generate_ultimate_sheet.py
+    "tiktok": CalendarSpec(
+        phases=(
+            Phase("1: DISCOVERY (Viral)", 30, "Views", TIKTOK_ROTATIONS[0]),
+            Phase("2: AUTHORITY (Trust)", 60, "Engagement", TIKTOK_ROTATIONS[1]),
+            Phase("3: ACQUISITION (Convert)", None, "Conversión", TIKTOK_ROTATIONS[2]),
+        ),
+        themes=TIKTOK_THEMES,
+        format="Reel / TikTok Vertical",
+    ),
+    # generate_linkedin_excel.py
+    "linkedin": CalendarSpec(
+        phases=(
+            Phase("1: Setup & Consistencia", 30, "Impresiones",
+                  ("Authority", "Behind-the-Scenes", "Authority", "Thought Leadership", "Social Proof")),
+            Phase("2: Optimización", 60, "Engagement",
+                  ("Authority", "Behind-the-Scenes", "Thought Leadership", "Authority", "Social Proof")),
+            Phase("3: Escalado & Conversión", None, "Leads",
+                  ("Conversion", "Authority", "Behind-the-Scenes", "Conversion", "Social Proof")),
+        ),
+        themes={
+            "Authority": "Errores y datos del alquiler estudiantil",
+            "Behind-the-Scenes": "Cómo construimos Livix",
+            "Thought Leadership": "Opinión sobre el mercado del alquiler",
+            "Social Proof": "Resultados y casos reales",
+            "Conversion": "Invitación directa (propietarios / estudiantes)",
+        },
+        format="Post LinkedIn",
+    ),
+}
+
+
+# ── Motor ───────────────────────────────────────────────────────────────────
+def phase_ends(spec: CalendarSpec, days: int) -> np.ndarray:
+    """Último día de cada fase escalado a `days` (la última fase acaba en `days`)."""
+    ends = [days if p.end is None else round(p.end * days / spec.base_days) for p in spec.phases]
+    ends[-1] = days
+    return np.asarray(ends, dtype=np.int64)
+
+
+def phase_index(spec: CalendarSpec, day: np.ndarray, days: int | None = None) -> np.ndarray:
+    """Índice (0-based) de la fase de cada día de un plan de `days` días (por defecto, day.max())."""
+    return np.searchsorted(phase_ends(spec, days or int(day.max(initial=1))), day, side="left")
+
+
+def _schedule(spec: CalendarSpec, days: int) -> dict[str, np.ndarray | pd.Categorical]:
+    """Columnas de un canal para `days` días (una ciudad)."""
+    day = np.arange(1, days + 1, dtype=np.int64)
+    phase = phase_index(spec, day)
+
+    # Todas las rotaciones en un array: pilar = offset de su fase + (día-1) % largo
+    pillars = sorted({p for ph in spec.phases for p in ph.rotation})
+    pillar_code = {p: i for i, p in enumerate(pillars)}
+    lengths = np.asarray([len(ph.rotation) for ph in spec.phases], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    flat = np.asarray([pillar_code[p] for ph in spec.phases for p in ph.rotation], dtype=np.int64)
+    pillar = flat[offsets[phase] + (day - 1) % lengths[phase]]
+
+    themes = [spec.themes.get(p, DEFAULT_THEME) for p in pillars]
+    theme_names = sorted(set(themes))
+    theme_of_pillar = np.asarray([theme_names.index(t) for t in themes], dtype=np.int64)
+    kpis = list(dict.fromkeys(p.kpi for p in spec.phases))
+    kpi_of_phase = np.asarray([kpis.index(p.kpi) for p in spec.phases], dtype=np.int64)
+    return {
+        "Día": day,
+        "Semana": (day - 1) // 7 + 1,
+        "Fase": pd.Categorical.from_codes(phase, [p.name for p in spec.phases]),
+        "Pilar": pd.Categorical.from_codes(pillar, pillars),
+        "Tema / Ángulo": pd.Categorical.from_codes(theme_of_pillar[pillar], theme_names),
+        "Objetivo / KPI": pd.Categorical.from_codes(kpi_of_phase[phase], kpis),
+    }
+
+
+def build_calendar(specs: dict[str, CalendarSpec], days: int = 90, cities=("Zaragoza",),
+                   start: str | None = None) -> pd.DataFrame:
+    """
+    Calendario completo: una fila por canal × ciudad × día, en ese orden.
+    `start` (YYYY-MM-DD) añade la columna Fecha.
+    """
+    cities = list(cities)
+    frames = []
+    for channel, spec in specs.items():
+        columns = _schedule(spec, days)
+        n = len(cities) * days
+        # Cada ciudad repite el calendario del canal: los códigos se repiten, las categorías no
+        frame = {
+            "Ciudad": pd.Categorical.from_codes(np.repeat(np.arange(len(cities)), days), cities),
+            "Canal": pd.Categorical.from_codes(np.zeros(n, dtype=np.int64), [channel]),
+        }
+        for name, values in columns.items():
+            if isinstance(values, pd.Categorical):
+                frame[name] = pd.Categorical.from_codes(np.tile(values.codes, len(cities)), values.categories)
+            else:
+                frame[name] = np.tile(values, len(cities))
+        frame["Formato"] = pd.Categorical.from_codes(np.zeros(n, dtype=np.int64), [spec.format])
+        frames.append(pd.DataFrame(frame))
+    calendar = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+    for name in ("Ciudad", "Canal", "Formato"):
+        calendar[name] = calendar[name].astype("category")
+    if start:
+        calendar["Fecha"] = np.datetime64(start, "D") + (calendar["Día"].to_numpy() - 1).astype("timedelta64[D]")
+    return calendar[[c for c in COLUMNS if c in calendar.columns]]
+
+
+def render(calendar: pd.DataFrame, path: str) -> str:
+    """CSV o XLSX (una hoja por canal) según la extensión de `path`."""
+    from workbook_export import Sheet, write_workbook  # solo para XLSX
+
+    path = os.path.expanduser(path)
+    if path.lower().endswith(".xlsx"):
+        sheets = [Sheet(str(channel)[:31], frame.drop(columns="Canal").reset_index(drop=True))
+                  for channel, frame in calendar.groupby("Canal", observed=True, sort=False)]
+        return write_workbook(path, sheets)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    calendar.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calendario de contenidos N días × canales × ciudades.")
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--channels", nargs="+", default=["tiktok"], choices=sorted(SPECS))
+    parser.add_argument("--cities", nargs="+", default=["Zaragoza"])
+    parser.add_argument("--start", default=None, help="fecha del día 1 (YYYY-MM-DD)")
+    parser.add_argument("-o", "--output", default="calendario.csv", help=".csv o .xlsx")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    calendar = build_calendar({c: SPECS[c] for c in args.channels}, max(1, args.days), args.cities, args.start)
+    built = time.perf_counter() - started
+    path = render(calendar, args.output)
+    print(f"🗓️  {len(calendar)} filas ({len(args.cities)} ciudades × {len(args.channels)} canales × "
+          f"{args.days} días) en {built * 1000:.0f} ms")
+    print(f"💾 Guardado en: {path} ({time.perf_counter() - started:.1f}s con la escritura)")
+
+
+if __name__ == "__main__":
+    main()
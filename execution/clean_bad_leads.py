@@ -1,29 +1,151 @@
+#!/usr/bin/env python3
+"""
+clean_bad_leads.py
+------------------
+Quita de uno o varios CSV de leads las filas sin un email válido.
+
+- Lee y escribe por bloques de CHUNK_ROWS filas: la memoria no crece con el
+  tamaño del fichero.
+- Validación vectorizada por bloque (email_rank.reject_reasons, la misma
+  regla que usa el resto del pipeline); con `--workers N` los bloques se
+  validan en un pool de procesos (solo viajan los emails, no las filas) y se
+  escriben en el orden original.
+- Las filas descartadas van a <entrada>_rechazados.csv con una columna
+  `motivo` ("sin email" / "formato inválido" / "desechable"). Si no hay
+  ninguna, se borra el de un run anterior.
+- El fichero limpio se escribe aparte y sustituye al original con
+  os.replace: si el proceso muere a medias, el original queda intacto.
+
+Uso:
+    python clean_bad_leads.py                                  # ~/Downloads/leads eneko.csv
+    python clean_bad_leads.py a.csv b.csv [--workers 4] [--chunk-rows 20000]
+"""
+
+import argparse
 import csv
-import re
 import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import pandas as pd
+
+from email_rank import reject_reasons
+
+# ── Config ─────────────────────────────────────────────────────────────────
+DEFAULT_INPUT = os.path.expanduser("~/Downloads/leads eneko.csv")
+CHUNK_ROWS    = 5000
+EMAIL_COLUMNS = ("email", "Email")
+REASON_FIELD  = "motivo"
+
+
+def validate_chunk(emails: list[str]) -> list[str | None]:
+    """Se ejecuta en los procesos del pool: un motivo (o None) por email."""
+    return reject_reasons(pd.Series(emails, dtype=object)).tolist()
+
+
+def chunks(reader: csv.DictReader, size: int):
+    while True:
+        chunk = list(islice(reader, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validated(reader: csv.DictReader, column: str, size: int, pool: ProcessPoolExecutor | None,
+              workers: int):
+    """(filas, motivos) por bloque, en orden; como mucho 2 bloques por worker en vuelo."""
+    if pool is None:
+        for chunk in chunks(reader, size):
+            yield chunk, validate_chunk([row.get(column) or "" for row in chunk])
+        return
+    in_flight: deque = deque()
+    for chunk in chunks(reader, size):
+        in_flight.append((chunk, pool.submit(validate_chunk, [row.get(column) or "" for row in chunk])))
+        if len(in_flight) >= 2 * workers:
+            rows, future = in_flight.popleft()
+            yield rows, future.result()
+    while in_flight:
+        rows, future = in_flight.popleft()
+        yield rows, future.result()
+
+
+def clean_file(path: str, args: argparse.Namespace, pool: ProcessPoolExecutor | None) -> None:
+    started = time.monotonic()
+    rejects_path = os.path.splitext(path)[0] + "_rechazados.csv"
+    tmp_clean = f"{path}.{os.getpid()}.tmp"
+    tmp_rejects = f"{rejects_path}.{os.getpid()}.tmp"
+    total = kept = 0
+    reasons: dict[str, int] = {}
+
+    with open(path, newline="", encoding="utf-8") as f_in:
+        reader = csv.DictReader(f_in)
+        fieldnames = list(reader.fieldnames or [])
+        column = next((c for c in EMAIL_COLUMNS if c in fieldnames), None)
+        if column is None:
+            print(f"⚠️  {path}: no hay columna de email ({', '.join(EMAIL_COLUMNS)}), se deja igual")
+            return
+        try:
+            with open(tmp_clean, "w", newline="", encoding="utf-8") as f_clean, \
+                    open(tmp_rejects, "w", newline="", encoding="utf-8") as f_rejects:
+                clean = csv.DictWriter(f_clean, fieldnames=fieldnames, extrasaction="ignore")
+                rejected = csv.DictWriter(f_rejects, fieldnames=fieldnames + [REASON_FIELD],
+                                          extrasaction="ignore")
+                clean.writeheader()
+                rejected.writeheader()
+                for rows, chunk_reasons in validated(reader, column, args.chunk_rows, pool, args.workers):
+                    for row, reason in zip(rows, chunk_reasons):
+                        if reason is None:
+                            clean.writerow(row)
+                            kept += 1
+                        else:
+                            row[REASON_FIELD] = reason
+                            rejected.writerow(row)
+                            reasons[reason] = reasons.get(reason, 0) + 1
+                    total += len(rows)
+        except BaseException:
+            for tmp in (tmp_clean, tmp_rejects):
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            raise
+
+    # Replace the original file with the clean one
+    if total - kept:
+        os.replace(tmp_rejects, rejects_path)
+    else:
+        os.remove(tmp_rejects)
+        # A rejects file from an earlier run no longer describes this file
+        if os.path.exists(rejects_path):
+            os.remove(rejects_path)
+    os.replace(tmp_clean, path)
 
-input_file = "/Users/asiermugica/Downloads/leads eneko.csv"
-output_file = "/Users/asiermugica/Downloads/leads eneko_limpios.csv"
+    print(f"📋 {path} ({time.monotonic() - started:.1f}s)")
+    print(f"   Total leads before cleanup: {total}")
+    print(f"   Total leads after cleanup (ONLY valid emails): {kept}")
+    print(f"   Removed {total - kept} bad leads"
+          + (f": {', '.join(f'{n} {r}' for r, n in reasons.items())}" if reasons else "."))
+    if total - kept:
+        print(f"   💾 Rechazados en: {rejects_path}")
 
-with open(input_file, mode='r', encoding='utf-8') as f:
-    reader = csv.DictReader(f)
-    leads = list(reader)
 
-clean_leads = []
-for lead in leads:
-    email = lead.get('email', '').strip()
-    # Validate email with proper regex
-    if email and re.match(r'^[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}$', email):
-        clean_leads.append(lead)
+def main():
+    parser = argparse.ArgumentParser(description="Quita las filas sin email válido de CSVs de leads.")
+    parser.add_argument("inputs", nargs="*", default=[DEFAULT_INPUT], help="CSV(s) a limpiar (se sobrescriben)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="procesos para validar (0 = en este proceso; útil en ficheros muy grandes)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+    args.chunk_rows = max(1, args.chunk_rows)
 
-with open(output_file, mode='w', encoding='utf-8', newline='') as f:
-    writer = csv.DictWriter(f, fieldnames=reader.fieldnames)
-    writer.writeheader()
-    writer.writerows(clean_leads)
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 0 else None
+    try:
+        for path in args.inputs:
+            clean_file(os.path.expanduser(path), args, pool)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
 
-# Replace the original file with the clean one
-os.replace(output_file, input_file)
 
-print(f"Total leads before cleanup: {len(leads)}")
-print(f"Total leads after cleanup (ONLY valid emails): {len(clean_leads)}")
-print(f"Removed {len(leads) - len(clean_leads)} bad leads.")
+if __name__ == "__main__":
+    main()
@@ -1,89 +1,113 @@
-import pandas as pd
+import argparse
+import hashlib
+import importlib.util
 import os
-import shutil
+import time
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from generate_linkedin_excel import OUTPUT_FILE as LINKEDIN_FILE, build_linkedin_sheets
+from generate_ultimate_sheet import OUTPUT_FILE as TIKTOK_FILE, build_tiktok_sheets
+from workbook_export import Sheet, write_plan
+
+# The plans are built in memory by the generators (build_*_sheets) and composed
+# here directly. Reading the .xlsx they write is only needed with --from-files
+# (e.g. plans edited by hand), and then each sheet is cached by file mtime.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, ".tmp", "plan_cache")
+SEARCH_DIRS = ("~/Desktop", "~/Downloads")  # the generators have written to both over time
+# export_to_excel.py also writes a same-named file to ~/Downloads with other sheets,
+# so a candidate only counts if it has the sheets we are going to read
+OUTPUT_FILE = "LIVIX_SOCIAL_MEDIA_MASTER_PLAN.xlsx"
+
+# Parquet needs pyarrow/fastparquet; without them the cache falls back to pickle
+CACHE_FORMAT = "parquet" if importlib.util.find_spec("pyarrow") or importlib.util.find_spec("fastparquet") \
+    else "pickle"
 
-# Import the generation logic from existing scripts
-# We will execute them as modules or just run them via os.system to ensure we get the files
-# But to be cleaner and avoiding path issues, I will assume the generation scripts 
-# output to Desktop as currently programmed.
+def sheet_names(path):
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return set(workbook.sheetnames)
+    finally:
+        workbook.close()
 
-def combine_plans():
-    desktop = os.path.expanduser("~/Desktop")
-    downloads = os.path.expanduser("~/Downloads")
-    
-    # Files are in different locations now
-    tiktok_file = os.path.join(desktop, "LIVIX_TIKTOK_MASTER_PLAN_COMPLETE.xlsx")
-    linkedin_file = os.path.join(downloads, "LIVIX_LINKEDIN_MASTER_PLAN.xlsx")
-    
-    # 1. Skip regeneration to be fast
-    print("Usando archivos existentes...")
-    
-    # 2. Read the files
-    print("Leyendo archivos...")
-    # TikTok Reader
-    xls_tiktok = pd.ExcelFile(tiktok_file)
-    df_tiktok_plan = pd.read_excel(xls_tiktok, '🗓️ Plan 90 Días')
-    df_tiktok_sop = pd.read_excel(xls_tiktok, '🎬 Producción SOP')
-    
-    # LinkedIn Reader
-    xls_linkedin = pd.ExcelFile(linkedin_file)
-    df_linkedin_plan = pd.read_excel(xls_linkedin, '🗓️ Plan 90 Días')
-    df_linkedin_hooks = pd.read_excel(xls_linkedin, '🪝 Hooks')
-    
-    # 3. Create Merged Excel
-    output_filename = "LIVIX_SOCIAL_MEDIA_MASTER_PLAN.xlsx"
-    clean_path = os.path.join(downloads, output_filename)
-    
+def find_workbook(filename, sheets=()):
+    """First copy of `filename` in SEARCH_DIRS that has all of `sheets`."""
+    candidates = [os.path.join(os.path.expanduser(d), filename) for d in SEARCH_DIRS]
+    skipped = []
+    for path in candidates:
+        if not os.path.exists(path):
+            continue
+        missing = set(sheets) - sheet_names(path)
+        if not missing:
+            return path
+        skipped.append(f"{path} (missing {', '.join(sorted(missing))})")
+    raise FileNotFoundError(f"{filename} with sheets {', '.join(sheets)} not found in: {', '.join(candidates)}"
+                            + (f"; skipped {'; '.join(skipped)}" if skipped else ""))
+
+def read_sheet_cached(path, sheet, use_cache=True):
+    """pd.read_excel of one sheet, cached until the workbook's mtime/size change."""
+    if not use_cache:
+        return pd.read_excel(path, sheet_name=sheet)
+    stat = os.stat(path)
+    prefix = hashlib.sha1(f"{os.path.abspath(path)}|{sheet}".encode("utf-8")).hexdigest()[:16]
+    version = hashlib.sha1(f"{stat.st_mtime_ns}|{stat.st_size}".encode("utf-8")).hexdigest()[:16]
+    cache_path = os.path.join(CACHE_DIR, f"{prefix}-{version}.{CACHE_FORMAT}")
+    if os.path.exists(cache_path):
+        return pd.read_parquet(cache_path) if CACHE_FORMAT == "parquet" else pd.read_pickle(cache_path)
+
+    df = pd.read_excel(path, sheet_name=sheet)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Older versions of this same sheet are stale now
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith(prefix + "-"):
+            os.remove(os.path.join(CACHE_DIR, name))
+    tmp = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        if CACHE_FORMAT == "parquet":
+            df.to_parquet(tmp)
+        else:
+            df.to_pickle(tmp)
+        os.replace(tmp, cache_path)
+    except (ValueError, TypeError, OSError) as e:  # e.g. mixed-type columns Parquet can't store
+        print(f"⚠️  No cache for {sheet}: {e}")
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return df
+
+def read_plan(filename, sheets, use_cache=True):
+    path = find_workbook(filename, sheets)
+    print(f"Leyendo {path}...")
+    return {sheet: read_sheet_cached(path, sheet, use_cache) for sheet in sheets}
+
+def combine_plans(from_files=False, use_cache=True):
+    started = time.perf_counter()
+    if from_files:
+        tiktok = read_plan(TIKTOK_FILE, ['🗓️ Plan 90 Días', '🎬 Producción SOP'], use_cache)
+        linkedin = read_plan(LINKEDIN_FILE, ['🗓️ Plan 90 Días', '🪝 Hooks'], use_cache)
+    else:
+        tiktok = build_tiktok_sheets()
+        linkedin = build_linkedin_sheets()
+
+    clean_path = os.path.join(os.path.expanduser("~/Downloads"), OUTPUT_FILE)
     print(f"Creando archivo combinado en: {clean_path}")
-    
-    with pd.ExcelWriter(clean_path, engine='openpyxl') as writer:
-        # Sheet 1: TikTok Plan
-        df_tiktok_plan.to_excel(writer, index=False, sheet_name='🎵 TikTok 90 Días')
-        
-        # Sheet 2: LinkedIn Plan
-        df_linkedin_plan.to_excel(writer, index=False, sheet_name='💼 LinkedIn 90 Días')
-        
-        # Sheet 3: TikTok SOP (Bonus)
-        df_tiktok_sop.to_excel(writer, index=False, sheet_name='🎬 TikTok SOP')
-        
-        # Sheet 4: LinkedIn Hooks (Bonus)
-        df_linkedin_hooks.to_excel(writer, index=False, sheet_name='🪝 LinkedIn Hooks')
-        
-        # Formatting
-        workbook = writer.book
-        from openpyxl.styles import Font, PatternFill, Alignment
-        
-        # Formats
-        header_font = Font(bold=True, color="FFFFFF")
-        
-        # Colors
-        tiktok_color = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
-        linkedin_color = PatternFill(start_color="0A66C2", end_color="0A66C2", fill_type="solid")
-        
-        for sheet in workbook.worksheets:
-            # Determine color based on sheet name
-            fill_color = linkedin_color if "LinkedIn" in sheet.title else tiktok_color
-            
-            # Format Headers
-            for cell in sheet[1]:
-                cell.font = header_font
-                cell.fill = fill_color
-                cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-            
-            # Auto-adjust columns
-            for col in sheet.columns:
-                max_length = 0
-                column_letter = col[0].column_letter
-                for cell in col:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 60) # Cap width
-                sheet.column_dimensions[column_letter].width = adjusted_width
 
-    print("¡Archivo combinado listo!")
+    # TikTok sheets with black headers, LinkedIn sheets in LinkedIn blue
+    changes = write_plan(clean_path, [
+        Sheet('🎵 TikTok 90 Días', tiktok['🗓️ Plan 90 Días']),
+        Sheet('💼 LinkedIn 90 Días', linkedin['🗓️ Plan 90 Días'], header_style="header_linkedin"),
+        Sheet('🎬 TikTok SOP', tiktok['🎬 Producción SOP']),
+        Sheet('🪝 LinkedIn Hooks', linkedin['🪝 Hooks'], header_style="header_linkedin"),
+    ])
+
+    print(f"¡Archivo combinado listo! ({changes.summary()}; {time.perf_counter() - started:.2f}s)")
 
 if __name__ == "__main__":
-    combine_plans()
+    parser = argparse.ArgumentParser(description="Combina los planes de TikTok y LinkedIn en un solo Excel.")
+    parser.add_argument("--from-files", action="store_true",
+                        help="leer los .xlsx ya generados (Desktop o Downloads) en vez de generarlos en memoria")
+    parser.add_argument("--no-cache", dest="cache", action="store_false", help="con --from-files, no usar la caché")
+    args = parser.parse_args()
+    combine_plans(args.from_files, args.cache)
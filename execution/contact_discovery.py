@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+contact_discovery.py
+--------------------
+Descubre las páginas de contacto de una web en vez de adivinar slugs.
+
+1. Enlaces <a> de la homepage (ya descargada): href + texto del enlace.
+2. Si ahí no hay un enlace claro de contacto, Sitemap: de robots.txt (o
+   /sitemap.xml por defecto), bajando como mucho MAX_CHILD_SITEMAPS
+   sitemaps hijos si es un índice.
+
+Las descargas del paso 2 (robots.txt y sitemaps) tienen un tope duro por
+web, MAX_DISCOVERY_FETCHES (`FetchBudget`), y cada sitemap se lee en
+streaming hasta MAX_PAGE_BYTES como cualquier página. Con el presupuesto
+gastado el scraper ya no prueba los slugs a ciegas.
+
+Cada URL del mismo sitio se puntúa por su parecido a una página de contacto
+(contacto > quiénes somos > aviso legal, que por LSSI suele llevar email)
+y se devuelven las mejores. Todo pasa por http_cache, así que robots.txt
+y los sitemaps se descargan una vez por sitio y run.
+
+Uso:
+    from contact_discovery import discover_contact_pages
+    budget = FetchBudget()
+    urls = discover_contact_pages(base_url, homepage_html, budget=budget)
+    budget.spent   # robots.txt/sitemaps agotaron el tope: no probar slugs a ciegas
+"""
+
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
+
+from requests.exceptions import RequestException
+
+from http_cache import cached_get
+from http_fetch import MAX_PAGE_BYTES
+
+# ── Config ─────────────────────────────────────────────────────────────────
+TOP_CANDIDATES     = 4    # páginas que se llegan a pedir por web
+MIN_SCORE          = 3    # por debajo no merece la pena la petición
+STRONG_SCORE       = 10   # un enlace así ("contacto") basta: no se mira el sitemap
+MAX_CHILD_SITEMAPS = 3
+MAX_SITEMAP_URLS   = 5000
+MAX_DISCOVERY_FETCHES = 3   # robots.txt + sitemaps descargados por web, como mucho
+
+# (patrón, puntos): se busca en la ruta y en el texto del enlace
+KEYWORDS = [
+    (re.compile(r"contact"), 10),   # contacto, contacta, contactanos, contact-us...
+    (re.compile(r"quienes[-_ ]?somos|sobre[-_ ]?nosotros|about|nosotros|empresa"), 5),
+    (re.compile(r"legal|privacidad|privacy"), 4),
+    (re.compile(r"oficina|donde[-_ ]?estamos|localizacion|ubicacion|equipo"), 3),
+]
+SKIP_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".zip", ".mp4", ".css", ".js")
+SITEMAP_LINE_RE = re.compile(r"^\s*sitemap\s*:\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+LOC_RE = re.compile(r"<loc>\s*([^<\s]+)\s*</loc>", re.IGNORECASE)
+ACCENTS = str.maketrans("áéíóúñ", "aeioun")
+
+
+class _AnchorParser(HTMLParser):
+    """Recoge (href, texto) de cada <a href>."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links: list[tuple[str, str]] = []
+        self._href: str | None = None
+        self._text: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self._href = dict(attrs).get("href")
+            self._text = []
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._href is not None:
+            self.links.append((self._href, " ".join("".join(self._text).split())))
+            self._href = None
+
+
+@dataclass
+class FetchBudget:
+    """Descargas del descubrimiento de una web: las hechas y el tope."""
+    limit: int = MAX_DISCOVERY_FETCHES
+    used: int = 0
+
+    @property
+    def spent(self) -> bool:
+        return self.used >= self.limit
+
+    def take(self) -> bool:
+        """Reserva una descarga; False si ya no quedan."""
+        if self.spent:
+            return False
+        self.used += 1
+        return True
+
+
+def _site(url: str) -> str:
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def score_url(url: str, text: str = "") -> int:
+    """Puntuación de "parecido a página de contacto" de una URL (+ texto del enlace)."""
+    parsed = urlparse(url)
+    path = parsed.path.lower().translate(ACCENTS)
+    if path.endswith(SKIP_EXTENSIONS):
+        return 0
+    haystack = f"{path} {text.lower().translate(ACCENTS)}"
+    score = sum(points for pattern, points in KEYWORDS if pattern.search(haystack))
+    if score:
+        score -= path.strip("/").count("/")   # cuanto más profunda, menos probable
+        score -= 2 if parsed.query else 0
+    return max(score, 0)
+
+
+def links_from_html(base_url: str, html: str) -> dict[str, int]:
+    """URLs del mismo sitio enlazadas desde `html`, con su puntuación."""
+    parser = _AnchorParser()
+    try:
+        parser.feed(html)
+    except Exception:
+        pass  # HTML roto: nos quedamos con lo que se haya podido leer
+    site = _site(base_url)
+    scored: dict[str, int] = {}
+    for href, text in parser.links:
+        if not href or href.startswith(("mailto:", "tel:", "javascript:", "#")):
+            continue
+        url = urljoin(base_url, href).split("#", 1)[0]
+        if urlparse(url).scheme not in ("http", "https") or _site(url) != site:
+            continue
+        score = score_url(url, text)
+        if score > scored.get(url, 0):
+            scored[url] = score
+    return scored
+
+
+def _get_text(url: str, budget: FetchBudget) -> str:
+    """Cuerpo de `url` (hasta MAX_PAGE_BYTES) si es un 200; "" si no, o sin presupuesto."""
+    if not budget.take():
+        return ""
+    try:
+        r = cached_get(url, max_bytes=MAX_PAGE_BYTES)
+    except RequestException:
+        return ""
+    return r.text if r.status_code == 200 else ""
+
+
+def sitemap_urls(base_url: str, budget: FetchBudget | None = None) -> list[str]:
+    """
+    URLs de los sitemaps declarados en robots.txt (o /sitemap.xml), sin
+    pasar de `budget` descargas.
+    """
+    budget = budget or FetchBudget()
+    parsed = urlparse(base_url)
+    root = f"{parsed.scheme}://{parsed.netloc}"
+    robots = _get_text(root + "/robots.txt", budget)
+    declared = SITEMAP_LINE_RE.findall(robots)
+    sitemaps = declared or [root + "/sitemap.xml"]
+
+    pages: list[str] = []
+    for sitemap in sitemaps[:MAX_CHILD_SITEMAPS]:
+        if budget.spent:
+            break
+        xml = _get_text(sitemap, budget)
+        locs = LOC_RE.findall(xml)
+        if "<sitemapindex" in xml.lower():
+            # Índice: bajar a los hijos más prometedores (page-sitemap antes que post-sitemap)
+            children = sorted(locs, key=lambda u: ("page" not in u.lower(), "post" in u.lower()))
+            for child in children[:MAX_CHILD_SITEMAPS]:
+                if budget.spent:
+                    break
+                pages.extend(LOC_RE.findall(_get_text(child, budget)))
+        else:
+            pages.extend(locs)
+        if len(pages) >= MAX_SITEMAP_URLS:
+            break
+    return pages[:MAX_SITEMAP_URLS]
+
+
+def discover_contact_pages(base_url: str, homepage_html: str, limit: int = TOP_CANDIDATES,
+                           budget: FetchBudget | None = None) -> list[str]:
+    """
+    Mejores `limit` candidatas a página de contacto, de más a menos
+    prometedora. Lista vacía si no aparece nada que valga MIN_SCORE.
+    `budget` lleva la cuenta de las descargas de robots.txt y sitemaps.
+    """
+    scored = links_from_html(base_url, homepage_html) if homepage_html else {}
+
+    if not any(s >= STRONG_SCORE for s in scored.values()):
+        site = _site(base_url)
+        for url in sitemap_urls(base_url, budget):
+            if _site(url) != site:
+                continue
+            score = score_url(url)
+            if score > scored.get(url, 0):
+                scored[url] = score
+
+    base_norm = base_url.rstrip("/")
+    ranked = sorted(
+        (u for u, s in scored.items() if s >= MIN_SCORE and u.rstrip("/") != base_norm),
+        key=lambda u: (-scored[u], len(u)),
+    )
+    return ranked[:limit]
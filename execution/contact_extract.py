@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+contact_extract.py
+------------------
+Extracción y selección de emails de contacto a partir del HTML de una web.
+Compartido por scrape_emails_from_webs.py y final_lead_builder*.py.
+
+La extracción se ancla en la '@' (y sus variantes ofuscadas) y escanea hacia
+fuera, en tiempo lineal: la regex anterior
+`[a-zA-Z0-9._%+\-]+@...` hacía backtracking cuadrático sobre rachas largas
+sin '@' (JS minificado, blobs base64). Ver bench_contact_extract.py.
+
+La elección del mejor email (`best_email`) sigue una sola regla, compartida
+con el motor vectorizado de email_rank.py (miles/millones de candidatos) y
+con Hunter: sintaxis válida y dominio no desechable; primero los del propio
+dominio del lead, luego por prefijo de rol (PRIORITY_PREFIXES) y, a igualdad,
+mejor un dominio propio que uno de correo gratuito (gmail, hotmail...).
+
+`EmailStreamScanner` permite extraer mientras se descarga: se le pasan los
+trozos de texto según llegan y avisa en cuanto aparece un email prioritario
+(info@, contacto@...), para poder cortar la descarga.
+"""
+
+import re
+
+# Dominios/patrones que NO son emails reales
+IGNORE_PATTERNS = [
+    "example.com", "wixpress.com", "sentry.io", "yourdomain",
+    ".png", ".jpg", ".gif", ".svg", "schema.org",
+]
+# Un único autómata con todos los patrones: una pasada por candidato
+IGNORE_RE = re.compile("|".join(re.escape(p) for p in IGNORE_PATTERNS))
+
+# Caracteres que pueden formar parte de un email (para los cortes entre trozos)
+EMAIL_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-@"
+LOCAL_CHARS = frozenset(EMAIL_CHARS) - {"@"}
+LOCAL_MAX   = 64     # RFC 5321: longitud máxima de la parte local
+MAX_EMAIL_LENGTH = 254   # RFC 5321: más largo no es una dirección entregable
+
+# Prefijos genéricos preferidos, en orden
+PRIORITY_PREFIXES = ("info", "contacto", "contact", "hola", "inmobiliaria", "oficina", "admin")
+
+# Sintaxis aceptada para un email de lead (la de clean_bad_leads.py)
+LOCAL_PART_PATTERN  = r"[a-zA-Z0-9._%+\-]+"
+DOMAIN_PART_PATTERN = r"[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}"
+VALID_EMAIL_RE = re.compile(f"{LOCAL_PART_PATTERN}@{DOMAIN_PART_PATTERN}")
+
+# Correo gratuito: válido, pero peor que uno con dominio propio
+FREE_MAIL_DOMAINS = frozenset("""
+    gmail.com googlemail.com hotmail.com hotmail.es outlook.com outlook.es live.com live.es
+    msn.com yahoo.com yahoo.es ymail.com icloud.com me.com aol.com gmx.com gmx.es
+    protonmail.com proton.me yandex.com zoho.com telefonica.net movistar.es terra.es
+""".split())
+# Buzones desechables: nunca se eligen
+DISPOSABLE_DOMAINS = frozenset("""
+    mailinator.com yopmail.com yopmail.fr guerrillamail.com guerrillamail.net sharklasers.com
+    10minutemail.com temp-mail.org tempmail.com tempmailo.com trashmail.com trashmail.de
+    getnada.com dispostable.com maildrop.cc throwawaymail.com fakeinbox.com mintemail.com
+    mohmal.com emailondeck.com mailnesia.com spamgourmet.com
+""".split())
+
+# Todo empieza en un disparador: '@', su forma URL '%40', un "[at]"/"(arroba)"
+# ofuscado o un email protegido por Cloudflare (data-cfemail / email-protection#).
+# Entre disparadores el texto lo salta el motor de re en C, sin backtracking:
+# las rachas largas de JS minificado o base64 sin '@' no cuestan nada extra.
+TRIGGER_RE = re.compile(
+    r"(?P<at>@|%40)"
+    r"|(?P<obf>[\[({]\s{0,3}(?:at|arroba)\s{0,3}[\])}])"
+    r"|(?:data-cfemail=\"|email-protection#)(?P<cf>[0-9a-fA-F]{4,512})",
+    re.IGNORECASE,
+)
+DOMAIN_RE     = re.compile(r"[A-Za-z0-9.\-]{1,253}")
+DOMAIN_OBF_RE = re.compile(
+    r"\s{0,3}[A-Za-z0-9\-]{1,63}"
+    r"(?:(?:\.|\s{0,3}[\[({]\s{0,3}(?:dot|punto)\s{0,3}[\])}]\s{0,3})[A-Za-z0-9\-]{1,63}){1,8}",
+    re.IGNORECASE,
+)
+DOT_OBF_RE = re.compile(r"\s*[\[({]\s*(?:dot|punto)\s*[\])}]\s*", re.IGNORECASE)
+TLD_RE     = re.compile(r"\.[A-Za-z]{2,}")
+
+
+def is_valid_email(email: str) -> bool:
+    return IGNORE_RE.search(email.lower()) is None
+
+
+def _local_start(text: str, end: int, floor: int = 0) -> int | None:
+    """
+    Inicio de la parte local que acaba en `end`, escaneando hacia atrás sin
+    bajar de `floor` (el final del email anterior: no se solapan).
+    """
+    i = end
+    limit = max(floor, end - LOCAL_MAX)
+    while i > limit and text[i - 1] in LOCAL_CHARS:
+        i -= 1
+    if i == end or (i == limit and i > floor and text[i - 1] in LOCAL_CHARS):
+        return None  # vacía o más larga que LOCAL_MAX: no es un email
+    return i
+
+
+def _domain_length(run: str) -> int:
+    """
+    Longitud del dominio dentro de `run`: hasta el último ".tld" de 2+
+    letras (mismo recorte que hacía la regex antigua con backtracking).
+    """
+    end = 0
+    for m in TLD_RE.finditer(run):
+        if m.start() > 0:
+            end = m.end()
+    return end
+
+
+def _decode_cfemail(hexstr: str) -> str:
+    """Cloudflare: primer byte = clave XOR del resto."""
+    key = int(hexstr[:2], 16)
+    return "".join(chr(int(hexstr[i:i + 2], 16) ^ key) for i in range(2, len(hexstr) - 1, 2))
+
+
+def iter_emails(text: str):
+    """
+    Genera (inicio, fin, email) en una sola pasada lineal sobre `text`.
+    Decodifica mailto: con %40, "info [at] dominio [dot] es" y
+    data-cfemail de Cloudflare. No filtra IGNORE_PATTERNS.
+    """
+    prev_end = 0
+    for trig in TRIGGER_RE.finditer(text):
+        if trig.start() < prev_end:
+            continue  # dentro de un email ya encontrado
+        if trig.group("cf"):
+            decoded = _decode_cfemail(trig.group("cf"))
+            for _, _, email in iter_emails(decoded):
+                yield trig.start(), trig.end(), email
+            continue
+
+        if trig.group("at"):
+            start = _local_start(text, trig.start(), prev_end)
+            m = DOMAIN_RE.match(text, trig.end())
+            if start is None or not m:
+                continue
+            length = _domain_length(m.group())
+            if length:
+                prev_end = trig.end() + length
+                yield start, prev_end, f"{text[start:trig.start()]}@{m.group()[:length]}"
+            continue
+
+        # Ofuscado: "info [at] dominio [dot] es"
+        end = trig.start()
+        while end > 0 and text[end - 1] in " \t":
+            end -= 1
+        start = _local_start(text, end, prev_end)
+        m = DOMAIN_OBF_RE.match(text, trig.end())
+        if start is None or not m:
+            continue
+        domain = DOT_OBF_RE.sub(".", m.group().strip())
+        length = _domain_length(domain)
+        if length == len(domain):
+            prev_end = m.end()
+            yield start, prev_end, f"{text[start:end]}@{domain}"
+
+
+def extract_emails(html: str) -> list[str]:
+    found = dict.fromkeys(email for _, _, email in iter_emails(html))
+    return [e for e in found if is_valid_email(e)]
+
+
+def role_rank(local: str) -> int:
+    """Posición del prefijo de rol en PRIORITY_PREFIXES (len() si no es de rol)."""
+    for rank, prefix in enumerate(PRIORITY_PREFIXES):
+        if local.startswith(prefix):
+            return rank
+    return len(PRIORITY_PREFIXES)
+
+
+def contact_rank(email: str, domain: str | None = None) -> tuple[int, int, int] | None:
+    """
+    Clave de orden de un email (menor = mejor), o None si no sirve: sintaxis
+    inválida, IGNORE_PATTERNS o buzón desechable. `domain` es el dominio
+    registrable del lead, si se conoce.
+    """
+    email = email.strip().lower()
+    if len(email) > MAX_EMAIL_LENGTH or not VALID_EMAIL_RE.fullmatch(email) or IGNORE_RE.search(email):
+        return None
+    local, _, host = email.partition("@")
+    if host in DISPOSABLE_DOMAINS:
+        return None
+    return int(host != domain), role_rank(local), int(host in FREE_MAIL_DOMAINS)
+
+
+def best_email(emails: list[str], domain: str | None = None) -> str:
+    """Mejor email de contacto según contact_rank ("" si ninguno sirve); a igualdad, el primero."""
+    best, best_key = "", None
+    for e in emails:
+        key = contact_rank(e, domain)
+        if key is not None and (best_key is None or key < best_key):
+            best, best_key = e, key
+    return best
+
+
+def is_priority(email: str) -> bool:
+    return email.lower().startswith(PRIORITY_PREFIXES)
+
+
+class EmailStreamScanner:
+    """
+    Extracción incremental de emails sobre un texto que llega por trozos.
+
+    Cada `feed()` vuelve a escanear los últimos OVERLAP caracteres junto al
+    trozo nuevo, así un email partido entre dos trozos se encuentra entero.
+    Para no aceptar emails a medias:
+    - un match que llega a la racha final de caracteres de email del buffer
+      se aplaza (puede seguir en el siguiente trozo), salvo en el último
+      `feed(final=True)`;
+    - un match que empieza dentro de la racha inicial, cuando el solape se
+      cortó, se descarta (puede ser la cola de un email ya tratado).
+    """
+
+    OVERLAP = 512        # > longitud máxima razonable de un email
+    SETTLE_MARGIN = 64   # lo que aún puede crecer un dominio ofuscado
+
+    def __init__(self):
+        self.emails: list[str] = []
+        self.priority_found = False
+        self._seen: set[str] = set()
+        self._tail = ""
+        self._tail_cut = False
+
+    def feed(self, text: str, final: bool = False) -> bool:
+        """Procesa un trozo; devuelve True si ya hay un email prioritario."""
+        buf = self._tail + text
+        # Solo es definitivo un match con un separador detrás dentro del buffer
+        # (y a más de SETTLE_MARGIN del final, por los "[dot] es" ofuscados)
+        settled_end = len(buf) if final else min(len(buf.rstrip(EMAIL_CHARS)), len(buf) - self.SETTLE_MARGIN)
+        # y, si el solape se cortó, uno que empiece fuera de la racha inicial
+        lead = len(buf) - len(buf.lstrip(EMAIL_CHARS)) if self._tail_cut else 0
+        for start, end, email in iter_emails(buf):
+            if start < lead or end >= settled_end and not final:
+                continue
+            self._add(email)
+        if len(buf) > self.OVERLAP:
+            self._tail = buf[-self.OVERLAP:]
+            self._tail_cut = True
+        else:
+            self._tail = buf
+        return self.priority_found
+
+    def _add(self, email: str) -> None:
+        if email in self._seen or not is_valid_email(email):
+            return
+        self._seen.add(email)
+        self.emails.append(email)
+        if is_priority(email):
+            self.priority_found = True
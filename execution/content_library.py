@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+content_library.py
+------------------
+Biblioteca de contenidos de los planes (TikTok, LinkedIn, guiones...) en un
+fichero JSON Lines (data/content_library.jsonl) en vez de literales de
+Python copiados en cada script: un nuevo canal o ciudad son líneas nuevas,
+no otro script.
+
+Cada línea es una pieza con al menos `channel`, `phase` (1-3) y `pilar`;
+el resto de campos depende del canal (hook, visual, audio, body...). El
+orden del fichero dentro de un canal es el orden de publicación (día).
+
+Carga perezosa con índice:
+- La primera consulta recorre el fichero una vez y guarda, por
+  (channel, phase, pilar), los offsets de sus líneas en
+  .tmp/content_library.index.json (válido mientras no cambie el mtime ni el
+  tamaño del fichero). Los runs siguientes solo leen el índice.
+- Una consulta solo hace seek + json.loads de las líneas de su porción: un
+  generador que pinta un canal (o una fase de un pilar) no parsea el resto
+  aunque la biblioteca tenga miles de piezas.
+
+Uso:
+    from content_library import entries
+    plan = entries("tiktok")                               # todo el canal, en orden
+    hacks = entries("tiktok", phase=2, pilar="Housing Hacks")
+    library = ContentLibrary(); library.channels()         # ["linkedin", "tiktok", ...]
+
+    python content_library.py                              # piezas por canal/fase/pilar
+"""
+
+import json
+import os
+from collections import defaultdict
+
+# ── Config ─────────────────────────────────────────────────────────────────
+BASE_DIR     = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIBRARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "content_library.jsonl")
+INDEX_PATH   = os.path.join(BASE_DIR, ".tmp", "content_library.index.json")
+
+KEY_SEP = "\x1f"   # separador de (channel, phase, pilar) en las claves del índice
+
+
+def _key(channel: str, phase, pilar: str) -> str:
+    return KEY_SEP.join((channel, str(phase), pilar))
+
+
+class ContentLibrary:
+    def __init__(self, path: str = LIBRARY_PATH, index_path: str | None = INDEX_PATH):
+        self.path = path
+        self.index_path = index_path
+        self._index: dict[str, list[int]] | None = None
+
+    # ── Índice ────────────────────────────────────────────────────────────
+    def _version(self) -> list:
+        stat = os.stat(self.path)
+        return [os.path.abspath(self.path), stat.st_mtime_ns, stat.st_size]
+
+    def _load_index(self) -> dict[str, list[int]] | None:
+        if not self.index_path:
+            return None
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data["offsets"] if data.get("version") == self._version() else None
+
+    def _build_index(self) -> dict[str, list[int]]:
+        offsets: dict[str, list[int]] = defaultdict(list)
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    offsets[_key(entry["channel"], entry.get("phase", ""), entry.get("pilar", ""))].append(offset)
+                offset += len(line)
+        if self.index_path:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": self._version(), "offsets": offsets}, f)
+            os.replace(tmp, self.index_path)
+        return dict(offsets)
+
+    @property
+    def index(self) -> dict[str, list[int]]:
+        """{channel␟phase␟pilar: [offsets]}; se carga (o construye) en la primera consulta."""
+        if self._index is None:
+            self._index = self._load_index() or self._build_index()
+        return self._index
+
+    # ── Consultas ─────────────────────────────────────────────────────────
+    def keys(self) -> list[tuple[str, str, str]]:
+        return [tuple(k.split(KEY_SEP)) for k in self.index]
+
+    def channels(self) -> list[str]:
+        return sorted({channel for channel, _, _ in self.keys()})
+
+    def entries(self, channel: str, phase: int | None = None, pilar: str | None = None) -> list[dict]:
+        """Piezas de `channel` (filtradas por fase y/o pilar) en el orden del fichero."""
+        wanted = sorted(
+            offset
+            for key, offsets in self.index.items()
+            for c, p, pl in (key.split(KEY_SEP),)
+            if c == channel and (phase is None or p == str(phase)) and (pilar is None or pl == pilar)
+            for offset in offsets
+        )
+        result = []
+        with open(self.path, "rb") as f:
+            for offset in wanted:
+                f.seek(offset)
+                result.append(json.loads(f.readline()))
+        return result
+
+
+_default: ContentLibrary | None = None
+
+
+def entries(channel: str, phase: int | None = None, pilar: str | None = None) -> list[dict]:
+    """Atajo sobre la biblioteca por defecto (data/content_library.jsonl)."""
+    global _default
+    if _default is None:
+        _default = ContentLibrary()
+    return _default.entries(channel, phase, pilar)
+
+
+def main():
+    library = ContentLibrary()
+    counts: dict[str, int] = defaultdict(int)
+    for (channel, phase, pilar), offsets in zip(library.keys(), library.index.values()):
+        counts[channel] += len(offsets)
+        print(f"  {channel:16} fase {phase:2} {pilar:22} {len(offsets):4}")
+    print(f"📚 {sum(counts.values())} piezas: " + ", ".join(f"{n} {c}" for c, n in sorted(counts.items())))
+
+
+if __name__ == "__main__":
+    main()
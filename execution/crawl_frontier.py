@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+crawl_frontier.py
+-----------------
+Frontier de crawl en SQLite para repartir un scrape entre varios procesos
+(en la misma máquina o en varias que compartan el fichero).
+
+Cada fila del CSV de entrada es una entrada de la tabla `frontier`:
+
+    pending ──lease()──▶ leased ──append()──▶ done
+                           │
+                           └─ lease caducado (worker muerto) ─▶ se vuelve a prestar
+
+- `lease()` reserva un lote en una transacción BEGIN IMMEDIATE: dos workers
+  nunca se llevan la misma fila.
+- Un lease caduca a los `ttl` segundos; si el worker murió, otro la recoge.
+  Tras MAX_ATTEMPTS préstamos sin terminar la fila se deja por imposible.
+- `FrontierJournal` tiene la misma interfaz que RunJournal (settled/append),
+  así crawl() guarda cada resultado en SQLite en cuanto se resuelve.
+
+Se usa el journal clásico de SQLite (no WAL): WAL no funciona sobre
+ficheros compartidos por red y aquí las escrituras son pocas y pequeñas.
+"""
+
+import json
+import sqlite3
+import time
+
+from run_journal import row_key
+
+LEASE_TTL    = 900   # segundos que un worker tiene para terminar su lote
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    id            INTEGER PRIMARY KEY,
+    key           TEXT NOT NULL UNIQUE,
+    payload       TEXT NOT NULL,
+    state         TEXT NOT NULL DEFAULT 'pending',
+    lease_owner   TEXT,
+    lease_expires REAL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    email         TEXT NOT NULL DEFAULT '',
+    finished_at   REAL
+);
+CREATE INDEX IF NOT EXISTS frontier_state ON frontier (state, lease_expires);
+"""
+
+
+class Frontier:
+    def __init__(self, path: str):
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.db.execute("PRAGMA busy_timeout = 60000")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def seed(self, rows: list[dict], email_field: str = "email") -> int:
+        """Añade las filas que aún no estén (idempotente). Las que ya traen email entran como done."""
+        before = self.db.execute("SELECT COUNT(*) FROM frontier").fetchone()[0]
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self.db.executemany(
+                "INSERT OR IGNORE INTO frontier (key, payload, state, email) VALUES (?, ?, ?, ?)",
+                (
+                    (row_key(r), json.dumps(r, ensure_ascii=False),
+                     "done" if r.get(email_field, "").strip() else "pending",
+                     r.get(email_field, "").strip())
+                    for r in rows
+                ),
+            )
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return self.db.execute("SELECT COUNT(*) FROM frontier").fetchone()[0] - before
+
+    def lease(self, owner: str, n: int, ttl: float = LEASE_TTL) -> list[dict]:
+        """Reserva hasta `n` filas pendientes (o con lease caducado) para `owner`."""
+        now = time.time()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            picked = self.db.execute(
+                """SELECT id, payload FROM frontier
+                   WHERE (state = 'pending' OR (state = 'leased' AND lease_expires < ?))
+                     AND attempts < ?
+                   ORDER BY id LIMIT ?""",
+                (now, MAX_ATTEMPTS, n),
+            ).fetchall()
+            self.db.executemany(
+                """UPDATE frontier SET state = 'leased', lease_owner = ?, lease_expires = ?,
+                          attempts = attempts + 1
+                   WHERE id = ?""",
+                [(owner, now + ttl, row_id) for row_id, _ in picked],
+            )
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return [json.loads(payload) for _, payload in picked]
+
+    def release(self, owner: str) -> None:
+        """Devuelve a pending lo que `owner` tenía prestado y no terminó (salida limpia)."""
+        self.db.execute(
+            """UPDATE frontier SET state = 'pending', lease_owner = NULL, lease_expires = NULL,
+                      attempts = MAX(attempts - 1, 0)
+               WHERE state = 'leased' AND lease_owner = ?""",
+            (owner,),
+        )
+
+    def complete(self, key: str, email: str) -> None:
+        # Aunque el lease hubiera caducado el resultado sigue siendo bueno
+        self.db.execute(
+            """UPDATE frontier SET state = 'done', email = ?, lease_owner = NULL,
+                      lease_expires = NULL, finished_at = ?
+               WHERE key = ? AND state != 'done'""",
+            (email, time.time(), key),
+        )
+
+    def counts(self) -> dict[str, int]:
+        counts = dict(self.db.execute("SELECT state, COUNT(*) FROM frontier GROUP BY state"))
+        counts["failed"] = self.db.execute(
+            "SELECT COUNT(*) FROM frontier WHERE state = 'leased' AND attempts >= ? AND lease_expires < ?",
+            (MAX_ATTEMPTS, time.time()),
+        ).fetchone()[0]
+        return counts
+
+    def export_rows(self, email_field: str = "email") -> list[dict]:
+        """Todas las filas en el orden de entrada, con el email encontrado."""
+        rows = []
+        for payload, email in self.db.execute("SELECT payload, email FROM frontier ORDER BY id"):
+            row = json.loads(payload)
+            if email:
+                row[email_field] = email
+            rows.append(row)
+        return rows
+
+
+class FrontierJournal:
+    """Adaptador con la interfaz de RunJournal que escribe en el frontier."""
+
+    def __init__(self, frontier: Frontier):
+        self.frontier = frontier
+        self.settled: dict[str, dict] = {}
+
+    def append(self, key: str, **fields) -> None:
+        self.frontier.complete(key, fields.get("email", ""))
+        self.settled[key] = {"key": key, **fields}
+
+    def close(self) -> None:
+        pass
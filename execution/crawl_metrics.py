@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+crawl_metrics.py
+----------------
+Telemetría del crawl de emails: histogramas de latencia por fase, bytes,
+códigos de estado, clases de error y de dónde sale cada email.
+
+Fases (segundos):
+    dns      resolución del host (solo conexiones nuevas)
+    connect  TCP hasta tener socket (solo conexiones nuevas)
+    ttfb     desde enviar la petición hasta tener cabeceras, sin dns/connect
+             (incluye el handshake TLS y el tiempo de servidor)
+    body     lectura del cuerpo
+    site     web completa: homepage + descubrimiento + páginas de contacto
+
+http_fetch mide dns/connect/ttfb, http_cache el cuerpo en streaming y los
+hits de caché, y scrape_emails_from_webs las filas y el origen del email.
+Todo va al objeto global `metrics` (thread-safe). Al final se vuelca como
+informe JSON y como textfile de Prometheus (node_exporter textfile collector).
+
+Los histogramas tienen cubos fijos, así que los informes de varios procesos
+(modo --frontier) se suman con `merge()`.
+
+Uso:
+    from crawl_metrics import metrics
+    metrics.observe("ttfb", 0.42)
+    metrics.write_json(path); metrics.write_prometheus(path)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+# ── Config ─────────────────────────────────────────────────────────────────
+PHASES  = ("dns", "connect", "ttfb", "body", "site")
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64)
+TOP_PATHS = 50     # rutas descubiertas que se guardan en el informe JSON
+PROM_PREFIX = "livix_crawl"
+
+
+class Histogram:
+    """Histograma de cubos fijos (límites superiores en BUCKETS, + el de +Inf)."""
+
+    def __init__(self, buckets: tuple = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Límite superior del cubo donde cae el cuantil `q` (aproximado)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "buckets": list(self.buckets),
+            "counts": list(self.counts),
+            "sum": round(self.sum, 6),
+            "count": self.count,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+    def merge(self, data: dict) -> None:
+        if tuple(data["buckets"]) != self.buckets:
+            raise ValueError("histogramas con cubos distintos")
+        self.counts = [a + b for a, b in zip(self.counts, data["counts"])]
+        self.sum += data["sum"]
+        self.count += data["count"]
+
+
+class CrawlMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.histograms = {phase: Histogram() for phase in PHASES}
+        self.requests = 0          # intentos HTTP que llegaron a la red
+        self.retries = 0
+        self.cache_hits = 0        # servidas de caché sin tocar la red
+        self.bytes = 0             # bytes de cuerpo leídos de la red
+        self.status: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.rows: Counter = Counter()     # found / missing
+        self.sources: Counter = Counter()  # home / slug:/contacto / discovery
+        self.discovered_paths: Counter = Counter()
+
+    # ── Registro ──────────────────────────────────────────────────────────
+    def observe(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.histograms[phase].observe(max(seconds, 0.0))
+
+    def observe_response(self, status_code: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.status[str(status_code)] += 1
+
+    def observe_error(self, error: BaseException) -> None:
+        with self._lock:
+            self.errors[type(error).__name__] += 1
+
+    def observe_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def observe_cache_hit(self) -> None:
+        with self._lock:
+            self.cache_hits += 1
+
+    def observe_body(self, seconds: float, nbytes: int) -> None:
+        with self._lock:
+            self.histograms["body"].observe(max(seconds, 0.0))
+            self.bytes += nbytes
+
+    def observe_row(self, email: str, source: str = "", path: str = "") -> None:
+        """Una web terminada; `source` es home, slug o discovery y `path` la página que dio el email."""
+        with self._lock:
+            self.rows["found" if email else "missing"] += 1
+            if not email:
+                return
+            if source == "slug":
+                self.sources[f"slug:{path}"] += 1
+            else:
+                self.sources[source] += 1
+            if source == "discovery":
+                self.discovered_paths[path] += 1
+
+    # ── Informe ───────────────────────────────────────────────────────────
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "elapsed": round(time.time() - self.started_at, 3),
+                "requests": self.requests,
+                "retries": self.retries,
+                "cache_hits": self.cache_hits,
+                "bytes": self.bytes,
+                "status": dict(self.status),
+                "errors": dict(self.errors),
+                "rows": dict(self.rows),
+                "sources": dict(self.sources),
+                "discovered_paths": dict(self.discovered_paths.most_common(TOP_PATHS)),
+                "latency": {phase: h.to_dict() for phase, h in self.histograms.items()},
+            }
+
+    def merge(self, data: dict) -> None:
+        """Suma un informe de to_dict() (p. ej. el de otro worker)."""
+        with self._lock:
+            self.started_at = min(self.started_at, data["started_at"])
+            self.requests += data["requests"]
+            self.retries += data["retries"]
+            self.cache_hits += data["cache_hits"]
+            self.bytes += data["bytes"]
+            self.status.update(data["status"])
+            self.errors.update(data["errors"])
+            self.rows.update(data["rows"])
+            self.sources.update(data["sources"])
+            self.discovered_paths.update(data["discovered_paths"])
+            for phase, hist in data["latency"].items():
+                self.histograms[phase].merge(hist)
+
+    def write_json(self, path: str, extra: dict | None = None) -> None:
+        report = self.to_dict()
+        if extra:
+            report.update(extra)
+        _write_atomic(path, json.dumps(report, ensure_ascii=False, indent=2))
+
+    def prometheus_text(self) -> str:
+        data = self.to_dict()
+        p = PROM_PREFIX
+        lines = []
+
+        def counter(name: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} counter")
+            for labels, value in samples:
+                lines.append(f"{p}_{name}{labels} {value}")
+
+        counter("requests_total", "Peticiones HTTP que llegaron a la red.", [("", data["requests"])])
+        counter("retries_total", "Reintentos HTTP.", [("", data["retries"])])
+        counter("cache_hits_total", "Páginas servidas de la caché sin red.", [("", data["cache_hits"])])
+        counter("body_bytes_total", "Bytes de cuerpo leídos.", [("", data["bytes"])])
+        counter("responses_total", "Respuestas por código de estado.",
+                [(f'{{code="{_escape(code)}"}}', n) for code, n in sorted(data["status"].items())])
+        counter("errors_total", "Errores de red por clase.",
+                [(f'{{class="{_escape(cls)}"}}', n) for cls, n in sorted(data["errors"].items())])
+        counter("rows_total", "Webs visitadas por resultado.",
+                [(f'{{result="{_escape(res)}"}}', n) for res, n in sorted(data["rows"].items())])
+        counter("email_source_total", "Página que dio el email (home, slug o discovery).",
+                [(_source_labels(src), n) for src, n in sorted(data["sources"].items())])
+
+        name = f"{p}_phase_seconds"
+        lines.append(f"# HELP {name} Latencia por fase (dns, connect, ttfb, body, site).")
+        lines.append(f"# TYPE {name} histogram")
+        for phase, hist in data["latency"].items():
+            phase = _escape(phase)
+            cumulative = 0
+            for bound, count in zip(list(hist["buckets"]) + ["+Inf"], hist["counts"]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{phase="{phase}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{phase="{phase}"}} {hist["sum"]}')
+            lines.append(f'{name}_count{{phase="{phase}"}} {hist["count"]}')
+
+        lines.append(f"# HELP {p}_last_run_timestamp_seconds Fin del último run.")
+        lines.append(f"# TYPE {p}_last_run_timestamp_seconds gauge")
+        lines.append(f"{p}_last_run_timestamp_seconds {time.time():.0f}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        # Atómico: el textfile collector puede leer en cualquier momento
+        _write_atomic(path, self.prometheus_text())
+
+
+def _escape(value) -> str:
+    """Valor de etiqueta en el formato de exposición de Prometheus: \\, \" y \\n escapados."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _source_labels(source: str) -> str:
+    kind, _, path = source.partition(":")
+    return f'{{source="{_escape(kind)}",path="{_escape(path)}"}}' if path else f'{{source="{_escape(kind)}"}}'
+
+
+def _write_atomic(path: str, text: str) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def load_report(path: str) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+metrics = CrawlMetrics()
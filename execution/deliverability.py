@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""
+deliverability.py
+-----------------
+Comprobación de entregabilidad de los emails encontrados, después de la
+extracción: que la regex case no basta (erratas tipo "gmial.com", dominios
+caducados...) y hasta ahora solo se veía en los rebotes.
+
+1. Sintaxis (contact_extract.VALID_EMAIL_RE).
+2. DNS: registros MX del dominio (o, si no hay, A: MX implícito del RFC 5321).
+   Sin MX ni A → "no_mx"; NXDOMAIN → "no_domain".
+3. Opcional (`smtp=True`): sondeo SMTP sin enviar nada (EHLO, MAIL FROM,
+   RCPT TO, RSET) contra el MX de menor preferencia que responda. 2xx →
+   "deliverable"; 550/551/553 con código extendido 5.1.x (el buzón no
+   existe) → "undeliverable"; si el servidor acepta también una dirección
+   inventada del mismo dominio → "catch_all".
+
+Estados: sintaxis inválida → "invalid"; con MX y sin sondeo → "mx_ok";
+timeouts, SERVFAIL, 4xx (greylisting) y rechazos por política (5.7.x,
+554: listas negras, reputación del remitente) → "unknown", que nunca se
+cachea: dicen algo del sondeo, no del buzón.
+
+- El resolver es enchufable: cualquier objeto con `async mx(domain)` →
+  [(preferencia, host)] y `async address(domain)` → [ip], que lance
+  NoSuchDomain / DnsError. Por defecto UdpResolver (consultas UDP propias,
+  por TCP si la respuesta llega truncada; solo stdlib); DnsPythonResolver
+  si está instalado dnspython.
+- Caché con TTL por dominio (y por email para el sondeo SMTP) en
+  .tmp/deliverability_cache.json, compartida por todas las comprobaciones:
+  un dominio con cientos de leads (gmail.com, una franquicia) se resuelve
+  una vez, y las comprobaciones simultáneas del mismo dominio esperan a la
+  misma consulta en vuelo.
+- Una conexión SMTP por MX, reutilizada (RSET entre sondeos) hasta
+  MAX_RCPT_PER_CONNECTION: los dominios de Google Workspace u Office 365
+  comparten MX y no abren una conexión por email.
+- Como mucho `concurrency` consultas DNS y sesiones SMTP a la vez.
+
+DNS_NAMESERVER=host:puerto y SMTP_PORT (entorno) permiten apuntarlo a un
+DNS/SMTP de pruebas locales.
+
+Uso:
+    checker = DeliverabilityChecker(smtp=False)
+    status = await checker.check("info@inmo.es")          # "mx_ok"
+    statuses = await checker.check_many(emails)           # {email: estado}
+    await checker.close()
+
+    python deliverability.py info@inmo.es ventas@gmial.com [--smtp]
+    python deliverability.py leads.csv [-o salida.csv] [--smtp]   # añade email_status
+    python deliverability.py --store [--smtp] [--max-age-days 30] # en lead_store.py
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import socket
+import string
+import struct
+import time
+
+from contact_extract import VALID_EMAIL_RE
+
+# ── Config ─────────────────────────────────────────────────────────────────
+BASE_DIR   = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_PATH = os.path.join(BASE_DIR, ".tmp", "deliverability_cache.json")
+
+DOMAIN_TTL   = 7 * 24 * 3600    # segundos; un dominio con MX
+NEGATIVE_TTL = 24 * 3600        # sin MX / inexistente: puede arreglarse
+EMAIL_TTL    = 30 * 24 * 3600   # resultado del sondeo SMTP de un buzón
+
+CONCURRENCY  = 20     # consultas DNS / sesiones SMTP en vuelo a la vez
+DNS_TIMEOUT  = 3      # segundos por intento
+DNS_RETRIES  = 2
+SMTP_TIMEOUT = 15
+SMTP_PORT    = int(os.getenv("SMTP_PORT", "25"))
+MAILBOX_REJECT_CODES = {550, 551, 553}   # con 5.1.x: la dirección no existe
+MAX_RCPT_PER_CONNECTION = 20   # luego QUIT y conexión nueva (los MX limitan RCPTs por sesión)
+PROBE_SENDER = ""              # MAIL FROM:<> (remitente nulo, como los avisos de rebote)
+HELO_NAME    = socket.getfqdn()
+FALLBACK_NAMESERVER = "1.1.1.1"
+
+STATUS_FIELD = "email_status"
+STATUSES = ("deliverable", "mx_ok", "catch_all", "unknown", "undeliverable", "no_mx", "no_domain", "invalid")
+
+QTYPE_A, QTYPE_MX = 1, 15
+FLAG_TC = 0x0200   # respuesta truncada: no cabía en el datagrama, hay que repetir por TCP
+
+
+class DnsError(Exception):
+    """Fallo temporal de DNS (timeout, SERVFAIL...): el resultado es "unknown"."""
+
+
+class NoSuchDomain(Exception):
+    """NXDOMAIN: el dominio no existe."""
+
+
+# ── DNS ─────────────────────────────────────────────────────────────────────
+def _system_nameserver() -> tuple[str, int]:
+    configured = os.getenv("DNS_NAMESERVER")
+    if configured:
+        host, sep, port = configured.rpartition(":")
+        return (host, int(port)) if sep else (configured, 53)
+    try:
+        with open("/etc/resolv.conf", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver":
+                    return parts[1], 53
+    except OSError:
+        pass
+    return FALLBACK_NAMESERVER, 53
+
+
+def build_query(query_id: int, domain: str, qtype: int) -> bytes:
+    header = struct.pack("!HHHHHH", query_id, 0x0100, 1, 0, 0, 0)   # RD=1, una pregunta
+    labels = domain.rstrip(".").encode("idna").split(b".")
+    qname = b"".join(bytes([len(label)]) + label for label in labels) + b"\x00"
+    return header + qname + struct.pack("!HH", qtype, 1)
+
+
+def _read_name(message: bytes, offset: int) -> tuple[str, int]:
+    """Nombre en `offset` (con punteros de compresión) y offset tras él."""
+    labels, end, jumps = [], None, 0
+    while True:
+        length = message[offset]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | message[offset + 1]
+            jumps += 1
+            if jumps > 32:
+                raise DnsError("bucle de compresión en la respuesta")
+            continue
+        if length == 0:
+            return ".".join(labels), end if end is not None else offset + 1
+        labels.append(message[offset + 1:offset + 1 + length].decode("ascii", "replace"))
+        offset += 1 + length
+
+
+def is_truncated(message: bytes) -> bool:
+    return len(message) >= 4 and bool(struct.unpack_from("!H", message, 2)[0] & FLAG_TC)
+
+
+def parse_response(message: bytes, query_id: int, qtype: int) -> list:
+    """Respuestas de tipo `qtype`: [(pref, host)] para MX, [ip] para A."""
+    try:
+        rid, flags, qdcount, ancount, _, _ = struct.unpack_from("!HHHHHH", message)
+        if rid != query_id:
+            raise DnsError("id de respuesta distinto")
+        rcode = flags & 0x000F
+        if rcode == 3:
+            raise NoSuchDomain()
+        if rcode:
+            raise DnsError(f"rcode {rcode}")
+        offset = 12
+        for _ in range(qdcount):
+            offset = _read_name(message, offset)[1] + 4
+        answers = []
+        for _ in range(ancount):
+            offset = _read_name(message, offset)[1]
+            rtype, _, _, rdlength = struct.unpack_from("!HHIH", message, offset)
+            offset += 10
+            if rtype == qtype == QTYPE_MX:
+                pref = struct.unpack_from("!H", message, offset)[0]
+                answers.append((pref, _read_name(message, offset + 2)[0].lower()))
+            elif rtype == qtype == QTYPE_A and rdlength == 4:
+                answers.append(socket.inet_ntoa(message[offset:offset + 4]))
+            offset += rdlength
+        return answers
+    except (struct.error, IndexError) as e:
+        raise DnsError(f"respuesta DNS mal formada: {e}") from e
+
+
+class _DnsProtocol(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.reply: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def datagram_received(self, data, addr):
+        if not self.reply.done():
+            self.reply.set_result(data)
+
+    def error_received(self, exc):
+        if not self.reply.done():
+            self.reply.set_exception(exc)
+
+
+class UdpResolver:
+    """
+    Resolver MX/A mínimo sobre UDP, sin dependencias. Si la respuesta viene
+    truncada (bit TC: muchos MX no caben en 512 bytes), la consulta se repite
+    por TCP.
+    """
+
+    def __init__(self, nameserver: tuple[str, int] | None = None, timeout: float = DNS_TIMEOUT,
+                 retries: int = DNS_RETRIES):
+        self.nameserver = nameserver or _system_nameserver()
+        self.timeout = timeout
+        self.retries = retries
+
+    async def _query(self, domain: str, qtype: int) -> list:
+        loop = asyncio.get_running_loop()
+        last_error: Exception = DnsError("sin respuesta")
+        for _ in range(self.retries + 1):
+            query_id = random.getrandbits(16)
+            transport, protocol = await loop.create_datagram_endpoint(_DnsProtocol, remote_addr=self.nameserver)
+            try:
+                transport.sendto(build_query(query_id, domain, qtype))
+                message = await asyncio.wait_for(protocol.reply, self.timeout)
+            except (asyncio.TimeoutError, OSError) as e:
+                last_error = DnsError(f"{type(e).__name__}: {e}")
+                continue
+            finally:
+                transport.close()
+            if is_truncated(message):
+                return await self._query_tcp(domain, qtype)
+            return parse_response(message, query_id, qtype)
+        raise last_error
+
+    async def _query_tcp(self, domain: str, qtype: int) -> list:
+        """La misma consulta por TCP: cada mensaje va precedido de su longitud (2 bytes)."""
+        query_id = random.getrandbits(16)
+        query = build_query(query_id, domain, qtype)
+        writer = None
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(*self.nameserver), self.timeout)
+            writer.write(struct.pack("!H", len(query)) + query)
+            await writer.drain()
+            length = struct.unpack("!H", await asyncio.wait_for(reader.readexactly(2), self.timeout))[0]
+            message = await asyncio.wait_for(reader.readexactly(length), self.timeout)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, OSError) as e:
+            raise DnsError(f"TCP {type(e).__name__}: {e}") from e
+        finally:
+            if writer is not None:
+                writer.close()
+        return parse_response(message, query_id, qtype)
+
+    async def mx(self, domain: str) -> list[tuple[int, str]]:
+        return await self._query(domain, QTYPE_MX)
+
+    async def address(self, domain: str) -> list[str]:
+        return await self._query(domain, QTYPE_A)
+
+
+class DnsPythonResolver:
+    """El mismo interfaz sobre dnspython (opcional), con su configuración del sistema."""
+
+    def __init__(self):
+        import dns.asyncresolver  # dependencia opcional
+
+        self._dns = dns
+        self.resolver = dns.asyncresolver.Resolver()
+
+    async def _resolve(self, domain: str, rdtype: str):
+        try:
+            return await self.resolver.resolve(domain, rdtype)
+        except self._dns.resolver.NXDOMAIN as e:
+            raise NoSuchDomain() from e
+        except self._dns.resolver.NoAnswer:
+            return []
+        except self._dns.exception.DNSException as e:
+            raise DnsError(f"{type(e).__name__}: {e}") from e
+
+    async def mx(self, domain: str) -> list[tuple[int, str]]:
+        return [(r.preference, r.exchange.to_text().rstrip(".").lower()) for r in await self._resolve(domain, "MX")]
+
+    async def address(self, domain: str) -> list[str]:
+        return [r.address for r in await self._resolve(domain, "A")]
+
+
+def default_resolver():
+    try:
+        return DnsPythonResolver()
+    except ImportError:
+        return UdpResolver()
+
+
+# ── Caché ───────────────────────────────────────────────────────────────────
+class DeliverabilityCache:
+    """Como HunterCache: JSON en .tmp, entradas con TTL, "unknown" no se guarda."""
+
+    def __init__(self, path: str = CACHE_PATH):
+        self.path = path
+        data = self._load()
+        self.domains: dict[str, dict] = data.get("domains", {})
+        self.emails: dict[str, dict] = data.get("emails", {})
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get_domain(self, domain: str) -> dict | None:
+        """Entrada vigente ({status, mx, catch_all, checked_at}) o None."""
+        entry = self.domains.get(domain)
+        if entry is None:
+            return None
+        ttl = DOMAIN_TTL if entry["status"] == "mx_ok" else NEGATIVE_TTL
+        return entry if time.time() - entry["checked_at"] < ttl else None
+
+    def put_domain(self, domain: str, status: str, mx: list[str] = ()) -> dict:
+        entry = self.domains[domain] = {"status": status, "mx": list(mx), "catch_all": None,
+                                        "checked_at": time.time()}
+        return entry
+
+    def get_email(self, email: str) -> str | None:
+        entry = self.emails.get(email)
+        if entry is None or time.time() - entry["checked_at"] >= EMAIL_TTL:
+            return None
+        return entry["status"]
+
+    def put_email(self, email: str, status: str) -> None:
+        if status != "unknown":
+            self.emails[email] = {"status": status, "checked_at": time.time()}
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"domains": self.domains, "emails": self.emails}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)
+
+
+# ── SMTP ────────────────────────────────────────────────────────────────────
+class SmtpError(Exception):
+    pass
+
+
+def enhanced_status(line: bytes) -> str:
+    """Código extendido (RFC 3463) de una línea de respuesta: "5.1.1", o "" si no lo trae."""
+    words = line[4:].split(None, 1)
+    status = words[0].decode("ascii", "replace") if words else ""
+    parts = status.split(".")
+    return status if len(parts) == 3 and all(p.isdigit() for p in parts) else ""
+
+
+class _SmtpConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.probes = 0
+        self.last_line = b""   # última línea de la última respuesta
+
+    async def reply(self) -> int:
+        """Código de la respuesta (multilínea "250-..." hasta "250 ...")."""
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), SMTP_TIMEOUT)
+            if len(line) < 3 or not line[:3].isdigit():
+                raise SmtpError(f"respuesta SMTP inesperada: {line[:80]!r}")
+            if line[3:4] != b"-":
+                self.last_line = line
+                return int(line[:3])
+
+    async def command(self, text: str) -> int:
+        self.writer.write(text.encode("ascii", "replace") + b"\r\n")
+        await self.writer.drain()
+        return await self.reply()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class SmtpProber:
+    """
+    RCPT TO sin enviar nada. Una conexión abierta por MX, reutilizada por
+    turnos (lock por MX) entre todos los dominios que comparten ese MX.
+    """
+
+    def __init__(self, concurrency: int = CONCURRENCY, port: int = SMTP_PORT):
+        self.port = port
+        self.slots = asyncio.Semaphore(concurrency)
+        self.connections: dict[str, _SmtpConnection] = {}
+        self.locks: dict[str, asyncio.Lock] = {}
+
+    async def _connect(self, host: str) -> _SmtpConnection:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, self.port), SMTP_TIMEOUT)
+        conn = _SmtpConnection(reader, writer)
+        try:
+            if await conn.reply() != 220:
+                raise SmtpError("saludo rechazado")
+            if await conn.command(f"EHLO {HELO_NAME}") != 250 and await conn.command(f"HELO {HELO_NAME}") != 250:
+                raise SmtpError("EHLO/HELO rechazado")
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    async def _drop(self, host: str, quit_: bool = False) -> None:
+        conn = self.connections.pop(host, None)
+        if conn is None:
+            return
+        if quit_:
+            try:
+                await conn.command("QUIT")
+            except (OSError, SmtpError, asyncio.TimeoutError):
+                pass
+        conn.close()
+
+    async def probe(self, host: str, email: str) -> tuple[int, str]:
+        """
+        (código, código extendido) de RCPT TO:<email> en `host`; lanza
+        OSError/SmtpError si no se pudo.
+        """
+        lock = self.locks.setdefault(host, asyncio.Lock())
+        async with lock, self.slots:
+            for attempt in range(2):
+                conn = self.connections.get(host)
+                reused = conn is not None
+                if conn is None:
+                    conn = self.connections[host] = await self._connect(host)
+                try:
+                    code = await conn.command(f"MAIL FROM:<{PROBE_SENDER}>")
+                    if code != 250:
+                        raise SmtpError(f"MAIL FROM rechazado ({code})")
+                    code = await conn.command(f"RCPT TO:<{email}>")
+                    status = enhanced_status(conn.last_line)
+                    await conn.command("RSET")
+                    conn.probes += 1
+                    if conn.probes >= MAX_RCPT_PER_CONNECTION or code == 421:
+                        await self._drop(host, quit_=code != 421)
+                    return code, status
+                except (OSError, SmtpError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    await self._drop(host)
+                    # Una conexión reutilizada puede haber caducado en el servidor: una vez más con una nueva
+                    if not reused or attempt:
+                        raise
+            raise SmtpError("sin conexión")
+
+    async def close(self) -> None:
+        for host in list(self.connections):
+            await self._drop(host, quit_=True)
+
+
+# ── Comprobación ────────────────────────────────────────────────────────────
+def _random_local() -> str:
+    return "noexiste-" + "".join(random.choices(string.ascii_lowercase + string.digits, k=12))
+
+
+class DeliverabilityChecker:
+    def __init__(self, resolver=None, smtp: bool = False, concurrency: int = CONCURRENCY,
+                 cache: DeliverabilityCache | None = None, smtp_port: int = SMTP_PORT):
+        self.resolver = resolver or default_resolver()
+        self.smtp = SmtpProber(concurrency, smtp_port) if smtp else None
+        self.cache = cache if cache is not None else DeliverabilityCache()
+        self.dns_slots = asyncio.Semaphore(concurrency)
+        # Comprobaciones en vuelo: las simultáneas del mismo dominio/email esperan a la misma
+        self._domain_tasks: dict[str, asyncio.Task] = {}
+        self._email_tasks: dict[str, asyncio.Task] = {}
+        self._catch_all_tasks: dict[str, asyncio.Task] = {}
+        self.lookups = 0   # consultas DNS de verdad (no cacheadas)
+        self.probes = 0    # RCPT TO de verdad
+
+    async def _shared(self, tasks: dict, key: str, factory):
+        task = tasks.get(key)
+        if task is None:
+            task = tasks[key] = asyncio.ensure_future(factory())
+            task.add_done_callback(lambda _: tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+    # ── Dominio ───────────────────────────────────────────────────────────
+    async def domain(self, domain: str) -> dict:
+        """Entrada de caché del dominio ({status, mx, ...}); status "unknown" si el DNS falló."""
+        entry = self.cache.get_domain(domain)
+        if entry is not None:
+            return entry
+        return await self._shared(self._domain_tasks, domain, lambda: self._lookup(domain))
+
+    async def _lookup(self, domain: str) -> dict:
+        async with self.dns_slots:
+            self.lookups += 1
+            try:
+                records = await self.resolver.mx(domain)
+                if records:
+                    hosts = [host for _, host in sorted(records) if host and host != "."]
+                    # MX nulo (RFC 7505: "0 .") = el dominio no acepta correo
+                    return self.cache.put_domain(domain, "mx_ok" if hosts else "no_mx", hosts)
+                # Sin MX: el propio dominio hace de MX si tiene dirección
+                if await self.resolver.address(domain):
+                    return self.cache.put_domain(domain, "mx_ok", [domain])
+                return self.cache.put_domain(domain, "no_mx")
+            except NoSuchDomain:
+                return self.cache.put_domain(domain, "no_domain")
+            except DnsError:
+                return {"status": "unknown", "mx": [], "catch_all": None}
+
+    # ── Buzón ─────────────────────────────────────────────────────────────
+    async def _rcpt(self, hosts: list[str], email: str) -> str:
+        """deliverable / undeliverable / unknown según el primer MX que conteste."""
+        for host in hosts:
+            try:
+                self.probes += 1
+                code, status = await self.smtp.probe(host, email)
+            except (OSError, SmtpError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                continue  # siguiente MX
+            if 200 <= code < 300:
+                return "deliverable"
+            if code in MAILBOX_REJECT_CODES and status.startswith("5.1."):
+                return "undeliverable"   # 5.1.1 usuario desconocido, 5.1.0 dirección errónea...
+            # 4xx (greylisting, límite de conexiones), 552 (buzón lleno, pero existe),
+            # 5.7.x / 554 (política: listas negras, remitente nulo...) no hablan del buzón
+            return "unknown"
+        return "unknown"
+
+    async def _catch_all(self, domain: str, entry: dict) -> bool | None:
+        if entry.get("catch_all") is None:
+            status = await self._rcpt(entry["mx"], f"{_random_local()}@{domain}")
+            if status != "unknown":
+                entry["catch_all"] = status == "deliverable"
+        return entry.get("catch_all")
+
+    async def _probe(self, email: str, domain: str, entry: dict) -> str:
+        status = await self._rcpt(entry["mx"], email)
+        if status == "deliverable":
+            catch_all = await self._shared(self._catch_all_tasks, domain, lambda: self._catch_all(domain, entry))
+            if catch_all:
+                status = "catch_all"
+        self.cache.put_email(email, status)
+        return status
+
+    async def check(self, email: str) -> str:
+        email = (email or "").strip().lower()
+        if not VALID_EMAIL_RE.fullmatch(email):
+            return "invalid"
+        domain = email.rpartition("@")[2]
+        entry = await self.domain(domain)
+        if entry["status"] != "mx_ok" or self.smtp is None:
+            return entry["status"]
+        cached = self.cache.get_email(email)
+        if cached is not None:
+            return cached
+        return await self._shared(self._email_tasks, email, lambda: self._probe(email, domain, entry))
+
+    async def check_many(self, emails) -> dict[str, str]:
+        unique = list(dict.fromkeys(emails))
+        statuses = await asyncio.gather(*(self.check(e) for e in unique))
+        return dict(zip(unique, statuses))
+
+    async def close(self) -> None:
+        if self.smtp:
+            await self.smtp.close()
+        self.cache.save()
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+async def _check(emails: list[str], args: argparse.Namespace) -> dict[str, str]:
+    checker = DeliverabilityChecker(smtp=args.smtp, concurrency=args.concurrency)
+    try:
+        statuses = await checker.check_many(emails)
+    finally:
+        await checker.close()
+    print(f"🔎 {len(statuses)} emails: {checker.lookups} consultas DNS, {checker.probes} sondeos SMTP")
+    return statuses
+
+
+def _summary(statuses: dict[str, str]) -> None:
+    counts = {s: 0 for s in STATUSES}
+    for status in statuses.values():
+        counts[status] = counts.get(status, 0) + 1
+    print("📊 " + ", ".join(f"{n} {s}" for s, n in counts.items() if n))
+
+
+def check_csv(path: str, output: str, args: argparse.Namespace) -> None:
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames or [])
+        rows = list(reader)
+    column = next((c for c in ("email", "Email") if c in fieldnames), None)
+    if column is None:
+        raise SystemExit(f"❌ {path}: no hay columna de email")
+    statuses = asyncio.run(_check([(r.get(column) or "").strip().lower() for r in rows if r.get(column)], args))
+    if STATUS_FIELD not in fieldnames:
+        fieldnames.append(STATUS_FIELD)
+    tmp = f"{output}.{os.getpid()}.tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            row[STATUS_FIELD] = statuses.get((row.get(column) or "").strip().lower(), "")
+            writer.writerow(row)
+    os.replace(tmp, output)
+    _summary(statuses)
+    print(f"💾 Guardado en: {output}")
+
+
+def check_store(args: argparse.Namespace) -> None:
+    from lead_store import LeadStore  # solo para --store
+
+    with LeadStore() as store:
+        emails = store.emails_to_verify(args.max_age_days * 24 * 3600)
+        print(f"📋 {len(emails)} emails del almacén sin comprobar en {args.max_age_days} días")
+        statuses = asyncio.run(_check(emails, args))
+        store.set_email_statuses(statuses)
+    _summary(statuses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comprueba MX (y opcionalmente SMTP) de los emails de leads.")
+    parser.add_argument("inputs", nargs="*", help="emails sueltos o un CSV con columna email")
+    parser.add_argument("-o", "--output", default=None, help="CSV de salida (por defecto, sobrescribe la entrada)")
+    parser.add_argument("--store", action="store_true", help="comprobar los emails de lead_store.py")
+    parser.add_argument("--smtp", action="store_true",
+                        help="sondeo RCPT TO (necesita salida al puerto 25; muchos ISP lo bloquean)")
+    parser.add_argument("--max-age-days", type=int, default=30, help="con --store, volver a comprobar los más viejos")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    args = parser.parse_args()
+    args.concurrency = max(1, args.concurrency)
+
+    if args.store:
+        check_store(args)
+    elif len(args.inputs) == 1 and args.inputs[0].lower().endswith(".csv"):
+        path = os.path.expanduser(args.inputs[0])
+        check_csv(path, os.path.expanduser(args.output) if args.output else path, args)
+    elif args.inputs:
+        for email, status in asyncio.run(_check(args.inputs, args)).items():
+            print(f"  {'✅' if status in ('deliverable', 'mx_ok') else '⚠️ ' if status in ('catch_all', 'unknown') else '❌'}"
+                  f" {email} → {status}")
+    else:
+        parser.error("indica emails, un CSV o --store")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+domains.py
+----------
+Normalización de webs de leads a su dominio registrable (eTLD+1) según la
+Public Suffix List, y memo de resultados por sitio.
+
+`registrable_domain()` convierte "https://www.redpiso.es/oficina/zaragoza",
+"redpiso.es" o "cunza.es/nuestra-empresa/" en "redpiso.es" / "cunza.es", y
+respeta los sufijos de la PSL: "x.com.es" → "x.com.es", y en plataformas
+como wixsite.com o blogspot.com cada subdominio es un sitio distinto.
+
+La PSL se descarga una vez (PSL_URL) a .tmp/ y se renueva cada PSL_MAX_AGE;
+sin red se usan las reglas de BUILTIN_RULES, suficientes para .es y las
+plataformas habituales.
+
+`SiteMemo` guarda un resultado por dominio registrable y los alias que se
+descubren siguiendo redirecciones (dominio viejo → nuevo), para que cada
+sitio se visite o consulte una sola vez por run y el resultado se reparta
+entre todas las filas que lo comparten.
+
+Uso:
+    from domains import registrable_domain
+    registrable_domain("https://www.redpiso.es/oficina/x")   # "redpiso.es"
+"""
+
+import ipaddress
+import os
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import urlparse
+
+# ── Config ─────────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PSL_URL  = "https://publicsuffix.org/list/public_suffix_list.dat"
+PSL_PATH = os.path.join(BASE_DIR, ".tmp", "public_suffix_list.dat")
+PSL_MAX_AGE = 30 * 24 * 3600
+
+# Subconjunto de la PSL si no hay copia descargada (ICANN + privadas habituales)
+BUILTIN_RULES = """
+es com.es nom.es org.es gob.es edu.es
+com net org info biz eu pro io co
+uk co.uk org.uk me.uk fr pt it de
+ar com.ar mx com.mx
+wixsite.com blogspot.com blogspot.es wordpress.com github.io webnode.es
+negocio.site business.site jimdosite.com myshopify.com
+"""
+
+
+def _parse_rules(text: str) -> tuple[frozenset, frozenset, frozenset]:
+    """(reglas, comodines "*.x" sin el "*.", excepciones "!x" sin el "!")."""
+    rules, wildcards, exceptions = set(), set(), set()
+    for line in text.splitlines():
+        for rule in line.split("//", 1)[0].split():
+            rule = rule.lower()
+            if rule.startswith("!"):
+                exceptions.add(rule[1:])
+            elif rule.startswith("*."):
+                wildcards.add(rule[2:])
+            else:
+                rules.add(rule)
+    return frozenset(rules), frozenset(wildcards), frozenset(exceptions)
+
+
+def _download_psl() -> str | None:
+    # Import diferido: domains se usa también desde scripts sin capa HTTP
+    from requests.exceptions import RequestException
+    import http_fetch
+    try:
+        r = http_fetch.get(PSL_URL, timeout=15, retries=0)
+    except RequestException:
+        return None
+    if r.status_code != 200 or "===BEGIN ICANN DOMAINS===" not in r.text:
+        return None
+    os.makedirs(os.path.dirname(PSL_PATH), exist_ok=True)
+    tmp = PSL_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(r.text)
+    os.replace(tmp, PSL_PATH)
+    return r.text
+
+
+@lru_cache(maxsize=1)
+def _rules() -> tuple[frozenset, frozenset, frozenset]:
+    text = None
+    try:
+        if time.time() - os.path.getmtime(PSL_PATH) < PSL_MAX_AGE:
+            with open(PSL_PATH, encoding="utf-8") as f:
+                text = f.read()
+    except OSError:
+        pass
+    if text is None:
+        text = _download_psl()
+    if text is None and os.path.exists(PSL_PATH):
+        with open(PSL_PATH, encoding="utf-8") as f:
+            text = f.read()  # caducada pero mejor que nada
+    return _parse_rules(text or BUILTIN_RULES)
+
+
+def _suffix_labels(labels: list[str]) -> int:
+    """Nº de etiquetas del sufijo público de `labels` (regla más larga, excepciones primero)."""
+    rules, wildcards, exceptions = _rules()
+    for i in range(len(labels)):
+        candidate = ".".join(labels[i:])
+        if candidate in exceptions:
+            return len(labels) - i - 1
+        if candidate in rules:
+            return len(labels) - i
+        if i + 1 < len(labels) and ".".join(labels[i + 1:]) in wildcards:
+            return len(labels) - i
+    return 1  # regla por defecto "*": el TLD
+
+
+def host_from(url: str) -> str:
+    """Host en minúsculas de una URL o de una web sin esquema ("cunza.es/x")."""
+    url = url.strip()
+    parsed = urlparse(url if "://" in url else f"http://{url}")
+    return (parsed.hostname or "").rstrip(".").lower()
+
+
+@lru_cache(maxsize=65536)
+def registrable_domain(url: str) -> str | None:
+    """
+    Dominio registrable (eTLD+1) de una URL/web. IPs y "localhost" se
+    devuelven tal cual (con puerto, para no mezclar servicios). None si no
+    hay host o si el host es él mismo un sufijo público.
+    """
+    if not url or not url.strip():
+        return None
+    host = host_from(url)
+    if not host:
+        return None
+    is_ip = False
+    if host[-1].isdigit() or ":" in host:  # un nombre de dominio no acaba en dígito
+        try:
+            ipaddress.ip_address(host)
+            is_ip = True
+        except ValueError:
+            pass
+    if "." not in host and host != "localhost":
+        return None
+    if is_ip or host == "localhost":
+        parsed = urlparse(url if "://" in url else f"http://{url}")
+        return parsed.netloc.lower() or None
+    labels = host.split(".")
+    n = _suffix_labels(labels)
+    if len(labels) <= n:
+        return None
+    return ".".join(labels[-(n + 1):])
+
+
+class SiteMemo:
+    """
+    Resultado por sitio (dominio registrable), con alias por redirección.
+    Thread-safe: lo usan los hilos del pool de scrape.
+    """
+
+    def __init__(self):
+        self._results: dict[str, str] = {}
+        self._aliases: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def canonical(self, site: str) -> str:
+        with self._lock:
+            seen = set()
+            while site in self._aliases and site not in seen:
+                seen.add(site)
+                site = self._aliases[site]
+            return site
+
+    def alias(self, site: str, target: str) -> None:
+        """`site` redirige a `target`: a partir de ahora son el mismo sitio."""
+        if site and target and site != target:
+            with self._lock:
+                self._aliases[site] = target
+
+    def get(self, site: str) -> str | None:
+        site = self.canonical(site)
+        with self._lock:
+            return self._results.get(site)
+
+    def put(self, site: str, value: str) -> None:
+        site = self.canonical(site)
+        with self._lock:
+            self._results[site] = value
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+email_rank.py
+-------------
+Validación y elección del mejor email de contacto en bloque, vectorizada
+con pandas/NumPy: la misma regla que contact_extract.best_email (y que usan
+el scraper, Hunter y clean_bad_leads.py), pero sobre columnas enteras.
+
+Para cada candidato (lead, email) calcula a la vez:
+- valid       sintaxis (VALID_EMAIL_RE) y sin IGNORE_PATTERNS
+- disposable  buzón desechable (DISPOSABLE_DOMAINS): nunca se elige
+- free_mail   correo gratuito (FREE_MAIL_DOMAINS)
+- own_domain  el email es del dominio registrable del lead
+- role_rank   posición del prefijo de rol (info@, contacto@...)
+- rank        clave de orden (menor = mejor), la de contact_rank()
+
+y elige el mejor por lead con un único sort estable (a igualdad, gana el
+que venía antes). Sin regex ni bucles de Python por email: los emails
+distintos (pd.factorize) se pasan a bytes ASCII en minúsculas y se parten
+con np.strings en parte local, dominio y TLD. Cada parte se comprueba
+contra los caracteres de LOCAL_PART_PATTERN / DOMAIN_PART_PATTERN con un
+bytes.translate sobre todas las partes unidas, IGNORE_PATTERNS se busca con
+bytes.find, los prefijos de rol con np.strings.startswith y los dominios
+gratuitos/desechables con np.searchsorted. Todo se calcula una vez por email
+distinto y se reparte a las filas con los códigos del factorize.
+
+Más de MAX_EMAIL_LENGTH caracteres no es un email (igual que en
+contact_rank). Un carácter no ASCII tampoco: VALID_EMAIL_RE solo admite
+ASCII.
+
+Uso:
+    from email_rank import best_contacts, rank_candidates, reject_reasons
+    best = best_contacts(df["emails"], df["dominio"])   # Serie de listas → mejor email
+    ranked = rank_candidates(pd.DataFrame({"lead": ..., "email": ..., "domain": ...}))
+    reasons = reject_reasons(df["email"])                # None si vale
+
+    python bench_email_rank.py --candidates 1000000      # frente a los bucles por fila
+"""
+
+import re
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from contact_extract import (DISPOSABLE_DOMAINS, DOMAIN_PART_PATTERN, FREE_MAIL_DOMAINS, IGNORE_PATTERNS,
+                             LOCAL_PART_PATTERN, MAX_EMAIL_LENGTH, PRIORITY_PREFIXES)
+
+# ── Config ─────────────────────────────────────────────────────────────────
+SEPARATOR_RE = re.compile(r"[,;\s]+")   # varios emails en una misma celda
+
+IGNORE_BYTES = [p.encode() for p in IGNORE_PATTERNS]
+
+# Bytes que obligan a rehacer una línea con str: espacios (strip) y "?" (no ASCII)
+ODD_BYTES = [c.encode() for c in "\t\x0b\x0c\r\x1c\x1d\x1e\x1f ?"]
+
+# Mismo orden que la tupla de contact_rank(): dominio propio, rol, gratuito
+OWN_WEIGHT  = 2 * (len(PRIORITY_PREFIXES) + 1)
+ROLE_WEIGHT = 2
+UNUSABLE    = np.iinfo(np.int32).max
+
+# Caracteres admitidos en la parte local, el dominio y el TLD, sacados de
+# LOCAL_PART_PATTERN / DOMAIN_PART_PATTERN (contact_extract.py) probando cada
+# byte ASCII; para bytes.translate(None, ...)
+LOCAL_RE  = re.compile(LOCAL_PART_PATTERN)
+DOMAIN_RE = re.compile(DOMAIN_PART_PATTERN)
+LOCAL_BYTES  = bytes(b for b in range(1, 128) if LOCAL_RE.fullmatch(chr(b)))
+DOMAIN_BYTES = bytes(b for b in range(1, 128) if DOMAIN_RE.fullmatch(f"x{chr(b)}.es"))
+TLD_BYTES    = bytes(b for b in range(1, 128) if DOMAIN_RE.fullmatch(f"x.{chr(b) * 8}"))
+TLD_MIN      = next(n for n in range(1, 64) if DOMAIN_RE.fullmatch("x." + "a" * n))
+
+# Dominios con tratamiento especial, ordenados para np.searchsorted: 1 = gratuito, 2 = desechable
+SPECIAL_HOSTS = sorted([(d.encode(), 1) for d in FREE_MAIL_DOMAINS] + [(d.encode(), 2) for d in DISPOSABLE_DOMAINS])
+SPECIAL_NAMES = np.array([h for h, _ in SPECIAL_HOSTS])
+SPECIAL_KINDS = np.array([k for _, k in SPECIAL_HOSTS], dtype=np.int8)
+
+
+def _clean(value) -> str:
+    """Un valor tal y como lo ve contact_rank(): en minúsculas y sin espacios alrededor."""
+    return str(value).replace("\n", " ").replace("\0", "?").lower().strip()
+
+
+def _line_ends(data: bytes) -> np.ndarray:
+    """Posición del final de cada línea de `data` (el "\n", o len(data) la última)."""
+    return np.append(np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord("\n")), len(data))
+
+
+def _find_all(data: bytes, pattern: bytes):
+    """Posiciones de `pattern` en `data` (bytes.find: búsqueda en C, sin regex)."""
+    i = data.find(pattern)
+    while i >= 0:
+        yield i
+        i = data.find(pattern, i + 1)
+
+
+def _distinct(values: np.ndarray) -> tuple[np.ndarray, list[bytes]]:
+    """
+    (código por fila, valores distintos como bytes ASCII en minúsculas y sin
+    espacios alrededor). Los nulos son "" (el último código); lo que no es
+    ASCII queda como "?".
+    """
+    codes, uniques = pd.factorize(values)
+    keys = uniques.tolist()
+    keys.append("")
+    codes[codes < 0] = len(keys) - 1
+    try:
+        text = "\n".join(keys)
+    except TypeError:   # algún valor no es str
+        text = "\n".join(map(str, keys))
+    if text.count("\n") != len(keys) - 1 or "\0" in text:
+        # Saltos de línea dentro de un valor (uno por línea) o bytes nulos (el relleno): no son emails
+        text = "\n".join(str(k).replace("\n", " ").replace("\0", "?") for k in keys)
+    # bytes.lower() solo toca ASCII: es lo normal y va en C sin tablas Unicode
+    raw = text.encode("ascii", "replace").lower()
+    lines = raw.split(b"\n")
+
+    # Las pocas líneas con espacios o con algo no ASCII ("?") se rehacen con str:
+    # strip() y lower() Unicode (hay mayúsculas no ASCII que pasan a ASCII)
+    ends = _line_ends(raw)
+    odd = [i for byte in ODD_BYTES for i in _find_all(raw, byte)]
+    for i in np.unique(np.searchsorted(ends, odd)).tolist():
+        lines[i] = _clean(keys[i]).encode("ascii", "replace")
+    return codes, lines
+
+
+def _leftover(text: bytes, allowed: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Por cada línea de `text`, lo que queda al quitarle los bytes de `allowed`:
+    (cuántos bytes quedan, el último de ellos o "\n" si no queda ninguno).
+    """
+    rest = text.translate(None, allowed)
+    ends = _line_ends(rest)
+    return np.diff(ends, prepend=-1) - 1, np.frombuffer(b"\n" + rest, dtype=np.uint8)[ends]
+
+
+def _checks(emails: np.ndarray, domains: np.ndarray | None = None,
+            owner: np.ndarray | None = None) -> dict[str, np.ndarray]:
+    """
+    Columnas de rank_candidates() para `emails` y el dominio de su lead:
+    `domains[i]`, o `domains[owner[i]]` si `domains` va por lead.
+    """
+    codes, lines = _distinct(emails)
+    text = b"\n".join(lines)
+    ends = _line_ends(text)
+    lengths = np.diff(ends, prepend=-1) - 1
+    ignored = np.zeros(len(lines), dtype=bool)
+    ignored[np.searchsorted(ends, [i for pattern in IGNORE_BYTES for i in _find_all(text, pattern)])] = True
+
+    keys = np.array(lines, dtype=f"S{max(1, min(int(lengths.max(initial=0)), MAX_EMAIL_LENGTH))}")
+    at = np.strings.find(keys, b"@")
+    host = np.strings.slice(keys, at + 1, None)
+    last_dot = np.strings.rfind(host, b".")
+    tld_length = np.strings.str_len(host) - last_dot - 1
+
+    # local@dominio.tld: fuera de LOCAL_BYTES solo queda el "@"; fuera de
+    # DOMAIN_BYTES, lo último que queda es el "@" (detrás, todo es dominio);
+    # fuera de TLD_BYTES, lo último es el "." del TLD (detrás, todo es TLD)
+    strays, last = _leftover(text, LOCAL_BYTES)
+    valid = (strays == 1) & (last == ord("@")) & (at > 0)
+    valid &= _leftover(text, DOMAIN_BYTES)[1] == ord("@")
+    valid &= (_leftover(text, TLD_BYTES)[1] == ord(".")) & (last_dot > 0) & (tld_length >= TLD_MIN)
+    valid &= (lengths <= MAX_EMAIL_LENGTH) & ~ignored
+
+    role = np.full(len(keys), len(PRIORITY_PREFIXES), dtype=np.int32)
+    # Del menos al más prioritario: el prefijo que antes aparece en la lista gana.
+    # (los prefijos no llevan "@": mirar el email entero es mirar la parte local).
+    # Cortar a len(prefijo) bytes y comparar es un startswith sin recorrer cadenas
+    for rank in range(len(PRIORITY_PREFIXES) - 1, -1, -1):
+        prefix = PRIORITY_PREFIXES[rank].encode()
+        role[keys.astype(f"S{len(prefix)}") == prefix] = rank
+
+    slot = np.minimum(np.searchsorted(SPECIAL_NAMES, host), len(SPECIAL_NAMES) - 1)
+    kind = np.where(SPECIAL_NAMES[slot] == host, SPECIAL_KINDS[slot], 0)
+
+    # Todo lo que no depende del lead se calcula por email distinto
+    usable = valid & (kind != 2)
+    rank = role * ROLE_WEIGHT + (kind == 1)
+    checks = {
+        "valid": valid[codes],
+        "disposable": (kind == 2)[codes],
+        "free_mail": (kind == 1)[codes],
+        "role_rank": role[codes],
+        "empty": (lengths == 0)[codes],
+        "usable": usable[codes],
+    }
+    if domains is not None:
+        # Dominio del email == dominio del lead (los dos en minúsculas)
+        domain_codes, lead_domains = _distinct(domains)
+        if owner is not None:
+            domain_codes = domain_codes[owner]
+        lead_domains = np.array(lead_domains, dtype=bytes)
+        checks["own_domain"] = (host[codes] == lead_domains[domain_codes]) & (lead_domains != b"")[domain_codes]
+    else:
+        checks["own_domain"] = np.zeros(len(codes), dtype=bool)
+    rank = rank[codes] + np.where(checks["own_domain"], 0, OWN_WEIGHT)
+    checks["rank"] = np.where(checks["usable"], rank, UNUSABLE).astype(np.int32)
+    return checks
+
+
+def rank_candidates(candidates: pd.DataFrame, email: str = "email",
+                    domain: str | None = "domain") -> pd.DataFrame:
+    """
+    `candidates` con las columnas valid, disposable, free_mail, own_domain,
+    role_rank, usable y rank añadidas. `domain` (dominio registrable del
+    lead) es opcional.
+    """
+    out = candidates.copy()
+    domains = out[domain].to_numpy(dtype=object) if domain is not None and domain in out else None
+    checks = _checks(out[email].to_numpy(dtype=object), domains)
+    for column in ("valid", "disposable", "free_mail", "own_domain", "role_rank", "usable", "rank"):
+        out[column] = checks[column]
+    return out
+
+
+def _split(emails: pd.Series) -> tuple[list, np.ndarray]:
+    """(listas de emails por lead, número de candidatos de cada lead)."""
+    lists = emails.tolist()
+    if not set(map(type, lists)) <= {list, tuple}:
+        lists = [v if isinstance(v, (list, tuple)) else SEPARATOR_RE.split(v) if isinstance(v, str) else ()
+                 for v in lists]
+    return lists, np.fromiter(map(len, lists), dtype=np.int64, count=len(lists))
+
+
+def explode_candidates(emails: pd.Series, domains: pd.Series | None = None) -> pd.DataFrame:
+    """
+    Una fila por candidato (lead, email, domain) a partir de una Serie con
+    una lista de emails por lead (o un texto "a@x.es; b@y.es").
+    """
+    lists, counts = _split(emails)
+    positions = np.repeat(np.arange(len(lists)), counts)
+    frame = pd.DataFrame({"lead": emails.index.to_numpy()[positions],
+                          "email": np.fromiter(chain.from_iterable(lists), dtype=object, count=counts.sum())})
+    if domains is not None:
+        frame["domain"] = domains.reindex(emails.index).to_numpy()[positions]
+    keep = frame["email"].notna().to_numpy() & (frame["email"] != "").to_numpy()
+    return frame[keep].reset_index(drop=True)
+
+
+def _first_best(leads: np.ndarray, rank: np.ndarray, usable: np.ndarray) -> np.ndarray:
+    """Posición del mejor candidato utilizable de cada lead (a igual rank, el primero)."""
+    candidates = np.flatnonzero(usable)
+    # lexsort es estable: a igual (lead, rank) se conserva el orden de entrada
+    order = candidates[np.lexsort((rank[candidates], leads[candidates]))]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = leads[order][1:] != leads[order][:-1]
+    return order[first]
+
+
+def best_from_ranked(ranked: pd.DataFrame, lead: str = "lead", email: str = "email") -> pd.Series:
+    """Mejor email por lead (solo leads con algún candidato utilizable)."""
+    lead_codes, _ = pd.factorize(ranked[lead])
+    best = _first_best(lead_codes, ranked["rank"].to_numpy(), ranked["usable"].to_numpy())
+    return pd.Series(ranked[email].to_numpy()[best], index=ranked[lead].to_numpy()[best], name=email)
+
+
+def best_contacts(emails: pd.Series, domains: pd.Series | None = None) -> pd.Series:
+    """
+    Mejor email de cada lead; `emails` es una Serie de listas (o textos con
+    varios emails) y `domains` el dominio registrable de cada lead, con el
+    mismo índice (único). "" si ningún candidato sirve.
+    """
+    lists, counts = _split(emails)
+    leads = np.repeat(np.arange(len(lists)), counts)
+    flat = np.fromiter(chain.from_iterable(lists), dtype=object, count=counts.sum())
+    lead_domains = None if domains is None else domains.reindex(emails.index).to_numpy(dtype=object)
+    checks = _checks(flat, lead_domains, owner=leads)
+    # Los candidatos ya van agrupados por lead: el mejor de cada grupo es el
+    # mínimo de rank * n + posición (a igual rank, el primero), con un reduceat
+    n = len(flat)
+    result = np.full(len(lists), "", dtype=object)
+    if n:
+        key = np.where(checks["usable"], checks["rank"].astype(np.int64) * n + np.arange(n), np.iinfo(np.int64).max)
+        has = np.flatnonzero(counts)
+        best = np.minimum.reduceat(key, np.concatenate(([0], np.cumsum(counts)[:-1]))[has])
+        found = best != np.iinfo(np.int64).max
+        result[has[found]] = flat[best[found] % n]
+    return pd.Series(result, index=emails.index, name=emails.name)
+
+
+def reject_reasons(emails: pd.Series) -> pd.Series:
+    """Por email: None si vale para un lead, o el motivo ("sin email", "formato inválido", "desechable")."""
+    checks = _checks(emails.to_numpy(dtype=object))
+    reasons = np.select(
+        [checks["empty"], ~checks["valid"], checks["disposable"]],
+        ["sin email", "formato inválido", "desechable"],
+        default=None,
+    )
+    return pd.Series(reasons, index=emails.index, dtype=object)
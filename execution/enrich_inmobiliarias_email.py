@@ -6,19 +6,39 @@ Lee inmobiliarias_zaragoza.csv, busca el email de las que tienen Web
 pero no Email usando Hunter.io Domain Search API (free: 25 búsquedas/mes).
 Guarda el resultado en .tmp/inmobiliarias_enriched.csv
 
+Las respuestas se guardan por dominio en hunter_cache.py (también las que
+no encuentran nada, con caducidad), así que repetir el run no gasta
+búsquedas en dominios ya conocidos. Con la cuota que queda este mes se
+consultan solo los dominios más prometedores (ver expected_value): más
+valoración/reseñas en Maps, varias filas con el mismo dominio, y nunca
+los que ya tienen email del scraper (scrape_emails_from_webs.py).
+
+Las búsquedas van en paralelo por hunter_client.py (token bucket,
+Retry-After, reintentos acotados): una fila que choca con el rate limit no
+se pierde, y si no se pudo preguntar no se cachea como "sin email".
+
+Uso:
+    python enrich_inmobiliarias_email.py [--budget 10] [--dry-run]
+                                         [--rate 10] [--concurrency 8]
+
 Requiere: HUNTER_API_KEY en .env
 Instalar:  pip install requests python-dotenv
 """
 
+import argparse
+import asyncio
 import csv
 import json
+import math
 import os
-import time
-from urllib.parse import urlparse
+from collections import defaultdict
 
-import requests
 from dotenv import load_dotenv
 
+from domains import registrable_domain
+from hunter_cache import HunterCache, remaining_quota
+from hunter_client import BURST, CONCURRENCY, RATE, HunterClient
+
 # ── Config ──────────────────────────────────────────────────────────────────
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 load_dotenv(os.path.join(BASE_DIR, ".env"))
@@ -26,117 +46,196 @@ load_dotenv(os.path.join(BASE_DIR, ".env"))
 HUNTER_API_KEY = os.getenv("HUNTER_API_KEY")
 INPUT_CSV  = os.path.expanduser("~/Downloads/inmobiliarias_zaragoza.csv")
 OUTPUT_CSV = os.path.join(BASE_DIR, ".tmp", "inmobiliarias_enriched.csv")
+SCRAPED_CSV = os.path.expanduser("~/Downloads/inmobiliarias_con_email.csv")  # salida del scraper
 os.makedirs(os.path.dirname(OUTPUT_CSV), exist_ok=True)
 
+# Columnas de la exportación de Maps que se usan para priorizar (la primera que exista)
+RATING_FIELDS  = ("Rating", "rating", "Valoracion", "Valoración", "Puntuacion", "Puntuación")
+REVIEWS_FIELDS = ("Reviews", "reviews", "Reseñas", "Resenas", "Num_resenas")
+DEFAULT_RATING = 3.5   # si la fila no trae valoración
+
 # ── Helpers ──────────────────────────────────────────────────────────────────
 def extract_domain(url: str) -> str | None:
-    """Extrae el dominio raíz de una URL."""
-    if not url:
-        return None
-    parsed = urlparse(url if url.startswith("http") else f"https://{url}")
-    domain = parsed.netloc or parsed.path
-    return domain.replace("www.", "").strip("/") or None
+    """
+    Extrae el dominio raíz (registrable, según la Public Suffix List) de una
+    URL: todas las oficinas de una franquicia comparten una sola búsqueda.
+    """
+    return registrable_domain(url)
 
 
-def hunter_domain_search(domain: str) -> str | None:
+def _number(row: dict, fields: tuple[str, ...]) -> float | None:
+    for field in fields:
+        value = (row.get(field) or "").strip().replace(",", ".")
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    return None
+
+
+def expected_value(rows: list[dict]) -> float:
     """
-    Llama a Hunter.io /domain-search y devuelve el primer email encontrado.
-    Documentación: https://hunter.io/api-documentation/v2#domain-search
+    Lo que vale gastar una búsqueda en el dominio de `rows`: cada fila
+    aporta su valoración (0-5 → 0-1) multiplicada por un peso logarítmico
+    de sus reseñas. Varias filas con el mismo dominio suman.
     """
-    if not HUNTER_API_KEY:
-        raise ValueError("HUNTER_API_KEY no está definido en .env")
-
-    url = "https://api.hunter.io/v2/domain-search"
-    params = {
-        "domain": domain,
-        "api_key": HUNTER_API_KEY,
-        "limit": 5,
-        "type": "generic",  # emails genéricos tipo info@, contacto@, etc.
-    }
-    try:
-        r = requests.get(url, params=params, timeout=10)
-        r.raise_for_status()
-        data = r.json()
-        emails = data.get("data", {}).get("emails", [])
-        if emails:
-            # Priorizar emails genéricos (info@, contacto@, etc.)
-            generic = [e for e in emails if any(
-                e["value"].startswith(p) for p in ("info", "contact", "hola", "inmobiliaria", "oficina")
-            )]
-            return (generic or emails)[0]["value"]
-    except requests.RequestException as e:
-        print(f"  ⚠️  Hunter error para {domain}: {type(e).__name__}")
-    return None
+    value = 0.0
+    for row in rows:
+        rating = _number(row, RATING_FIELDS)
+        reviews = _number(row, REVIEWS_FIELDS) or 0
+        value += ((rating if rating is not None else DEFAULT_RATING) / 5) * (1 + math.log10(1 + reviews))
+    return value
+
+
+def scraped_domains() -> set[str]:
+    """Dominios para los que el scraper de webs ya sacó email."""
+    if not os.path.exists(SCRAPED_CSV):
+        return set()
+    with open(SCRAPED_CSV, newline="", encoding="utf-8") as f:
+        return {
+            d for r in csv.DictReader(f)
+            if (r.get("email") or "").strip() and (d := extract_domain((r.get("web") or "").strip()))
+        }
+
+
+def plan_searches(pending: dict[str, list[dict]], skip: set[str], budget: int) -> list[str]:
+    """Los `budget` dominios con más valor esperado (sin los de `skip`)."""
+    ranked = sorted(
+        (d for d in pending if d not in skip),
+        key=lambda d: (-expected_value(pending[d]), d),
+    )
+    return ranked[:budget]
+
+
+def mask(email: str) -> str:
+    return email.split('@')[0][:3] + '***@' + email.split('@')[1] if '@' in email else '***'
+
+
+async def search_plan(client: HunterClient, plan: list[str], pending: dict[str, list[dict]],
+                      cache: HunterCache) -> tuple[int, int]:
+    """Busca los dominios de `plan` en paralelo; devuelve (filas enriquecidas, dominios fallidos)."""
+    enriched = failed = 0
+    async for result in client.search_many(plan):
+        rows = pending[result.domain]
+        if not result.ok:
+            # Sin cachear: el dominio sigue pendiente para el próximo run
+            failed += 1
+            print(f"  ⚠️  Hunter error para {result.domain}: {result.error}")
+            continue
+        cache.put(result.domain, result.email)
+        cache.save()  # tras cada respuesta: una búsqueda pagada no se pierde por un Ctrl-C
+        for row in rows:
+            row["Email_enriched"] = result.email
+        if result.email:
+            enriched += len(rows)
+            print(f"  ✅ {result.domain}: {mask(result.email)}")
+        else:
+            print(f"  ❌ {result.domain}: no encontrado")
+    if client.quota_exhausted:
+        print("  ⛔ Hunter dice que no queda cuota este mes; el resto queda para el siguiente")
+    return enriched, failed
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Enriquece con Hunter.io las inmobiliarias sin email.")
+    parser.add_argument("--budget", type=int, default=None,
+                        help="búsquedas máximas en este run (por defecto, la cuota que queda este mes)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="mostrar qué dominios se consultarían, sin llamar a Hunter")
+    parser.add_argument("--rate", type=float, default=RATE,
+                        help=f"peticiones/s a Hunter (por defecto {RATE})")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY,
+                        help=f"búsquedas en vuelo a la vez (por defecto {CONCURRENCY})")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     if not HUNTER_API_KEY:
         print("❌ HUNTER_API_KEY no encontrado en .env")
         print("   1. Regístrate gratis en https://hunter.io (25 búsquedas/mes)")
         print("   2. Añade HUNTER_API_KEY=tu_api_key al archivo .env")
         return
 
-    rows = []
-    enriched = 0
-    skipped = 0
-
     with open(INPUT_CSV, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames + ["Email_enriched"] if "Email_enriched" not in (reader.fieldnames or []) else reader.fieldnames
-        raw_rows = list(reader)
+        raw_rows = list(csv.DictReader(f))
 
     print(f"📋 {len(raw_rows)} inmobiliarias encontradas en el CSV\n")
 
+    cache = HunterCache()
+    skipped = 0
+    pending: dict[str, list[dict]] = defaultdict(list)   # dominio → filas sin email
+
     for row in raw_rows:
         name   = row.get("Nombre", "").strip()
         email  = row.get("Email", "").strip()
         web    = row.get("Web", "").strip()
+        row["Email_enriched"] = ""
 
         # Si ya tiene email, no hacemos nada
         if email:
-            row["Email_enriched"] = ""
-            masked = email.split('@')[0][:3] + '***@' + email.split('@')[1] if '@' in email else '***'
-            print(f"  ✅ {name}: ya tiene email → {masked}")
+            print(f"  ✅ {name}: ya tiene email → {mask(email)}")
             skipped += 1
-            rows.append(row)
             continue
 
         # Si no tiene web, no podemos buscar
         domain = extract_domain(web)
         if not domain:
-            row["Email_enriched"] = ""
             print(f"  ⛔ {name}: sin web, imposible enriquecer")
-            rows.append(row)
             continue
+        pending[domain].append(row)
 
-        # Buscar con Hunter.io
-        print(f"  🔍 {name} ({domain}) → buscando en Hunter.io...")
-        found_email = hunter_domain_search(domain)
-
-        if found_email:
-            row["Email_enriched"] = found_email
-            masked_found = found_email.split('@')[0][:3] + '***@' + found_email.split('@')[1] if '@' in found_email else '***'
-            print(f"     ✅ Encontrado: {masked_found}")
-            enriched += 1
-        else:
-            row["Email_enriched"] = ""
-            print(f"     ❌ No encontrado")
+    # 1. Lo que ya sabemos de runs anteriores no gasta cuota
+    from_cache = 0
+    for domain in list(pending):
+        entry = cache.get(domain)
+        if entry is None:
+            continue
+        for row in pending.pop(domain):
+            row["Email_enriched"] = entry["email"]
+            from_cache += bool(entry["email"])
+        print(f"  💾 {domain}: en caché → {mask(entry['email']) if entry['email'] else 'sin email'}")
+
+    # 2. Con la cuota que queda, solo los dominios más prometedores
+    scraped = scraped_domains() & pending.keys()
+    quota = remaining_quota(HUNTER_API_KEY, cache)
+    budget = quota if args.budget is None else min(args.budget, quota)
+    plan = plan_searches(pending, scraped, budget)
+    print(f"\n🎯 {len(pending)} dominios sin resolver ({len(scraped)} ya con email del scraper), "
+          f"cuota restante {quota}, se consultan {len(plan)}")
+
+    for domain in plan:
+        names = ", ".join(r.get("Nombre", "").strip() for r in pending[domain])
+        print(f"  🔍 {names} ({domain}, valor {expected_value(pending[domain]):.2f})")
+
+    if args.dry_run:
+        print("\n🧪 --dry-run: no se ha llamado a Hunter ni se escribe el CSV")
+        return
 
-        rows.append(row)
-        time.sleep(0.5)  # Cortesía con la API
+    client = HunterClient(HUNTER_API_KEY, rate=args.rate, burst=min(BURST, max(1, args.concurrency)),
+                          concurrency=max(1, args.concurrency))
+    try:
+        enriched, failed = asyncio.run(search_plan(client, plan, pending, cache))
+    finally:
+        client.close()
+        cache.save()
 
     # Guardar resultado
-    all_fieldnames = list(raw_rows[0].keys()) + (["Email_enriched"] if "Email_enriched" not in raw_rows[0] else [])
+    all_fieldnames = list(raw_rows[0].keys())
     with open(OUTPUT_CSV, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=all_fieldnames)
         writer.writeheader()
-        writer.writerows(rows)
+        writer.writerows(raw_rows)
 
     print(f"\n📊 Resultado:")
     print(f"   - {skipped} ya tenían email")
+    print(f"   - {from_cache} emails sacados de la caché (0 búsquedas)")
     print(f"   - {enriched} emails encontrados por Hunter.io")
-    print(f"   - {len(rows) - skipped - enriched} sin email encontrado")
+    if failed:
+        print(f"   - {failed} dominios sin respuesta de Hunter (se reintentan en el próximo run)")
+    print(f"   - {len(raw_rows) - skipped - from_cache - enriched} sin email encontrado")
     print(f"\n💾 Guardado en: {OUTPUT_CSV}")
 
 
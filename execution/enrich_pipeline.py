@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+enrich_pipeline.py
+------------------
+Enriquecimiento de emails en una sola pasada, fila a fila y por niveles,
+del más barato al más caro:
+
+    1. input   la fila ya trae email
+    2. cache   resuelta en un run anterior (diario del pipeline) o dominio
+               ya conocido en la caché de Hunter (hunter_cache.py)
+    3. scrape  web de la inmobiliaria (scrape_emails_from_webs.scrape_website)
+    4. hunter  Hunter.io, solo si lo anterior no encontró nada y queda cuota
+
+Acepta los dos esquemas de CSV que tenemos (nombre/web/email del scraper de
+Maps y Nombre/Web/Email de inmobiliarias_zaragoza.csv): el email se escribe
+en la columna de email del propio esquema y se añade `email_source` con el
+nivel que lo resolvió.
+
+Con `--verify` cada email resuelto pasa además por deliverability.py (MX,
+y con `--smtp` sondeo RCPT TO) y su estado va a la columna `email_status`:
+una errata o un dominio muerto se ve aquí y no en los rebotes.
+
+El CSV de entrada se lee en streaming (nunca entero en memoria) con como
+mucho WINDOW filas en vuelo, y cada fila se escribe en cuanto termina (en
+orden de llegada, no de entrada). Cada fila resuelta se apunta en un diario:
+con `--resume` un run cortado continúa sin repetir trabajo.
+
+Uso:
+    python enrich_pipeline.py ~/Downloads/inmobiliarias_zaragoza.csv
+    python enrich_pipeline.py entrada.csv -o salida.csv [--no-hunter]
+        [--hunter-budget 10] [--concurrency 16] [--per-host 2] [--resume]
+        [--verify [--smtp]]
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from deliverability import STATUS_FIELD, DeliverabilityChecker
+from domains import SiteMemo
+from enrich_inmobiliarias_email import HUNTER_API_KEY, expected_value, extract_domain
+from hunter_cache import HunterCache, remaining_quota
+from hunter_client import HunterClient, HunterResult
+from run_journal import RunJournal, row_key
+from scrape_emails_from_webs import CONCURRENCY, DELAY, PER_HOST, host_of, scrape_website
+
+# ── Config ─────────────────────────────────────────────────────────────────
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TMP_DIR  = os.path.join(BASE_DIR, ".tmp")
+
+WINDOW = 4   # filas en vuelo = concurrency * WINDOW (acota la memoria)
+
+# Nombre canónico → alias por esquema, en orden de preferencia
+COLUMNS = {
+    "nombre": ("nombre", "Nombre"),
+    "web":    ("web", "Web"),
+    "email":  ("email", "Email"),
+}
+SOURCE_FIELD = "email_source"
+TIERS = ("input", "cache", "scrape", "hunter")
+
+
+def map_columns(fieldnames: list[str]) -> dict[str, str]:
+    """Columna real del CSV para cada nombre canónico (la de email se crea si falta)."""
+    mapping = {}
+    for canonical, aliases in COLUMNS.items():
+        mapping[canonical] = next((a for a in aliases if a in fieldnames), aliases[0])
+    return mapping
+
+
+class Pipeline:
+    def __init__(self, args: argparse.Namespace, columns: dict[str, str], journal: RunJournal,
+                 writer: csv.DictWriter, out_file):
+        self.args = args
+        self.columns = columns
+        self.journal = journal
+        self.writer = writer
+        self.out_file = out_file
+        self.stats: Counter = Counter()
+        self.hunter_cache = HunterCache()
+        self.executor = ThreadPoolExecutor(max_workers=args.concurrency)
+        self.host_slots: dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(args.per_host))
+        self.scrape_slots = asyncio.Semaphore(args.concurrency)
+        # Un dominio compartido por varias filas se visita/pregunta una sola vez
+        self.memo = SiteMemo()
+        self.site_tasks: dict[str, asyncio.Task] = {}
+        self.hunter_tasks: dict[str, asyncio.Task] = {}
+        self.hunter_budget = 0
+        self.hunter: HunterClient | None = None
+        if args.hunter and HUNTER_API_KEY:
+            quota = remaining_quota(HUNTER_API_KEY, self.hunter_cache)
+            self.hunter_budget = quota if args.hunter_budget is None else min(args.hunter_budget, quota)
+            self.hunter = HunterClient(HUNTER_API_KEY)
+        self.checker: DeliverabilityChecker | None = None
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.hunter:
+            self.hunter.close()
+        self.hunter_cache.save()
+
+    # ── Niveles ───────────────────────────────────────────────────────────
+    def _from_cache(self, key: str, domain: str | None) -> str | None:
+        settled = self.journal.settled.get(key)
+        if settled is not None:
+            return settled.get("email", "")
+        entry = self.hunter_cache.get(domain) if domain else None
+        if entry and entry["email"]:
+            return entry["email"]
+        return None
+
+    async def _scrape(self, web: str, domain: str) -> str:
+        """Scrape de la web, una sola vez por dominio registrable en todo el run."""
+        site = self.memo.canonical(domain)
+        task = self.site_tasks.get(site)
+        if task is None:
+            task = self.site_tasks[site] = asyncio.ensure_future(self._scrape_site(web, site))
+        return await asyncio.shield(task)
+
+    async def _scrape_site(self, web: str, site: str) -> str:
+        loop = asyncio.get_running_loop()
+        # Primero la plaza del host y luego la global, como en crawl()
+        async with self.host_slots[host_of(web)]:
+            async with self.scrape_slots:
+                email = await loop.run_in_executor(self.executor, scrape_website, web, self.memo)
+            self.memo.put(site, email)
+            await asyncio.sleep(DELAY)
+        return email
+
+    async def _search(self, domain: str) -> HunterResult:
+        result = await self.hunter.search(domain)
+        if result.ok:
+            self.hunter_cache.put(domain, result.email)
+            self.hunter_cache.save()  # una búsqueda pagada no se pierde por un Ctrl-C
+        else:
+            self.stats["hunter_errors"] += 1
+        return result
+
+    async def _hunter(self, domain: str, row: dict) -> HunterResult | None:
+        """Resultado de Hunter para `domain`, o None si no toca gastar búsqueda."""
+        # Lo que Hunter ya contestó (también "no tengo nada") no se vuelve a pagar
+        entry = self.hunter_cache.get(domain)
+        if entry is not None:
+            return HunterResult(domain, email=entry["email"])
+        task = self.hunter_tasks.get(domain)
+        if task is None:
+            if self.hunter is None or self.hunter_budget <= 0 \
+                    or expected_value([row]) < self.args.hunter_min_value:
+                return None
+            self.hunter_budget -= 1
+            task = asyncio.ensure_future(self._search(domain))
+            self.hunter_tasks[domain] = task
+        return await asyncio.shield(task)
+
+    # ── Fila ──────────────────────────────────────────────────────────────
+    async def resolve(self, row: dict) -> tuple[str, str, bool]:
+        """
+        (email, nivel, definitiva) de una fila; nivel "" si nadie encontró
+        nada. No es definitiva si Hunter falló o no se le preguntó (cuota):
+        esa fila no va al diario y el próximo run la vuelve a intentar.
+        """
+        c = self.columns
+        email = (row.get(c["email"]) or "").strip()
+        if email:
+            return email, "input", True
+
+        web = (row.get(c["web"]) or "").strip()
+        domain = extract_domain(web)
+        cached = self._from_cache(row_key(row), domain)
+        if cached is not None:
+            return cached, "cache" if cached else "", True
+        if not domain:
+            return "", "", True
+
+        if self.args.scrape:
+            email = await self._scrape(web, domain)
+            if email:
+                return email, "scrape", True
+        result = await self._hunter(domain, row)
+        if result is None or not result.ok:
+            return "", "", False
+        return result.email, "hunter" if result.email else "", True
+
+    async def process(self, row: dict) -> None:
+        c = self.columns
+        try:
+            email, tier, settled = await self.resolve(row)
+        except Exception as e:  # una fila rota no para el pipeline
+            print(f"  ⚠️  {row.get(c['nombre'], '—')}: {type(e).__name__}: {e}")
+            email, tier, settled = "", "", False
+        if settled and tier not in ("input", "cache"):
+            self.journal.append(row_key(row), email=email, source=tier)
+        if email:
+            row[c["email"]] = email
+        row[SOURCE_FIELD] = tier
+        if self.checker is not None:
+            row[STATUS_FIELD] = await self.checker.check(email) if email else ""
+            self.stats[f"status:{row[STATUS_FIELD]}"] += bool(email)
+        self.writer.writerow(row)
+        self.out_file.flush()
+        self.stats[tier or "missing"] += 1
+        icon = "✅" if email else "❌"
+        print(f"  {icon} [{tier or '—':6}] {row.get(c['nombre'], '—')} → {email or 'no encontrado'}")
+
+    async def run(self, reader: csv.DictReader) -> None:
+        if self.args.verify:
+            # Se crea dentro del loop: sus semáforos y conexiones son de este loop
+            self.checker = DeliverabilityChecker(smtp=self.args.smtp, concurrency=self.args.concurrency)
+        try:
+            await self._run(reader)
+        finally:
+            if self.checker is not None:
+                await self.checker.close()
+
+    async def _run(self, reader: csv.DictReader) -> None:
+        window = asyncio.Semaphore(self.args.concurrency * WINDOW)
+        tasks: set[asyncio.Task] = set()
+
+        async def guarded(row: dict) -> None:
+            try:
+                await self.process(row)
+            finally:
+                window.release()
+
+        for row in reader:
+            await window.acquire()  # no leer más filas de las que caben en vuelo
+            task = asyncio.ensure_future(guarded(row))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+
+# ── Main ────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Enriquece emails por niveles: caché → web → Hunter.")
+    parser.add_argument("input", help="CSV de entrada (esquema nombre/web/email o Nombre/Web/Email)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="CSV de salida (por defecto .tmp/<entrada>_enriched.csv)")
+    parser.add_argument("--no-scrape", dest="scrape", action="store_false", help="saltar el nivel web")
+    parser.add_argument("--no-hunter", dest="hunter", action="store_false", help="saltar el nivel Hunter")
+    parser.add_argument("--hunter-budget", type=int, default=None,
+                        help="búsquedas de Hunter máximas (por defecto, la cuota que queda)")
+    parser.add_argument("--hunter-min-value", type=float, default=0.0,
+                        help="valor esperado mínimo de una fila para gastar Hunter en ella")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--per-host", type=int, default=PER_HOST)
+    parser.add_argument("--resume", action="store_true",
+                        help="reutilizar el diario del run anterior (filas ya resueltas = nivel cache)")
+    parser.add_argument("--verify", action="store_true",
+                        help="comprobar MX de cada email encontrado (columna email_status)")
+    parser.add_argument("--smtp", action="store_true", help="con --verify, sondeo SMTP RCPT TO además del MX")
+    args = parser.parse_args()
+    args.concurrency = max(1, args.concurrency)
+    args.per_host = max(1, args.per_host)
+    return args
+
+
+def main():
+    args = parse_args()
+    input_path = os.path.expanduser(args.input)
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    output = os.path.expanduser(args.output) if args.output else os.path.join(TMP_DIR, f"{stem}_enriched.csv")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    journal_path = os.path.join(TMP_DIR, f"{stem}.pipeline.journal.jsonl")
+
+    started = time.monotonic()
+    with open(input_path, newline="", encoding="utf-8") as f_in:
+        reader = csv.DictReader(f_in)
+        fieldnames = list(reader.fieldnames or [])
+        columns = map_columns(fieldnames)
+        extra = (columns["email"], SOURCE_FIELD) + ((STATUS_FIELD,) if args.verify else ())
+        out_fields = fieldnames + [name for name in extra if name not in fieldnames]
+        print(f"📋 {input_path} · columnas {columns}")
+
+        partial = output + ".partial"
+        with open(partial, "w", newline="", encoding="utf-8") as f_out, \
+                RunJournal(journal_path, resume=args.resume) as journal:
+            writer = csv.DictWriter(f_out, fieldnames=out_fields, extrasaction="ignore")
+            writer.writeheader()
+            pipeline = Pipeline(args, columns, journal, writer, f_out)
+            if pipeline.hunter:
+                print(f"🎯 Hunter: hasta {pipeline.hunter_budget} búsquedas en este run")
+            try:
+                asyncio.run(pipeline.run(reader))
+            except KeyboardInterrupt:
+                print(f"\n⏸️  Interrumpido: relanza con --resume (lo escrito está en {partial})")
+                raise SystemExit(1)
+            finally:
+                pipeline.close()
+    os.replace(partial, output)
+
+    stats = pipeline.stats
+    total = sum(stats[t] for t in TIERS) + stats["missing"]
+    print(f"\n📊 Resultado ({total} filas en {time.monotonic() - started:.0f}s):")
+    for tier in TIERS:
+        print(f"   - {stats[tier]:5} por {tier}")
+    print(f"   - {stats['missing']:5} sin email")
+    if args.verify:
+        print("   📬 " + ", ".join(f"{n} {k.split(':', 1)[1]}" for k, n in stats.items()
+                                  if k.startswith("status:") and n))
+    print(f"   - {len(pipeline.hunter_tasks)} búsquedas de Hunter ({stats['hunter_errors']} fallidas, "
+          f"se reintentan en el próximo run)")
+    print(f"\n💾 Guardado en: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+entity_resolution.py
+--------------------
+Detección de leads duplicados aunque el nombre no sea idéntico:
+"Tasaciones Del Nordeste" = "Tasaciones Del Nordeste - Tasadores en Zaragoza",
+"Gestoría JP Juan Peña" = "Gestoría JP Juan Peña - Gestión de herencias...".
+
+1. Normalización: sin acentos, puntuación ni forma jurídica (S.L., S.A.).
+   El descriptor que Maps añade tras " - " se conserva: en una franquicia
+   es lo único que separa una oficina de otra ("Redpiso - Actur").
+2. Bloqueo: solo se comparan registros que comparten nombre normalizado,
+   email, teléfono, dominio registrable o suficientes trigramas del nombre
+   (índice invertido, sin palabras genéricas tipo "inmobiliaria" y sin los
+   trigramas demasiado frecuentes). Nunca todos contra todos: escala a exportaciones de 100k filas.
+3. Puntuación de cada par candidato: parecido del nombre (Jaccard de
+   trigramas, o contención de palabras distintivas si comparten al menos
+   MIN_SHARED_WORDS) + teléfono/dominio iguales; email igual = mismo lead.
+   Emails distintos o teléfonos distintos (ambos presentes) = leads
+   distintos, se parezca lo que se parezca el nombre.
+4. Los pares por encima de MATCH_SCORE se agrupan (union-find) y cada grupo
+   se fusiona en el registro más completo, rellenando sus huecos con el resto.
+
+Las oficinas de una franquicia ("Redpiso Delicias", "Redpiso Actur")
+comparten web pero no nombre ni email: el dominio solo suma, no basta por
+sí solo. Fusionar borra filas, así que solo se hace a petición
+(`python lead_store.py dedupe`), nunca al reconstruir los leads.
+
+Uso:
+    from entity_resolution import resolve, dedupe
+    clusters = resolve(records)          # [[i, j, ...], ...] índices duplicados
+    merged = dedupe(records)
+    store.merge_duplicates()             # lo mismo sobre el almacén (lead_store.py)
+
+    python entity_resolution.py leads.csv -o leads_dedup.csv [--threshold 0.8]
+"""
+
+import argparse
+import csv
+import gc
+import math
+import os
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+
+from domains import registrable_domain
+from lead_store import LEAD_FIELDS, LEGAL_SUFFIX_RE
+
+# ── Config ─────────────────────────────────────────────────────────────────
+MATCH_SCORE   = 0.8    # a partir de aquí dos registros son el mismo lead
+MIN_SHARED    = 0.6    # fracción de trigramas selectivos que debe compartir un candidato
+MAX_POSTING   = 100    # trigramas más frecuentes que esto no sirven para bloquear
+MIN_SHARED_WORDS = 2   # palabras distintivas en común para que decida la contención
+
+PHONE_BONUS    = 0.25
+DOMAIN_BONUS   = 0.15
+
+# Palabras que no distinguen a una inmobiliaria de otra
+GENERIC_WORDS = frozenset("""
+    inmobiliaria inmobiliarias inmuebles inmueble fincas finca gestion gestiones
+    servicios asesoria agencia grupo real estate api zaragoza de del la las el los
+    y e en s l sa sl
+""".split())
+
+NON_ALNUM_RE  = re.compile(r"[^a-z0-9]+")
+DIGITS_RE     = re.compile(r"\D+")
+
+
+# ── Normalización ───────────────────────────────────────────────────────────
+def _ascii_lower(text: str) -> str:
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+
+
+def core_name(nombre: str) -> str:
+    """Nombre sin forma jurídica, acentos ni puntuación."""
+    name = LEGAL_SUFFIX_RE.sub("", (nombre or "").strip())
+    return NON_ALNUM_RE.sub(" ", _ascii_lower(name)).strip()
+
+
+def normalize_phone(telefono: str) -> str | None:
+    """Últimos 9 dígitos (sin +34 / 0034); None si no parece un teléfono."""
+    digits = DIGITS_RE.sub("", telefono or "")
+    return digits[-9:] if len(digits) >= 9 else None
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Entity:
+    """Claves precalculadas de un registro."""
+    __slots__ = ("name", "distinct", "_grams", "block_grams", "email", "phone", "domain")
+
+    def __init__(self, record: dict):
+        self.name = core_name(record.get("nombre", ""))
+        self.distinct = set(self.name.split()) - GENERIC_WORDS
+        self._grams = None
+        self.block_grams = trigrams(" ".join(sorted(self.distinct))) if self.distinct else set()
+        email = (record.get("email") or "").strip().lower()
+        self.email = email if "@" in email else None
+        self.phone = normalize_phone(record.get("telefono", ""))
+        self.domain = registrable_domain((record.get("web") or "").strip())
+
+    @property
+    def grams(self) -> set[str]:
+        """Trigramas del nombre completo; solo se calculan si el registro llega a puntuarse."""
+        if self._grams is None:
+            self._grams = trigrams(self.name)
+        return self._grams
+
+
+def score(a: _Entity, b: _Entity) -> float:
+    """Probabilidad (aprox., 0-1+) de que `a` y `b` sean el mismo lead."""
+    if a.email and a.email == b.email:
+        return 1.0
+    # Cada oficina tiene su email y su teléfono: si no coinciden, no es el mismo lead
+    if (a.email and b.email) or (a.phone and b.phone and a.phone != b.phone):
+        return 0.0
+    if not a.name or not b.name:
+        return 0.0
+    jaccard = len(a.grams & b.grams) / len(a.grams | b.grams)
+    containment = 0.0
+    short, long_ = (a.distinct, b.distinct) if len(a.distinct) <= len(b.distinct) else (b.distinct, a.distinct)
+    shared = short & long_
+    if len(shared) >= MIN_SHARED_WORDS:
+        containment = len(shared) / len(short)
+    value = max(jaccard, containment)
+    if a.phone and a.phone == b.phone:
+        value += PHONE_BONUS
+    if a.domain and a.domain == b.domain:
+        value += DOMAIN_BONUS
+    return value
+
+
+# ── Índice ──────────────────────────────────────────────────────────────────
+class EntityIndex:
+    """
+    Índice incremental: `add()` registra un lead y `match()` busca el mejor
+    candidato ya indexado. Bloqueo por email, teléfono, dominio y trigramas.
+    """
+
+    def __init__(self, threshold: float = MATCH_SCORE):
+        self.threshold = threshold
+        self.entities: list[_Entity] = []
+        self._by_name: dict[str, list[int]] = defaultdict(list)
+        self._by_email: dict[str, list[int]] = defaultdict(list)
+        self._by_phone: dict[str, list[int]] = defaultdict(list)
+        self._by_domain: dict[str, list[int]] = defaultdict(list)
+        self._by_gram: dict[str, list[int]] = defaultdict(list)
+
+    def candidates(self, entity: _Entity) -> set[int]:
+        found: set[int] = set()
+        for key, index in self._keys(entity):
+            if key:
+                # Una franquicia con cientos de oficinas no dispara O(n²) comparaciones
+                found.update(index.get(key, ())[:MAX_POSTING])
+        # Trigramas: solo los selectivos (los muy frecuentes no distinguen y
+        # recorrerlos cuesta O(n)); el candidato debe compartir MIN_SHARED de ellos
+        rare = [p for p in map(self._by_gram.get, entity.block_grams) if p and len(p) <= MAX_POSTING]
+        if len(rare) >= 2:
+            shared = Counter()
+            for posting in rare:
+                shared.update(posting)
+            needed = max(2, math.ceil(len(rare) * MIN_SHARED))
+            found.update(i for i, n in shared.items() if n >= needed)
+        return found
+
+    def _keys(self, entity: _Entity):
+        return ((entity.name, self._by_name), (entity.email, self._by_email),
+                (entity.phone, self._by_phone), (entity.domain, self._by_domain))
+
+    def match(self, record: dict | _Entity) -> tuple[int, float] | None:
+        """(índice, puntuación) del mejor candidato por encima del umbral, o None."""
+        entity = record if isinstance(record, _Entity) else _Entity(record)
+        best = None
+        for i in self.candidates(entity):
+            s = score(entity, self.entities[i])
+            if s >= self.threshold and (best is None or s > best[1]):
+                best = (i, s)
+        return best
+
+    def add(self, record: dict | _Entity) -> int:
+        entity = record if isinstance(record, _Entity) else _Entity(record)
+        i = len(self.entities)
+        self.entities.append(entity)
+        for key, index in self._keys(entity):
+            if key:
+                index[key].append(i)
+        for gram in entity.block_grams:
+            self._by_gram[gram].append(i)
+        return i
+
+
+# ── Resolución ──────────────────────────────────────────────────────────────
+def resolve(records: list[dict], threshold: float = MATCH_SCORE) -> list[list[int]]:
+    """Grupos (de 2 o más) de índices de `records` que son el mismo lead."""
+    parent = list(range(len(records)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Se crean cientos de miles de sets sin ciclos: el GC no libera nada y
+    # recorrerlos una y otra vez dobla el tiempo
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        index = EntityIndex(threshold)
+        for i, record in enumerate(records):
+            entity = _Entity(record)
+            for j in index.candidates(entity):
+                if score(entity, index.entities[j]) >= threshold:
+                    parent[find(i)] = find(j)
+            index.add(entity)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    groups: dict[int, list[int]] = defaultdict(list)
+    for i in range(len(records)):
+        groups[find(i)].append(i)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+def completeness(record: dict) -> tuple[int, int]:
+    """Para elegir el registro que se queda: más campos rellenos y nombre más corto."""
+    filled = sum(1 for f in LEAD_FIELDS if str(record.get(f) or "").strip())
+    return filled, -len(record.get("nombre") or "")
+
+
+def merge_records(records: list[dict]) -> dict:
+    """El registro más completo, con los huecos rellenados por los demás."""
+    ordered = sorted(records, key=completeness, reverse=True)
+    merged = dict(ordered[0])
+    for other in ordered[1:]:
+        for field, value in other.items():
+            if value and not str(merged.get(field) or "").strip():
+                merged[field] = value
+    return merged
+
+
+def dedupe(records: list[dict], threshold: float = MATCH_SCORE,
+           clusters: list[list[int]] | None = None) -> list[dict]:
+    """`records` sin duplicados, en el orden original (cada grupo en la posición de su primero)."""
+    if clusters is None:
+        clusters = resolve(records, threshold)
+    first_of: dict[int, list[int]] = {min(c): c for c in clusters}
+    dropped = {i for c in clusters for i in c if i != min(c)}
+    result = []
+    for i, record in enumerate(records):
+        if i in dropped:
+            continue
+        result.append(merge_records([records[j] for j in first_of[i]]) if i in first_of else record)
+    return result
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Fusiona leads duplicados con nombres parecidos.")
+    parser.add_argument("input")
+    parser.add_argument("-o", "--output", default=None, help="por defecto <entrada>_dedup.csv")
+    parser.add_argument("--threshold", type=float, default=MATCH_SCORE)
+    parser.add_argument("--show", action="store_true", help="listar los grupos fusionados")
+    args = parser.parse_args()
+
+    input_path = os.path.expanduser(args.input)
+    output = args.output or os.path.splitext(input_path)[0] + "_dedup.csv"
+    with open(input_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames or LEAD_FIELDS
+        records = list(reader)
+
+    started = time.perf_counter()
+    clusters = resolve(records, args.threshold)
+    if args.show:
+        for cluster in clusters:
+            print("  🔗 " + "  =  ".join(records[i].get("nombre", "") for i in cluster))
+    merged = dedupe(records, args.threshold, clusters)
+
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(merged)
+
+    print(f"📋 {len(records)} leads → {len(merged)} tras fusionar {len(clusters)} grupos "
+          f"({time.perf_counter() - started:.1f}s)")
+    print(f"💾 Guardado en: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import pandas as pd
 import os
 
+from workbook_export import Sheet, write_plan
+
 def export_to_excel():
     matrix_file = "LIVIX_ULTIMATE_TIKTOK_90DAY_PLAN.csv"
     output_file = "LIVIX_TIKTOK_MASTER_PLAN_COMPLETE.xlsx"
@@ -34,52 +36,19 @@ def export_to_excel():
         ["Autoridad", "He analizado 500 pisos en ZGZ y he encontrado esto..."]
     ]
 
-    # Create Excel with multiple sheets
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-        # Sheet 1: 90 Day Matrix
-        df_matrix = pd.read_csv(matrix_file)
-        df_matrix.to_excel(writer, index=False, sheet_name='🗓️ Plan 90 Dias')
-        
-        # Sheet 2: Strategy Roadmap
-        df_roadmap = pd.DataFrame(roadmap_content, columns=["Periodo", "Fase", "Mix Contenido", "KPI Principal"])
-        df_roadmap.to_excel(writer, index=False, sheet_name='🚀 Estrategia')
-        
-        # Sheet 3: Production SOP
-        df_sop = pd.DataFrame(sop_content[1:], columns=sop_content[0])
-        df_sop.to_excel(writer, index=False, sheet_name='🎬 Produccion SOP')
-        
-        # Sheet 4: Script Hooks
-        df_hooks = pd.DataFrame(hooks_vault[1:], columns=hooks_vault[0])
-        df_hooks.to_excel(writer, index=False, sheet_name='🪝 Boveda Ganchos')
-
-        # Formatting
-        workbook = writer.book
-        from openpyxl.styles import Font, PatternFill, Alignment
-
-        for sheet in workbook.worksheets:
-            # Format headers
-            header_font = Font(bold=True, color="FFFFFF")
-            header_fill = PatternFill(start_color="111111", end_color="111111", fill_type="solid")
-            for cell in sheet[1]:
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = Alignment(horizontal="center")
-            
-            # Auto-adjust width
-            for column in sheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length: max_length = len(str(cell.value))
-                    except (TypeError, AttributeError):
-                        pass
-                sheet.column_dimensions[column_letter].width = min(max_length + 2, 60)
-
-    # Move to Downloads
-    import shutil
-    shutil.move(output_file, final_destination)
-    print(f"¡Master Plan consolidado en: {final_destination}")
+    # Create Excel with multiple sheets (streamed, dark headers)
+    df_matrix = pd.read_csv(matrix_file)
+    df_roadmap = pd.DataFrame(roadmap_content, columns=["Periodo", "Fase", "Mix Contenido", "KPI Principal"])
+    df_sop = pd.DataFrame(sop_content[1:], columns=sop_content[0])
+    df_hooks = pd.DataFrame(hooks_vault[1:], columns=hooks_vault[0])
+    changes = write_plan(final_destination, [
+        Sheet('🗓️ Plan 90 Dias', df_matrix, header_style="header_dark"),
+        Sheet('🚀 Estrategia', df_roadmap, header_style="header_dark"),
+        Sheet('🎬 Produccion SOP', df_sop, header_style="header_dark"),
+        Sheet('🪝 Boveda Ganchos', df_hooks, header_style="header_dark"),
+    ])
+
+    print(f"¡Master Plan consolidado en: {final_destination} ({changes.summary()})")
 
 if __name__ == "__main__":
     try:
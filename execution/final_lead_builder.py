@@ -1,15 +1,11 @@
 #!/usr/bin/env python3
-import csv
-import re
-import time
-import os
-import requests
 from requests.exceptions import RequestException
-from urllib.parse import urlparse
 
-# Source 1: Existing "inmobiliarias con mail.csv" (which has 36)
-input_path = "/Users/asiermugica/Downloads/inmobiliarias con mail.csv"
-output_path = "/Users/asiermugica/Downloads/inmobiliarias con mail.csv"
+from contact_extract import best_email, extract_emails
+from http_cache import cached_get
+from lead_store import LEADS_CSV, LeadStore, content_hash
+
+# Source 1: Existing "inmobiliarias con mail.csv" (which has 36), ya en lead_store
 
 # Leads for merging + specific requests
 user_leads = [
@@ -46,53 +42,50 @@ browser_data = [
     ("Residencia Universitas", "http://www.residenciauniversitas.com/")
 ]
 
-# Email scraping config
-HEADERS = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"}
-CONTACT_SLUGS = ["/contacto", "/contacta", "/contact", "/quienes-somos"]
-EMAIL_REGEX = re.compile(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}")
-
-def extract_emails(html):
-    found = EMAIL_REGEX.findall(html)
-    return list(set(found))
-
+# Email scraping: fetch (pool + caché) y extracción compartidos
 def scrape_website(base_url):
     try:
-        r = requests.get(base_url, headers=HEADERS, timeout=5)
+        r = cached_get(base_url, timeout=5)
         if r.status_code == 200:
             emails = extract_emails(r.text)
-            if emails: return emails[0]
+            if emails: return best_email(emails)
     except RequestException as e:
         print(f"  Error scraping {base_url}: {e}")
+        return None  # error de red: el lead se reintenta en el próximo run
     return ""
 
 # Main logic
-leads = []
-if os.path.exists(input_path):
-    with open(input_path, newline='', encoding='utf-8') as f:
-        leads = list(csv.DictReader(f))
-
-seen_emails = {l['email'].lower() for l in leads if l.get('email')}
-seen_names = {l['nombre'].lower() for l in leads if l.get('nombre')}
+store = LeadStore()
 
-# Add specific requested ones
-for l in user_leads:
-    if l['email'].lower() not in seen_emails:
-        leads.append(l)
-        seen_emails.add(l['email'].lower())
+# Cada fuente lleva su huella en el almacén: solo se procesa lo nuevo o
+# cambiado desde el último run (sin cambios = ni una petición de red)
+user_digest = content_hash(user_leads)
+if not store.source_unchanged("final_lead_builder:manual", user_digest):
+    pending = store.changed_records("final_lead_builder:manual", user_leads)
+    store.upsert_many(pending, source="manual")
+    store.mark_synced("final_lead_builder:manual", user_digest, user_leads, done=pending)
 
-# Add and scrape browser ones
-for name, web in browser_data:
-    if name.lower() not in seen_names:
-        print(f"Scraping {name}...")
-        email = scrape_website(web) if web else ""
-        leads.append({"nombre": name, "web": web, "email": email})
-        seen_names.add(name.lower())
+# Add and scrape browser ones (solo los que no tienen ya email)
+browser_leads = [{"nombre": name, "web": web} for name, web in browser_data]
+browser_digest = content_hash(browser_leads)
+if store.source_unchanged("final_lead_builder:browser", browser_digest):
+    print("Browser leads unchanged since last run, nothing to scrape.")
+else:
+    done = []
+    for lead in store.changed_records("final_lead_builder:browser", browser_leads):
+        existing = store.find(nombre=lead["nombre"])
+        email = existing["email"] if existing else ""
+        if not email:
+            print(f"Scraping {lead['nombre']}...")
+            email = scrape_website(lead["web"]) if lead["web"] else ""
+            if email is None:
+                continue
+        store.upsert({**lead, "email": email}, source="browser")
+        done.append(lead)
+    store.mark_synced("final_lead_builder:browser", browser_digest, browser_leads, done)
 
-# Clean and Save
-with open(output_path, 'w', newline='', encoding='utf-8') as f:
-    fn = ['nombre', 'email', 'telefono', 'web', 'direccion', 'valoracion']
-    writer = csv.DictWriter(f, fieldnames=fn, extrasaction='ignore')
-    writer.writeheader()
-    writer.writerows(leads)
+# Save: el CSV es una exportación del almacén
+total = store.export_csv(LEADS_CSV)
+store.close()
 
-print(f"Final lead count: {len(leads)}")
+print(f"Final lead count: {total}")
@@ -1,13 +1,10 @@
 #!/usr/bin/env python3
-import csv
-import re
-import time
-import os
-import requests
 from requests.exceptions import RequestException
 
-input_path = "/Users/asiermugica/Downloads/inmobiliarias con mail.csv"
-output_path = "/Users/asiermugica/Downloads/inmobiliarias con mail.csv"
+from contact_extract import best_email, extract_emails
+from http_cache import cached_get
+from lead_store import LEADS_CSV, LeadStore, content_hash
+
 
 # More comprehensive list from browser turn 217
 browser_text = """
@@ -54,43 +51,50 @@ Europiso Blanber,
 Imago Gestión,
 """
 
-# Scraper part
-HEADERS = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"}
-EMAIL_REGEX = re.compile(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}")
-
+# Scraper part: fetch (pool + caché) y extracción compartidos
 def scrape_website(url):
     if not url or 'http' not in url: return ""
     try:
-        r = requests.get(url, headers=HEADERS, timeout=5)
+        r = cached_get(url, timeout=5)
         if r.status_code == 200:
-            found = EMAIL_REGEX.findall(r.text)
-            if found: return list(set(found))[0]
+            found = extract_emails(r.text)
+            if found: return best_email(found)
     except RequestException as e:
         print(f"  Error scraping {url}: {e}")
+        return None  # error de red: el lead se reintenta en el próximo run
     return ""
 
-leads = []
-if os.path.exists(input_path):
-    with open(input_path, newline='', encoding='utf-8') as f:
-        leads = list(csv.DictReader(f))
+store = LeadStore()
 
-seen_names = {l['nombre'].lower() for l in leads if l.get('nombre')}
-seen_emails = {l['email'].lower() for l in leads if l.get('email')}
+# La lista lleva su huella en el almacén: solo se parsea y procesa si cambió,
+# y solo los leads nuevos o modificados (sin cambios = ni una petición de red)
+SOURCE = "final_lead_builder_v2:browser"
+digest = content_hash(browser_text)
+if store.source_unchanged(SOURCE, digest):
+    print("Browser list unchanged since last run, nothing to scrape.")
+else:
+    browser_leads = []
+    for line in browser_text.strip().split("\n"):
+        parts = line.split(",")
+        name = parts[0].strip()
+        web = parts[1].strip() if len(parts) > 1 else ""
+        browser_leads.append({"nombre": name, "web": web})
 
-for line in browser_text.strip().split("\n"):
-    parts = line.split(",")
-    name = parts[0].strip()
-    web = parts[1].strip() if len(parts) > 1 else ""
-    if name.lower() not in seen_names:
-        print(f"Adding/Scraping {name}...")
-        email = scrape_website(web)
-        leads.append({"nombre": name, "web": web, "email": email})
-        seen_names.add(name.lower())
+    done = []
+    for lead in store.changed_records(SOURCE, browser_leads):
+        existing = store.find(nombre=lead["nombre"])
+        email = existing["email"] if existing else ""
+        if not email:
+            print(f"Adding/Scraping {lead['nombre']}...")
+            email = scrape_website(lead["web"])
+            if email is None:
+                continue
+        store.upsert({**lead, "email": email}, source="browser")
+        done.append(lead)
+    store.mark_synced(SOURCE, digest, browser_leads, done)
 
-with open(output_path, 'w', newline='', encoding='utf-8') as f:
-    fn = ['nombre', 'email', 'telefono', 'web', 'direccion', 'valoracion']
-    writer = csv.DictWriter(f, fieldnames=fn, extrasaction='ignore')
-    writer.writeheader()
-    writer.writerows(leads)
+# El CSV es una exportación del almacén
+total = store.export_csv(LEADS_CSV)
+store.close()
 
-print(f"Final lead count: {len(leads)}")
+print(f"Final lead count: {total}")
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+http_cache.py
+-------------
+Caché HTTP en disco compartida por los scrapers de emails
+(scrape_emails_from_webs.py, final_lead_builder*.py).
+
+Cada URL se guarda en un JSON (.tmp/http_cache/<sha256>.json) con el cuerpo,
+el status y las cabeceras de validación (ETag / Last-Modified):
+
+- Si la entrada está fresca (Cache-Control max-age o FRESH_FOR) se sirve
+  sin tocar la red.
+- Si caducó, se revalida con If-None-Match / If-Modified-Since; un 304
+  reutiliza el cuerpo guardado.
+- `cached_scan()` lee la página en streaming y se la va pasando a un
+  EmailStreamScanner: corta en cuanto sale un email prioritario o al llegar
+  a MAX_PAGE_BYTES. Lo leído se guarda marcado como `partial`; esas
+  entradas solo las reutiliza cached_scan (dan el mismo resultado), nunca
+  cached_get sin tope, que necesita la página entera.
+- `cached_get(url, max_bytes=...)` hace lo mismo sin scanner: lee hasta
+  el tope y, si corta, guarda la entrada `partial` (sitemaps gigantes).
+- El directorio está acotado a MAX_BYTES: al pasarse se borran las entradas
+  menos usadas recientemente (LRU por mtime, que se actualiza en cada hit).
+
+Uso:
+    from http_cache import cached_get
+    r = cached_get(url, timeout=8)
+    if r and r.status_code == 200: ...
+
+    scan = cached_scan(url, EmailStreamScanner())
+    scan.emails, scan.text
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+
+import http_fetch
+from contact_extract import EmailStreamScanner
+from crawl_metrics import metrics
+
+# ── Config ─────────────────────────────────────────────────────────────────
+BASE_DIR  = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, ".tmp", "http_cache")
+
+MAX_BYTES = 200 * 1024 * 1024   # tamaño máximo del directorio de caché
+FRESH_FOR = 24 * 3600           # segundos sin revalidar si el servidor no dice nada
+
+# Solo guardamos respuestas que tiene sentido repetir: páginas y 404 de slugs
+CACHEABLE_STATUS = {200, 404, 410}
+KEPT_HEADERS = ("content-type", "etag", "last-modified", "cache-control")
+
+MAX_AGE_RE = re.compile(r"max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+@dataclass
+class CachedResponse:
+    """Lo mínimo de requests.Response que usan los scrapers."""
+    url: str
+    status_code: int
+    headers: dict = field(default_factory=dict)
+    text: str = ""
+    from_cache: bool = False
+
+
+class HttpCache:
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = MAX_BYTES,
+                 fresh_for: int = FRESH_FOR):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.fresh_for = fresh_for
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(e.stat().st_size for e in os.scandir(directory) if e.name.endswith(".json"))
+
+    # ── Entradas ──────────────────────────────────────────────────────────
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def load(self, url: str) -> dict | None:
+        path = self._path(url)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # marca de uso para el LRU
+        except OSError:
+            pass
+        return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        cache_control = entry["headers"].get("cache-control", "").lower()
+        if "no-cache" in cache_control:
+            return False
+        match = MAX_AGE_RE.search(cache_control)
+        ttl = int(match.group(1)) if match else self.fresh_for
+        return time.time() - entry["stored_at"] < ttl
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        headers = {}
+        if entry["headers"].get("etag"):
+            headers["If-None-Match"] = entry["headers"]["etag"]
+        if entry["headers"].get("last-modified"):
+            headers["If-Modified-Since"] = entry["headers"]["last-modified"]
+        return headers
+
+    def store(self, url: str, status_code: int, headers, text: str,
+              partial: bool = False, final_url: str = "") -> dict | None:
+        kept = {k: headers[k] for k in KEPT_HEADERS if headers.get(k)}
+        if "no-store" in kept.get("cache-control", "").lower():
+            return None
+        entry = {
+            "url": url,
+            "status_code": status_code,
+            "headers": kept,
+            "text": text,
+            "partial": partial,
+            "final_url": final_url or url,   # tras redirecciones
+            "stored_at": time.time(),
+        }
+        self._write(url, entry)
+        return entry
+
+    def revalidated(self, url: str, entry: dict, headers) -> dict:
+        """Un 304 renueva la frescura y las cabeceras, conservando el cuerpo."""
+        entry["headers"].update({k: headers[k] for k in KEPT_HEADERS if headers.get(k)})
+        entry["stored_at"] = time.time()
+        self._write(url, entry)
+        return entry
+
+    # ── Disco + LRU ───────────────────────────────────────────────────────
+    def _write(self, url: str, entry: dict) -> None:
+        path = self._path(url)
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        with self._lock:
+            try:
+                old_size = os.path.getsize(path)
+            except OSError:
+                old_size = 0
+            os.replace(tmp, path)
+            self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Borra por mtime ascendente hasta quedar al 90% de MAX_BYTES."""
+        entries = sorted(
+            (e for e in os.scandir(self.directory) if e.name.endswith(".json")),
+            key=lambda e: e.stat().st_mtime,
+        )
+        target = int(self.max_bytes * 0.9)
+        self._size = sum(e.stat().st_size for e in entries)
+        for e in entries:
+            if self._size <= target:
+                break
+            try:
+                size = e.stat().st_size
+                os.remove(e.path)
+                self._size -= size
+            except OSError:
+                pass
+
+
+_default_cache: HttpCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> HttpCache:
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = HttpCache()
+        return _default_cache
+
+
+def _from_entry(entry: dict) -> CachedResponse:
+    return CachedResponse(
+        url=entry["url"],
+        status_code=entry["status_code"],
+        headers=dict(entry["headers"]),
+        text=entry["text"],
+        from_cache=True,
+    )
+
+
+def _read_capped(r, max_bytes: int) -> tuple[str, bool]:
+    """(texto, cortado): cuerpo de una respuesta en streaming, hasta `max_bytes`."""
+    decoder = http_fetch.decoder_for(r)
+    parts: list[str] = []
+    read = 0
+    truncated = False
+    body_started = time.perf_counter()
+    for chunk in r.iter_content(http_fetch.CHUNK_SIZE):
+        if read + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - read]
+            truncated = True
+        read += len(chunk)
+        parts.append(decoder.decode(chunk))
+        if truncated:
+            break
+    if not truncated:
+        parts.append(decoder.decode(b"", final=True))
+    metrics.observe_body(time.perf_counter() - body_started, read)
+    return "".join(parts), truncated
+
+
+def cached_get(url: str, headers: dict | None = None, timeout: float = http_fetch.TIMEOUT,
+               cache: HttpCache | None = None, max_bytes: int | None = None) -> CachedResponse:
+    """
+    GET con caché en disco. Lo que no sale de caché pasa por http_fetch.get()
+    (pool, reintentos, circuit breaker) y lanza sus mismas RequestException.
+
+    Con `max_bytes` el cuerpo se lee en streaming y se corta ahí (sitemaps
+    enormes); si se corta se guarda `partial` y solo lo reutilizan otras
+    llamadas con tope.
+    """
+    cache = cache or default_cache()
+    entry = cache.load(url)
+    if entry and entry.get("partial") and max_bytes is None:
+        entry = None  # cuerpo cortado: aquí se necesita la página entera
+    if entry and cache.is_fresh(entry):
+        metrics.observe_cache_hit()
+        return _from_entry(entry)
+
+    request_headers = dict(headers or {})
+    if entry:
+        request_headers.update(cache.conditional_headers(entry))
+
+    r = http_fetch.get(url, headers=request_headers, timeout=timeout, stream=max_bytes is not None)
+    try:
+        if r.status_code == 304 and entry:
+            return _from_entry(cache.revalidated(url, entry, r.headers))
+        text, truncated = _read_capped(r, max_bytes) if max_bytes is not None else (r.text, False)
+    finally:
+        r.close()
+
+    response_headers = {k: r.headers[k] for k in KEPT_HEADERS if r.headers.get(k)}
+    if r.status_code in CACHEABLE_STATUS:
+        cache.store(url, r.status_code, r.headers, text, partial=truncated)
+    return CachedResponse(url=url, status_code=r.status_code, headers=response_headers, text=text)
+
+
+@dataclass
+class ScanResult:
+    status_code: int
+    emails: list[str] = field(default_factory=list)
+    text: str = ""          # lo que se llegó a leer (acotado por MAX_PAGE_BYTES)
+    truncated: bool = False # se cortó antes del final (email prioritario o tope)
+    from_cache: bool = False
+    url: str = ""           # URL final tras redirecciones
+
+
+def _scan_entry(entry: dict, scanner: EmailStreamScanner) -> ScanResult:
+    if entry["status_code"] == 200:
+        scanner.feed(entry["text"], final=not entry.get("partial", False))
+    return ScanResult(entry["status_code"], scanner.emails, entry["text"],
+                      entry.get("partial", False), from_cache=True,
+                      url=entry.get("final_url", entry["url"]))
+
+
+def cached_scan(url: str, scanner: EmailStreamScanner, headers: dict | None = None,
+                timeout: float = http_fetch.TIMEOUT, max_bytes: int = http_fetch.MAX_PAGE_BYTES,
+                cache: HttpCache | None = None, cancel: threading.Event | None = None) -> ScanResult:
+    """
+    Descarga `url` en streaming pasando cada trozo decodificado a `scanner`.
+    Corta en cuanto el scanner encuentra un email prioritario o al pasar de
+    `max_bytes`. Solo se escanean respuestas 200 de tipo text/*.
+
+    Si `cancel` se activa (otra sonda ya ganó) se deja de leer y no se
+    guarda nada en caché: el resultado está incompleto sin motivo propio.
+    """
+    cache = cache or default_cache()
+    if cancel is not None and cancel.is_set():
+        return ScanResult(0, truncated=True)
+    entry = cache.load(url)
+    if entry and cache.is_fresh(entry):
+        metrics.observe_cache_hit()
+        return _scan_entry(entry, scanner)
+
+    request_headers = dict(headers or {})
+    if entry:
+        request_headers.update(cache.conditional_headers(entry))
+
+    r = http_fetch.get(url, headers=request_headers, timeout=timeout, stream=True)
+    try:
+        if r.status_code == 304 and entry:
+            return _scan_entry(cache.revalidated(url, entry, r.headers), scanner)
+
+        if r.status_code != 200 or "text" not in r.headers.get("content-type", ""):
+            if r.status_code in CACHEABLE_STATUS and r.status_code != 200:
+                cache.store(url, r.status_code, r.headers, "", final_url=r.url)
+            return ScanResult(r.status_code, url=r.url)
+
+        decoder = http_fetch.decoder_for(r)
+        parts: list[str] = []
+        read = 0
+        truncated = False
+        body_started = time.perf_counter()
+        for chunk in r.iter_content(http_fetch.CHUNK_SIZE):
+            if cancel is not None and cancel.is_set():
+                metrics.observe_body(time.perf_counter() - body_started, read)
+                return ScanResult(0, scanner.emails, "", truncated=True)
+            if read + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - read]
+                truncated = True
+            read += len(chunk)
+            text = decoder.decode(chunk)
+            parts.append(text)
+            if scanner.feed(text) or truncated:
+                truncated = True
+                break
+        if not truncated:
+            # Fin real del cuerpo: ya se pueden aceptar los matches del final.
+            # Si se cortó antes, un match pegado al corte podría estar a medias.
+            text = decoder.decode(b"", final=True)
+            parts.append(text)
+            scanner.feed(text, final=True)
+        metrics.observe_body(time.perf_counter() - body_started, read)
+    finally:
+        r.close()
+
+    body = "".join(parts)
+    cache.store(url, 200, r.headers, body, partial=truncated, final_url=r.url)
+    return ScanResult(200, scanner.emails, body, truncated, url=r.url)
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+http_fetch.py
+-------------
+Capa HTTP compartida por los scrapers de emails.
+
+- Una sola requests.Session con pool keep-alive (las conexiones se reutilizan
+  entre la homepage y las páginas de contacto del mismo host).
+- Reintentos con backoff exponencial + jitter ante timeouts, errores de
+  conexión y 429/5xx (respetando Retry-After si viene).
+- Circuit breaker por dominio: tras BREAKER_THRESHOLD fallos de red seguidos
+  el dominio se da por muerto durante BREAKER_COOLDOWN segundos y el resto
+  de peticiones fallan al instante con CircuitOpenError, en vez de quemar
+  TIMEOUT segundos en cada slug de contacto.
+
+- Telemetría (crawl_metrics): tiempos de DNS, connect y TTFB de cada
+  petición, códigos de estado, reintentos y errores por clase. DNS y connect
+  se miden en las conexiones del pool de la propia Session (TimedHTTPAdapter),
+  sin tocar urllib3 para el resto del proceso; solo existen cuando se abre
+  una conexión nueva (no en las reutilizadas del pool).
+
+- Lectura en streaming: `decoder_for()` da un decodificador incremental con
+  el charset de la respuesta para procesar el cuerpo trozo a trozo
+  (ver http_cache.cached_scan).
+
+Uso:
+    from http_fetch import get
+    r = get(url)            # requests.Response o RequestException
+"""
+
+import codecs
+import random
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, RequestException, Timeout
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+from crawl_metrics import metrics
+
+# ── Config ─────────────────────────────────────────────────────────────────
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/122.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "es-ES,es;q=0.9",
+}
+CONNECT_TIMEOUT = 4     # segundos para abrir el socket
+TIMEOUT         = 8     # segundos de lectura
+
+RETRIES       = 2       # reintentos además del primer intento
+BACKOFF_BASE  = 0.5     # segundos; se duplica en cada reintento
+BACKOFF_MAX   = 8
+RETRY_STATUS  = {429, 500, 502, 503, 504}
+
+BREAKER_THRESHOLD = 3   # fallos de red seguidos para abrir el circuito
+BREAKER_COOLDOWN  = 300 # segundos que el dominio queda vetado
+
+POOL_SIZE = 32          # conexiones keep-alive por host en el pool
+
+CHUNK_SIZE     = 16 * 1024     # bytes por trozo al leer en streaming
+MAX_PAGE_BYTES = 1_500_000     # tope de bytes que se leen de una página
+
+
+class CircuitOpenError(RequestException):
+    """El dominio ha fallado demasiadas veces seguidas; no se intenta."""
+
+
+def domain_of(url: str) -> str:
+    host = urlparse(url if "://" in url else f"http://{url}").hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+class CircuitBreaker:
+    """
+    Estado por dominio: cerrado → abierto (tras `threshold` fallos seguidos)
+    → medio abierto (pasado `cooldown` se deja pasar una petición de prueba;
+    si falla se vuelve a abrir, si va bien se cierra).
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+        self._probing: set[str] = set()
+        self._lock = threading.Lock()
+
+    def allow(self, domain: str) -> bool:
+        with self._lock:
+            opened_at = self._opened_at.get(domain)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at < self.cooldown or domain in self._probing:
+                return False
+            self._probing.add(domain)  # medio abierto: una sola petición de prueba
+            return True
+
+    def record_success(self, domain: str) -> None:
+        with self._lock:
+            self._failures.pop(domain, None)
+            self._opened_at.pop(domain, None)
+            self._probing.discard(domain)
+
+    def record_failure(self, domain: str) -> None:
+        with self._lock:
+            self._failures[domain] = self._failures.get(domain, 0) + 1
+            if domain in self._probing or self._failures[domain] >= self.threshold:
+                self._opened_at[domain] = time.monotonic()
+            self._probing.discard(domain)
+
+    def release(self, domain: str) -> None:
+        """La petición de prueba acabó sin decir nada del dominio (URL inválida, bucle de redirecciones...)."""
+        with self._lock:
+            self._probing.discard(domain)
+
+    def is_open(self, domain: str) -> bool:
+        with self._lock:
+            return domain in self._opened_at
+
+
+breaker = CircuitBreaker()
+
+
+# ── Tiempos de conexión ─────────────────────────────────────────────────────
+# Las conexiones del pool de session() resuelven el host aquí (cronometrado)
+# y conectan a cada IP con el _new_conn de urllib3, que con una IP literal
+# no vuelve a preguntar al DNS. Se conserva el fallback entre direcciones
+# (IPv6/IPv4) y los errores de urllib3. Los tiempos quedan en el hilo que
+# hace la petición hasta que get() los recoge.
+_conn_timing = threading.local()
+
+
+class _TimedConnectMixin:
+    def _new_conn(self):
+        host = self._dns_host
+        t0 = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(host.strip("[]"), self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        t1 = time.perf_counter()
+        _conn_timing.dns = t1 - t0
+        error: ConnectTimeoutError | None = None
+        try:
+            for *_, sockaddr in infos:
+                self._dns_host = sockaddr[0]
+                try:
+                    sock = super()._new_conn()
+                except ConnectTimeoutError as e:   # también NewConnectionError
+                    error = e
+                    continue
+                _conn_timing.connect = time.perf_counter() - t1
+                return sock
+        finally:
+            self._dns_host = host   # SNI y la verificación del certificado van con el nombre
+        raise error or NewConnectionError(self, "getaddrinfo returns an empty list")
+
+
+class _TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter cuyas conexiones nuevas dejan sus tiempos de DNS y connect en _conn_timing."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool,
+                                                   "https": _TimedHTTPSConnectionPool}
+
+
+def _record_attempt(r: requests.Response | None, started: float, stream: bool) -> None:
+    """Pasa a `metrics` los tiempos de un intento (r=None si falló)."""
+    dns = getattr(_conn_timing, "dns", None)
+    connect = getattr(_conn_timing, "connect", None)
+    _conn_timing.dns = _conn_timing.connect = None
+    if dns is not None:
+        metrics.observe("dns", dns)
+    if connect is not None:
+        metrics.observe("connect", connect)
+    if r is None:
+        return
+    metrics.observe_response(r.status_code)
+    # elapsed = envío → cabeceras, con la conexión dentro si fue nueva
+    ttfb = r.elapsed.total_seconds() - (dns or 0) - (connect or 0)
+    metrics.observe("ttfb", ttfb)
+    if not stream:
+        # Sin stream requests ya leyó el cuerpo; el streaming lo mide http_cache
+        metrics.observe_body(time.perf_counter() - started - r.elapsed.total_seconds(), len(r.content))
+
+# Session compartida entre hilos: el pool de urllib3 es thread-safe y así
+# todas las peticiones a un host reutilizan las mismas conexiones.
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            s.headers.update(HEADERS)
+            adapter = TimedHTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+            s.mount("http://", adapter)
+            s.mount("https://", adapter)
+            _session = s
+        return _session
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full jitter: uniforme entre 0 y min(BACKOFF_MAX, base * 2^attempt)."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def retry_after_seconds(response: requests.Response) -> float | None:
+    value = response.headers.get("Retry-After", "")
+    try:
+        return min(float(value), BACKOFF_MAX)
+    except ValueError:
+        return None
+
+
+def decoder_for(response: requests.Response) -> codecs.IncrementalDecoder:
+    """Decodificador incremental con el charset de la respuesta (utf-8 si no vale)."""
+    try:
+        return codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+def get(url: str, headers: dict | None = None, timeout: float = TIMEOUT,
+        retries: int = RETRIES, **kwargs) -> requests.Response:
+    """
+    GET con pool, reintentos y circuit breaker. Devuelve la última respuesta
+    (aunque sea 4xx/5xx) o lanza RequestException / CircuitOpenError.
+    """
+    domain = domain_of(url)
+    if not breaker.allow(domain):
+        error = CircuitOpenError(f"circuito abierto para {domain}")
+        metrics.observe_error(error)
+        raise error
+
+    last_error: RequestException | None = None
+    for attempt in range(retries + 1):
+        if attempt:
+            metrics.observe_retry()
+        started = time.perf_counter()
+        try:
+            r = session().get(url, headers=headers, timeout=(CONNECT_TIMEOUT, timeout),
+                              allow_redirects=True, **kwargs)
+        except (ConnectionError, Timeout) as e:
+            _record_attempt(None, started, False)
+            metrics.observe_error(e)
+            last_error = e
+            breaker.record_failure(domain)
+            if attempt == retries or not breaker.allow(domain):
+                break
+            time.sleep(backoff_delay(attempt))
+            continue
+        except RequestException as e:
+            _record_attempt(None, started, False)
+            metrics.observe_error(e)
+            # No es un fallo de red: no cuenta, pero si era la prueba del medio
+            # abierto hay que soltarla o el dominio quedaría vetado para siempre
+            breaker.release(domain)
+            raise
+
+        _record_attempt(r, started, kwargs.get("stream", False))
+        breaker.record_success(domain)
+        if r.status_code in RETRY_STATUS and attempt < retries:
+            r.close()
+            time.sleep(retry_after_seconds(r) or backoff_delay(attempt))
+            continue
+        return r
+
+    raise last_error
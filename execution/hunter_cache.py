@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+hunter_cache.py
+---------------
+Caché persistente de búsquedas de Hunter.io por dominio + contador de cuota.
+
+El plan gratuito da 25 búsquedas al mes, así que cada respuesta se guarda
+(.tmp/hunter_cache.json) y un dominio ya consultado no vuelve a gastar
+llamada mientras su entrada siga vigente:
+
+- encontrado: FOUND_TTL (los emails genéricos cambian poco)
+- sin resultados: NEGATIVE_TTL (Hunter puede indexar el dominio más adelante)
+- los errores de red/API no se guardan: se reintentan en el siguiente run
+
+También se apunta cuántas búsquedas se han hecho cada mes, como respaldo
+si no se puede preguntar la cuota real a /v2/account.
+
+Uso:
+    cache = HunterCache()
+    entry = cache.get("dominio.es")      # None si no está o caducó
+    cache.put("dominio.es", "info@dominio.es")
+    cache.save()
+"""
+
+import json
+import os
+import time
+
+import requests
+
+from hunter_client import API_BASE
+
+# ── Config ─────────────────────────────────────────────────────────────────
+BASE_DIR   = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_PATH = os.path.join(BASE_DIR, ".tmp", "hunter_cache.json")
+
+FOUND_TTL     = 180 * 24 * 3600   # segundos
+NEGATIVE_TTL  = 30 * 24 * 3600
+MONTHLY_QUOTA = 25                # búsquedas/mes del plan gratuito
+
+ACCOUNT_URL = API_BASE + "/account"
+
+
+def current_month() -> str:
+    return time.strftime("%Y-%m")
+
+
+class HunterCache:
+    def __init__(self, path: str = CACHE_PATH):
+        self.path = path
+        data = self._load()
+        self.domains: dict[str, dict] = data.get("domains", {})
+        self.usage: dict[str, int] = data.get("usage", {})
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, domain: str) -> dict | None:
+        """Entrada vigente ({email, fetched_at}) o None si hay que preguntar."""
+        entry = self.domains.get(domain)
+        if entry is None:
+            return None
+        ttl = FOUND_TTL if entry["email"] else NEGATIVE_TTL
+        return entry if time.time() - entry["fetched_at"] < ttl else None
+
+    def put(self, domain: str, email: str) -> None:
+        """Guarda un resultado ("" = Hunter no tiene nada) y cuenta la búsqueda."""
+        self.domains[domain] = {"email": email, "fetched_at": time.time()}
+        month = current_month()
+        self.usage[month] = self.usage.get(month, 0) + 1
+
+    def used_this_month(self) -> int:
+        return self.usage.get(current_month(), 0)
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"domains": self.domains, "usage": self.usage}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)
+
+
+def remaining_quota(api_key: str, cache: HunterCache) -> int:
+    """
+    Búsquedas que quedan este mes según Hunter (/v2/account no gasta cuota).
+    Si no responde, se estima con el contador local.
+    """
+    try:
+        r = requests.get(ACCOUNT_URL, params={"api_key": api_key}, timeout=10)
+        r.raise_for_status()
+        searches = r.json()["data"]["requests"]["searches"]
+        return max(int(searches["available"]) - int(searches["used"]), 0)
+    except (requests.RequestException, ValueError, KeyError, TypeError):
+        return max(MONTHLY_QUOTA - cache.used_this_month(), 0)
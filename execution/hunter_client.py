@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+hunter_client.py
+----------------
+Cliente asíncrono de Hunter.io /domain-search para enriquecer lotes grandes.
+
+- Token bucket (RATE peticiones/s, ráfagas de BURST) compartido por todas
+  las búsquedas en vuelo: nunca se pasa del límite de Hunter.
+- Un 429 de rate limit respeta Retry-After (segundos o fecha HTTP) y frena
+  el bucket entero, no solo esa petición. Timeouts, errores de conexión y
+  5xx se reintentan con backoff exponencial + jitter, como mucho RETRIES veces.
+- Si Hunter dice que se acabó la cuota del mes, las búsquedas pendientes
+  vuelven con error="quota" sin gastar más peticiones.
+- Un dominio nunca se da por "sin email" por un error: HunterResult.error
+  distingue "Hunter no tiene nada" de "no se pudo preguntar".
+
+Como en scrape_emails_from_webs.py, las llamadas son requests bloqueantes
+ejecutadas en un pool de hilos desde asyncio.
+
+Uso:
+    client = HunterClient(api_key, rate=10)
+    async for result in client.search_many(domains):   # según terminan
+        result.domain, result.email, result.error
+    client.close()
+
+HUNTER_API_BASE (entorno) permite apuntarlo a un servidor de pruebas.
+"""
+
+import asyncio
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+from contact_extract import best_email
+
+# ── Config ─────────────────────────────────────────────────────────────────
+API_BASE = os.getenv("HUNTER_API_BASE", "https://api.hunter.io/v2").rstrip("/")
+
+RATE        = 10.0   # peticiones/s (Hunter admite 15/s en domain-search)
+BURST       = 5
+CONCURRENCY = 8      # peticiones en vuelo a la vez
+RETRIES     = 4      # reintentos además del primer intento
+TIMEOUT     = 10
+
+BACKOFF_BASE    = 1.0    # segundos; se duplica en cada reintento
+BACKOFF_MAX     = 30
+RETRY_AFTER_MAX = 120    # no esperar más que esto aunque lo pida Retry-After
+
+
+@dataclass
+class HunterResult:
+    domain: str
+    email: str = ""   # "" si Hunter no tiene ninguno
+    error: str = ""   # "" si Hunter respondió; si no, no hay que cachearlo
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+def pick_email(data: dict) -> str:
+    emails = data.get("data", {}).get("emails", [])
+    if not emails:
+        return ""
+    # Misma regla que el scraper (contact_extract.best_email)
+    return best_email([e["value"] for e in emails], data.get("data", {}).get("domain"))
+
+
+def retry_after_seconds(response: requests.Response) -> float | None:
+    """Retry-After en segundos (acepta número o fecha HTTP), acotado a RETRY_AFTER_MAX."""
+    value = response.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), RETRY_AFTER_MAX)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full jitter: uniforme entre 0 y min(BACKOFF_MAX, base * 2^attempt)."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _is_quota_error(response: requests.Response) -> bool:
+    # Hunter responde 429 tanto por rate limit como por cuota agotada; la
+    # cuota se distingue por el mensaje ("usage limit"). 403 idem en planes viejos.
+    return response.status_code in (403, 429) and "usage" in response.text.lower()
+
+
+class TokenBucket:
+    """Token bucket asíncrono: `rate` fichas/s hasta un máximo de `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # El lock se mantiene durante la espera: los turnos salen en orden
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def block(self, seconds: float) -> None:
+        """Nadie saca ficha en `seconds` (Retry-After) y luego se empieza sin ráfaga."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+
+class HunterClient:
+    def __init__(self, api_key: str, rate: float = RATE, burst: int = BURST,
+                 concurrency: int = CONCURRENCY, retries: int = RETRIES, base_url: str = API_BASE):
+        self.api_key = api_key
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.retries = retries
+        self.base_url = base_url.rstrip("/")
+        self.quota_exhausted = False
+        self._bucket: TokenBucket | None = None
+        self._bucket_loop: asyncio.AbstractEventLoop | None = None
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency, max_retries=0)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
+
+    def _get(self, domain: str) -> requests.Response:
+        params = {
+            "domain": domain,
+            "api_key": self.api_key,
+            "limit": 5,
+            "type": "generic",  # emails genéricos tipo info@, contacto@, etc.
+        }
+        return self._session.get(f"{self.base_url}/domain-search", params=params, timeout=TIMEOUT)
+
+    def _bucket_for_loop(self) -> TokenBucket:
+        # El bucket (y su asyncio.Lock) pertenece al loop que lo usa
+        loop = asyncio.get_running_loop()
+        if self._bucket is None or self._bucket_loop is not loop:
+            self._bucket = TokenBucket(self.rate, self.burst)
+            self._bucket_loop = loop
+        return self._bucket
+
+    async def search(self, domain: str) -> HunterResult:
+        """Una búsqueda, con rate limit y reintentos. Nunca lanza RequestException."""
+        loop = asyncio.get_running_loop()
+        bucket = self._bucket_for_loop()
+        error = ""
+        for attempt in range(self.retries + 1):
+            if self.quota_exhausted:
+                return HunterResult(domain, error="quota")
+            await bucket.acquire()
+            try:
+                r = await loop.run_in_executor(self._executor, self._get, domain)
+            except RequestException as e:
+                error = type(e).__name__
+                delay = backoff_delay(attempt)
+            else:
+                if _is_quota_error(r):
+                    self.quota_exhausted = True
+                    return HunterResult(domain, error="quota")
+                if r.status_code == 429:
+                    error = "HTTP 429"
+                    delay = retry_after_seconds(r) or backoff_delay(attempt)
+                    bucket.block(delay)
+                elif r.status_code >= 500:
+                    error = f"HTTP {r.status_code}"
+                    delay = retry_after_seconds(r) or backoff_delay(attempt)
+                elif r.status_code >= 400:
+                    # 400/401/...: reintentar no lo arregla
+                    return HunterResult(domain, error=f"HTTP {r.status_code}")
+                else:
+                    try:
+                        return HunterResult(domain, email=pick_email(r.json()))
+                    except (ValueError, KeyError, TypeError):
+                        error = "respuesta inválida"
+                        delay = backoff_delay(attempt)
+            if attempt < self.retries:
+                await asyncio.sleep(delay)
+        return HunterResult(domain, error=error)
+
+    async def search_many(self, domains: list[str]):
+        """Genera un HunterResult por dominio según van terminando (no en orden)."""
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def one(domain: str) -> HunterResult:
+            async with slots:
+                return await self.search(domain)
+
+        tasks = [asyncio.ensure_future(one(d)) for d in domains]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                yield await fut
+        finally:
+            for task in tasks:
+                task.cancel()
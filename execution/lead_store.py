@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+lead_store.py
+-------------
+Almacén de leads de inmobiliarias en SQLite. Sustituye a reescribir entero
+"inmobiliarias con mail.csv" desde cada script: el CSV (y el Excel) pasan a
+ser exportaciones de la base de datos.
+
+- Índices únicos sobre el email normalizado y el nombre normalizado; índice
+  (no único) sobre el dominio registrable, porque las oficinas de una
+  franquicia comparten web y son leads distintos.
+- `upsert_many()` mete un lote en una sola transacción: cada lead se busca
+  por email y si no por nombre (O(1) con los índices, O(filas nuevas) en
+  total); si ya existe solo se rellenan los campos vacíos, nunca se pisa un
+  dato que ya estaba.
+- Transacciones BEGIN IMMEDIATE + WAL: dos scripts escribiendo a la vez se
+  esperan (busy_timeout) en vez de perder filas.
+- La primera vez que se abre vacía se importa el CSV existente.
+- Huellas por fuente (`source_unchanged`, `changed_records`, `mark_synced`):
+  se guarda el hash del contenido de cada fuente de leads (la lista de un
+  script, un CSV...) y de cada registro, para que un run solo procese
+  (scrapee, enriquezca) lo nuevo o cambiado desde el anterior. Con las
+  entradas iguales no hay nada que hacer ni ninguna llamada de red.
+- `email_status` / `email_checked_at`: resultado de deliverability.py (MX,
+  SMTP) junto a cada lead; se vacía si el lead cambia de email. "unknown"
+  (fallo temporal) no se guarda: el email se vuelve a comprobar.
+
+Uso:
+    from lead_store import LeadStore
+    with LeadStore() as store:
+        store.upsert_many(leads, source="maps")
+        store.export_csv(LEADS_CSV)
+
+        digest = content_hash(records)
+        if not store.source_unchanged("mi_fuente", digest):
+            pending = store.changed_records("mi_fuente", records)
+            ...                                  # scrape/upsert de `pending`
+            store.mark_synced("mi_fuente", digest, records, done=pending)
+
+    python lead_store.py stats
+    python lead_store.py import fichero.csv [--source maps]
+    python lead_store.py export [--csv salida.csv] [--xlsx salida.xlsx]
+    python lead_store.py dedupe [--threshold 0.8]   # fusionar nombres parecidos
+    python deliverability.py --store                # email_status de cada lead (MX/SMTP)
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+
+from domains import registrable_domain
+
+# ── Config ─────────────────────────────────────────────────────────────────
+LEADS_DB  = os.path.expanduser("~/Downloads/inmobiliarias_leads.db")
+LEADS_CSV = os.path.expanduser("~/Downloads/inmobiliarias con mail.csv")
+
+LEAD_FIELDS = ["nombre", "email", "telefono", "web", "direccion", "valoracion"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    id          INTEGER PRIMARY KEY,
+    nombre      TEXT NOT NULL DEFAULT '',
+    email       TEXT NOT NULL DEFAULT '',
+    telefono    TEXT NOT NULL DEFAULT '',
+    web         TEXT NOT NULL DEFAULT '',
+    direccion   TEXT NOT NULL DEFAULT '',
+    valoracion  TEXT NOT NULL DEFAULT '',
+    name_key    TEXT,
+    email_key   TEXT,
+    domain      TEXT,
+    source      TEXT NOT NULL DEFAULT '',
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL,
+    email_status     TEXT NOT NULL DEFAULT '',
+    email_checked_at REAL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS leads_email_key ON leads (email_key) WHERE email_key IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS leads_name_key  ON leads (name_key)  WHERE name_key IS NOT NULL;
+CREATE INDEX IF NOT EXISTS leads_domain ON leads (domain);
+CREATE TABLE IF NOT EXISTS sources (
+    source      TEXT PRIMARY KEY,
+    digest      TEXT NOT NULL,
+    synced_at   REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS source_records (
+    source      TEXT NOT NULL,
+    record_key  TEXT NOT NULL,
+    digest      TEXT NOT NULL,
+    PRIMARY KEY (source, record_key)
+) WITHOUT ROWID;
+"""
+
+# Columnas añadidas después de crear la tabla: las bases viejas se migran al abrirlas
+MIGRATIONS = {
+    "email_status":     "ALTER TABLE leads ADD COLUMN email_status TEXT NOT NULL DEFAULT ''",
+    "email_checked_at": "ALTER TABLE leads ADD COLUMN email_checked_at REAL",
+}
+
+# Forma jurídica al final del nombre: "S.L.", "SL", "S.A.", "Sociedad Limitada"...
+LEGAL_SUFFIX_RE = re.compile(r"[\s,.]+(s\.?\s?l\.?\s?u?\.?|s\.?\s?a\.?|sociedad limitada|sociedad an[oó]nima)\s*$",
+                             re.IGNORECASE)
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+def name_key(nombre: str) -> str | None:
+    """Nombre normalizado: sin acentos, mayúsculas, puntuación ni forma jurídica."""
+    name = LEGAL_SUFFIX_RE.sub("", (nombre or "").strip())
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii").lower()
+    name = NON_ALNUM_RE.sub(" ", name).strip()
+    return name or None
+
+
+def email_key(email: str) -> str | None:
+    email = (email or "").strip().lower()
+    return email if "@" in email else None
+
+
+def content_hash(value) -> str:
+    """Huella estable de un texto o de cualquier estructura JSON (orden de claves indiferente)."""
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def record_key(record: dict) -> str | None:
+    """Identidad de un registro dentro de su fuente: nombre normalizado o, si no hay, email."""
+    return name_key(record.get("nombre", "")) or email_key(record.get("email", ""))
+
+
+class LeadStore:
+    def __init__(self, path: str = LEADS_DB, bootstrap_csv: str | None = LEADS_CSV):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA busy_timeout = 60000")
+        self.db.executescript(SCHEMA)
+        columns = {r["name"] for r in self.db.execute("PRAGMA table_info(leads)")}
+        for column, ddl in MIGRATIONS.items():
+            if column not in columns:
+                self.db.execute(ddl)
+        if bootstrap_csv and os.path.exists(bootstrap_csv) and not self.count():
+            self.import_csv(bootstrap_csv, source="csv")
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ── Lectura ───────────────────────────────────────────────────────────
+    def count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+
+    def find(self, email: str = "", nombre: str = "") -> sqlite3.Row | None:
+        """Lead existente con ese email o, si no, con ese nombre (normalizados)."""
+        ekey, nkey = email_key(email), name_key(nombre)
+        if ekey:
+            row = self.db.execute("SELECT * FROM leads WHERE email_key = ?", (ekey,)).fetchone()
+            if row:
+                return row
+        if nkey:
+            return self.db.execute("SELECT * FROM leads WHERE name_key = ?", (nkey,)).fetchone()
+        return None
+
+    def has_name(self, nombre: str) -> bool:
+        nkey = name_key(nombre)
+        return nkey is not None and self.db.execute(
+            "SELECT 1 FROM leads WHERE name_key = ?", (nkey,)).fetchone() is not None
+
+    def rows(self) -> list[dict]:
+        """Todos los leads en orden de alta, con los campos de LEAD_FIELDS."""
+        cols = ", ".join(LEAD_FIELDS)
+        return [dict(r) for r in self.db.execute(f"SELECT {cols} FROM leads ORDER BY id")]
+
+    def emails_to_verify(self, max_age: float) -> list[str]:
+        """Emails sin comprobar (deliverability.py) o comprobados hace más de `max_age` segundos."""
+        return [r[0] for r in self.db.execute(
+            """SELECT email_key FROM leads WHERE email_key IS NOT NULL
+                 AND (email_checked_at IS NULL OR email_checked_at < ?) ORDER BY id""",
+            (time.time() - max_age,))]
+
+    # ── Escritura ─────────────────────────────────────────────────────────
+    def _upsert(self, lead: dict, source: str, now: float) -> str:
+        """Dentro de una transacción: "inserted", "updated" o "unchanged"."""
+        values = {f: str(lead.get(f) or "").strip() for f in LEAD_FIELDS}
+        ekey, nkey = email_key(values["email"]), name_key(values["nombre"])
+        if not ekey and not nkey:
+            return "unchanged"
+        existing = self.find(values["email"], values["nombre"])
+
+        if existing is None:
+            self.db.execute(
+                f"""INSERT INTO leads ({", ".join(LEAD_FIELDS)}, name_key, email_key, domain,
+                                       source, created_at, updated_at)
+                    VALUES ({", ".join("?" * len(LEAD_FIELDS))}, ?, ?, ?, ?, ?, ?)""",
+                [values[f] for f in LEAD_FIELDS] + [nkey, ekey, registrable_domain(values["web"]),
+                                                    source, now, now],
+            )
+            return "inserted"
+
+        # Solo se rellenan huecos: un email/teléfono ya guardado no se pisa
+        fill = {f: v for f, v in values.items() if v and not existing[f]}
+        if "email" in fill and ekey and self.db.execute(
+                "SELECT 1 FROM leads WHERE email_key = ? AND id != ?", (ekey, existing["id"])).fetchone():
+            del fill["email"]  # ese email ya es de otro lead
+        if "nombre" in fill and nkey and self.db.execute(
+                "SELECT 1 FROM leads WHERE name_key = ? AND id != ?", (nkey, existing["id"])).fetchone():
+            del fill["nombre"]  # ese nombre ya es de otro lead
+        if not fill:
+            return "unchanged"
+        sets = ", ".join(f"{f} = ?" for f in fill)
+        params = list(fill.values())
+        if "email" in fill:
+            sets += ", email_key = ?, email_status = '', email_checked_at = NULL"
+            params.append(ekey)
+        if "nombre" in fill:
+            sets += ", name_key = ?"
+            params.append(nkey)
+        if "web" in fill:
+            sets += ", domain = ?"
+            params.append(registrable_domain(fill["web"]))
+        self.db.execute(f"UPDATE leads SET {sets}, updated_at = ? WHERE id = ?",
+                        params + [now, existing["id"]])
+        return "updated"
+
+    def upsert_many(self, leads, source: str = "") -> dict[str, int]:
+        """Mete/actualiza un lote en una sola transacción. Devuelve los contadores."""
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        now = time.time()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            for lead in leads:
+                counts[self._upsert(lead, source, now)] += 1
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return counts
+
+    def upsert(self, lead: dict, source: str = "") -> str:
+        counts = self.upsert_many([lead], source)
+        return next(k for k, v in counts.items() if v)
+
+    def merge_duplicates(self, threshold: float | None = None) -> list[list[str]]:
+        """
+        Fusiona los leads que son el mismo aunque el nombre no coincida
+        (entity_resolution): se queda el más completo, con los huecos
+        rellenados por los demás. Devuelve los nombres de cada grupo fusionado.
+        """
+        from entity_resolution import MATCH_SCORE, merge_records, resolve
+
+        rows = [dict(r) for r in self.db.execute(f"SELECT id, {', '.join(LEAD_FIELDS)} FROM leads ORDER BY id")]
+        clusters = resolve(rows, MATCH_SCORE if threshold is None else threshold)
+        if not clusters:
+            return []
+        now = time.time()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            for cluster in clusters:
+                group = [rows[i] for i in cluster]
+                merged = merge_records(group)
+                dropped = [r["id"] for r in group if r["id"] != merged["id"]]
+                self.db.executemany("DELETE FROM leads WHERE id = ?", [(i,) for i in dropped])
+                values = [str(merged.get(f) or "").strip() for f in LEAD_FIELDS]
+                self.db.execute(
+                    f"""UPDATE leads SET {", ".join(f"{f} = ?" for f in LEAD_FIELDS)},
+                               name_key = ?, email_key = ?, domain = ?, updated_at = ?
+                        WHERE id = ?""",
+                    values + [name_key(merged["nombre"]), email_key(merged["email"]),
+                              registrable_domain(merged["web"]), now, merged["id"]],
+                )
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return [[rows[i]["nombre"] for i in cluster] for cluster in clusters]
+
+    def set_email_statuses(self, statuses: dict[str, str]) -> None:
+        """
+        Guarda junto a cada lead el estado de entregabilidad de su email
+        ({email: estado}). "unknown" no se guarda, como en la caché de
+        deliverability.py: queda el estado anterior y sigue pendiente.
+        """
+        now = time.time()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self.db.executemany(
+                "UPDATE leads SET email_status = ?, email_checked_at = ? WHERE email_key = ?",
+                [(status, now, ekey) for ekey, status in
+                 ((email_key(e), s) for e, s in statuses.items()) if ekey and status != "unknown"])
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+
+    def import_csv(self, path: str, source: str = "csv") -> dict[str, int]:
+        with open(path, newline="", encoding="utf-8") as f:
+            return self.upsert_many(csv.DictReader(f), source)
+
+    # ── Huellas de fuentes ────────────────────────────────────────────────
+    def source_unchanged(self, source: str, digest: str) -> bool:
+        """True si `source` ya se procesó entera con este mismo contenido."""
+        row = self.db.execute("SELECT digest FROM sources WHERE source = ?", (source,)).fetchone()
+        return row is not None and row["digest"] == digest
+
+    def changed_records(self, source: str, records: list[dict]) -> list[dict]:
+        """Registros de `source` nuevos o distintos de los del último run (sin nombre ni email no cuentan)."""
+        known = dict(self.db.execute(
+            "SELECT record_key, digest FROM source_records WHERE source = ?", (source,)).fetchall())
+        changed = []
+        for record in records:
+            key = record_key(record)
+            if key and known.get(key) != content_hash(record):
+                changed.append(record)
+        return changed
+
+    def mark_synced(self, source: str, digest: str, records: list[dict], done: list[dict]) -> None:
+        """
+        Apunta `done` (los registros procesados con éxito) como al día y olvida
+        los que ya no están en `records`. La huella de la fuente solo se guarda
+        si no queda nada pendiente: un registro que falló se reintenta.
+        """
+        keys = {record_key(r) for r in records}
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO source_records (source, record_key, digest) VALUES (?, ?, ?)",
+                [(source, record_key(r), content_hash(r)) for r in done if record_key(r)])
+            stale = [(source, k) for (k,) in self.db.execute(
+                "SELECT record_key FROM source_records WHERE source = ?", (source,)) if k not in keys]
+            self.db.executemany("DELETE FROM source_records WHERE source = ? AND record_key = ?", stale)
+            if not self.changed_records(source, records):
+                self.db.execute("INSERT OR REPLACE INTO sources (source, digest, synced_at) VALUES (?, ?, ?)",
+                                (source, digest, time.time()))
+            else:
+                self.db.execute("DELETE FROM sources WHERE source = ?", (source,))
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+
+    # ── Exportación ───────────────────────────────────────────────────────
+    def export_csv(self, path: str = LEADS_CSV) -> int:
+        """Vuelca la tabla a CSV de forma atómica (tmp + os.replace)."""
+        rows = self.rows()
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=LEAD_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(tmp, path)
+        return len(rows)
+
+    def export_excel(self, path: str) -> int:
+        import pandas as pd  # solo hace falta para exportar a Excel
+
+        rows = self.rows()
+        tmp = f"{path}.{os.getpid()}.tmp.xlsx"
+        pd.DataFrame(rows, columns=LEAD_FIELDS).to_excel(tmp, index=False, sheet_name="Leads")
+        os.replace(tmp, path)
+        return len(rows)
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Almacén SQLite de leads.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats")
+    p_import = sub.add_parser("import")
+    p_import.add_argument("csv")
+    p_import.add_argument("--source", default="csv")
+    p_export = sub.add_parser("export")
+    p_export.add_argument("--csv", default=LEADS_CSV)
+    p_export.add_argument("--xlsx", default=None)
+    p_dedupe = sub.add_parser("dedupe")
+    p_dedupe.add_argument("--threshold", type=float, default=None)
+    args = parser.parse_args()
+
+    with LeadStore() as store:
+        if args.command == "import":
+            counts = store.import_csv(os.path.expanduser(args.csv), args.source)
+            print(f"📥 {counts['inserted']} nuevos, {counts['updated']} completados, "
+                  f"{counts['unchanged']} sin cambios")
+        elif args.command == "dedupe":
+            merged = store.merge_duplicates(args.threshold)
+            for names in merged:
+                print("  🔗 " + "  =  ".join(names))
+            print(f"🧹 {len(merged)} grupos fusionados ({sum(len(n) - 1 for n in merged)} leads menos)")
+        elif args.command == "export":
+            print(f"💾 {store.export_csv(os.path.expanduser(args.csv))} leads → {args.csv}")
+            if args.xlsx:
+                print(f"💾 {store.export_excel(os.path.expanduser(args.xlsx))} leads → {args.xlsx}")
+        total = store.count()
+        with_email = store.db.execute("SELECT COUNT(*) FROM leads WHERE email_key IS NOT NULL").fetchone()[0]
+        print(f"📊 {total} leads en {store.path} ({with_email} con email)")
+        statuses = store.db.execute(
+            "SELECT email_status, COUNT(*) FROM leads WHERE email_status != '' GROUP BY email_status").fetchall()
+        if statuses:
+            print("📬 Entregabilidad: " + ", ".join(f"{n} {s}" for s, n in statuses))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,8 @@
 #!/usr/bin/env python3
-import csv
-import os
-import re
+from lead_store import LEADS_CSV, LeadStore, content_hash
 
-# Source 1: Existing 36
-existing_path = "/Users/asiermugica/Downloads/inmobiliarias con mail.csv"
-leads = []
-if os.path.exists(existing_path):
-    with open(existing_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        leads = list(reader)
-
-seen_emails = {l['email'].lower() for l in leads if l.get('email')}
-seen_names = {l['nombre'].lower() for l in leads if l.get('nombre')}
+# Source 1: Existing 36 (lead_store los importa del CSV la primera vez)
+store = LeadStore()
 
 # Source 2: Specific User Requests
 user_leads = [
@@ -30,10 +20,12 @@ user_leads = [
     }
 ]
 
-for l in user_leads:
-    if l['email'].lower() not in seen_emails:
-        leads.append(l)
-        seen_emails.add(l['email'].lower())
+# Cada fuente lleva su huella en el almacén: solo se procesa lo nuevo o cambiado
+user_digest = content_hash(user_leads)
+if not store.source_unchanged("merge_and_add_leads:manual", user_digest):
+    pending = store.changed_records("merge_and_add_leads:manual", user_leads)
+    store.upsert_many(pending, source="manual")
+    store.mark_synced("merge_and_add_leads:manual", user_digest, user_leads, done=pending)
 
 # Source 3: Browser Scraped (parsed from earlier turn)
 browser_data = """
@@ -71,26 +63,24 @@ Dr. Property Inmobiliaria - Plaza San Francisco,http://www.doctorproperty.es/
 Residencia Universitas,http://www.residenciauniversitas.com/
 """
 
-# We only add browser ones if they have a website AND we don't have them yet.
-for line in browser_data.strip().split("\n"):
-    parts = line.split(",")
-    if len(parts) >= 1:
-        name = parts[0].strip()
-        web = parts[1].strip() if len(parts) > 1 else ""
-        if name.lower() not in seen_names:
-            leads.append({
-                "nombre": name,
-                "web": web,
-                "email": ""
-            })
-            seen_names.add(name.lower())
+# We only add browser ones we don't have yet (upsert por nombre: los que ya
+# existen solo se completan, p. ej. con la web). Si el bloque no ha cambiado
+# desde el último run ni se parsea.
+browser_digest = content_hash(browser_data)
+if not store.source_unchanged("merge_and_add_leads:browser", browser_digest):
+    browser_leads = []
+    for line in browser_data.strip().split("\n"):
+        parts = line.split(",")
+        if len(parts) >= 1:
+            name = parts[0].strip()
+            web = parts[1].strip() if len(parts) > 1 else ""
+            browser_leads.append({"nombre": name, "web": web, "email": ""})
+    pending = store.changed_records("merge_and_add_leads:browser", browser_leads)
+    store.upsert_many(pending, source="browser")
+    store.mark_synced("merge_and_add_leads:browser", browser_digest, browser_leads, done=pending)
 
-# Save current state
-final_path = "/Users/asiermugica/Downloads/inmobiliarias con mail.csv"
-fieldnames = ['nombre', 'email', 'telefono', 'web', 'direccion', 'valoracion']
-with open(final_path, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-    writer.writeheader()
-    writer.writerows(leads)
+# Save current state: el CSV es una exportación del almacén
+total = store.export_csv(LEADS_CSV)
+store.close()
 
-print(f"✅ Total leads (including browser-names): {len(leads)}")
+print(f"✅ Total leads (including browser-names): {total}")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+plan_diff.py
+------------
+Diff incremental de planes (hojas de DataFrames) contra lo último que se
+exportó/subió, para reescribir solo lo que ha cambiado.
+
+- Cada fila lleva un id estable: el valor de su columna clave (por defecto
+  la primera: DIA, Periodo, Tipo...) y, si se repite, "#n" por orden de
+  aparición. Y un hash de contenido de la fila entera
+  (pd.util.hash_pandas_object, vectorizado).
+- El estado de cada destino (un .xlsx, una hoja de Google Sheets) se guarda
+  en .tmp/plan_state/<destino>.json: columnas, ids y hashes por hoja, en
+  el orden en que quedaron escritos.
+- diff_plan() devuelve un Changeset por hoja: filas borradas (posiciones
+  antiguas), añadidas y modificadas (posiciones nuevas). Si cambian las
+  columnas, el formato o el orden relativo de las filas que siguen, la
+  hoja se marca `rewrite` y se escribe entera.
+
+Aplicar un Changeset: borrar `removed` de mayor a menor, insertar `added`
+de menor a mayor y escribir `added` + `modified` en su posición nueva
+(upload_to_sheets.py). Un .xlsx es un zip que se reescribe entero, así que
+workbook_export.write_plan() solo se ahorra la escritura cuando no hay
+cambios.
+
+Uso:
+    state = PlanState.load(target)
+    changes, new_state = diff_plan(sheets, state)      # sheets = {título: DataFrame}
+    if not changes.empty:
+        ...aplicar...
+        new_state.save()
+    print(changes.summary())
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+# ── Config ─────────────────────────────────────────────────────────────────
+BASE_DIR  = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATE_DIR = os.path.join(BASE_DIR, ".tmp", "plan_state")
+
+
+def row_ids(frame: pd.DataFrame, key: str | None = None) -> list[str]:
+    """Id estable de cada fila: valor de la columna clave (+ "#n" si se repite)."""
+    if frame.empty:
+        return []
+    keys = frame[key if key is not None else frame.columns[0]].astype(str)
+    occurrence = keys.groupby(keys, sort=False).cumcount()
+    return [k if n == 0 else f"{k}#{n}" for k, n in zip(keys.tolist(), occurrence.tolist())]
+
+
+def row_hashes(frame: pd.DataFrame) -> list[str]:
+    """Hash del contenido de cada fila (como texto: 1 y "1" son lo mismo)."""
+    if frame.empty:
+        return []
+    text = frame.astype(object).where(frame.notna(), "").astype(str)
+    return [format(h, "016x") for h in pd.util.hash_pandas_object(text, index=False).tolist()]
+
+
+@dataclass
+class SheetState:
+    columns: list[str]
+    ids: list[str]
+    hashes: list[str]
+    layout: str = ""   # formato (estilo de cabecera, anchos...): si cambia, hoja entera
+
+
+@dataclass
+class PlanState:
+    target: str
+    sheets: dict[str, SheetState] = field(default_factory=dict)
+
+    @staticmethod
+    def path_for(target: str) -> str:
+        name = hashlib.sha1(target.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(STATE_DIR, f"{name}.json")
+
+    @classmethod
+    def load(cls, target: str) -> "PlanState":
+        """Estado guardado de `target` (vacío si nunca se escribió o no se puede leer)."""
+        try:
+            with open(cls.path_for(target), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(target)
+        if data.get("target") != target:
+            return cls(target)
+        return cls(target, {title: SheetState(**s) for title, s in data.get("sheets", {}).items()})
+
+    def save(self) -> None:
+        path = self.path_for(self.target)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"target": self.target,
+                       "sheets": {t: s.__dict__ for t, s in self.sheets.items()}}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def forget(self) -> None:
+        if os.path.exists(self.path_for(self.target)):
+            os.remove(self.path_for(self.target))
+
+
+@dataclass
+class SheetChanges:
+    removed: list[int] = field(default_factory=list)    # posiciones antiguas (filas de datos, 0-based)
+    added: list[int] = field(default_factory=list)      # posiciones nuevas
+    modified: list[int] = field(default_factory=list)   # posiciones nuevas
+    rewrite: bool = False                                # hoja nueva o incompatible: escribirla entera
+
+    @property
+    def empty(self) -> bool:
+        return not (self.removed or self.added or self.modified or self.rewrite)
+
+
+@dataclass
+class Changeset:
+    sheets: dict[str, SheetChanges] = field(default_factory=dict)   # solo las hojas con cambios
+    removed_sheets: list[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not self.sheets and not self.removed_sheets
+
+    def summary(self) -> str:
+        if self.empty:
+            return "sin cambios"
+        parts = [f"{title}: entera" if c.rewrite else
+                 f"{title}: +{len(c.added)} -{len(c.removed)} ~{len(c.modified)}"
+                 for title, c in self.sheets.items()]
+        parts += [f"{title}: borrada" for title in self.removed_sheets]
+        return "; ".join(parts)
+
+
+def sheet_state(frame: pd.DataFrame, key: str | None = None, layout: str = "") -> SheetState:
+    return SheetState([str(c) for c in frame.columns], row_ids(frame, key), row_hashes(frame), layout)
+
+
+def diff_sheet(old: SheetState | None, new: SheetState) -> SheetChanges:
+    if old is None or old.columns != new.columns or old.layout != new.layout \
+            or len(set(new.ids)) != len(new.ids):
+        return SheetChanges(rewrite=True)
+    old_pos = {row_id: i for i, row_id in enumerate(old.ids)}
+    new_pos = {row_id: i for i, row_id in enumerate(new.ids)}
+    kept_old = [row_id for row_id in old.ids if row_id in new_pos]
+    kept_new = [row_id for row_id in new.ids if row_id in old_pos]
+    if kept_old != kept_new:
+        return SheetChanges(rewrite=True)   # filas reordenadas: no sale a cuenta moverlas una a una
+    return SheetChanges(
+        removed=[i for i, row_id in enumerate(old.ids) if row_id not in new_pos],
+        added=[i for i, row_id in enumerate(new.ids) if row_id not in old_pos],
+        modified=[i for i, (row_id, h) in enumerate(zip(new.ids, new.hashes))
+                  if row_id in old_pos and old.hashes[old_pos[row_id]] != h],
+    )
+
+
+def diff_plan(sheets: dict[str, pd.DataFrame], state: PlanState, keys: dict[str, str] | None = None,
+              layouts: dict[str, str] | None = None) -> tuple[Changeset, PlanState]:
+    """
+    Changeset de `sheets` ({título: DataFrame}) respecto a `state`, y el
+    estado que quedará una vez aplicado (guardarlo con .save() solo entonces).
+    """
+    keys, layouts = keys or {}, layouts or {}
+    changes = Changeset()
+    new_state = PlanState(state.target)
+    for title, frame in sheets.items():
+        current = sheet_state(frame, keys.get(title), layouts.get(title, ""))
+        sheet_changes = diff_sheet(state.sheets.get(title), current)
+        if not sheet_changes.empty:
+            changes.sheets[title] = sheet_changes
+        new_state.sheets[title] = current
+    changes.removed_sheets = [title for title in state.sheets if title not in sheets]
+    return changes, new_state
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+run_journal.py
+--------------
+Diario append-only (JSON Lines) para que los scrapes largos se puedan
+reanudar. Cada fila resuelta se escribe como una línea y se hace
+flush + fsync antes de seguir, así que un Ctrl-C, un crash o un corte de
+red como mucho pierde la fila que estaba en vuelo.
+
+Al cargar, una última línea a medio escribir (crash durante el write)
+se ignora. Si una clave aparece varias veces gana la última.
+
+Uso:
+    journal = RunJournal(path, resume=True)
+    settled = journal.settled          # {clave: registro}
+    journal.append(row_key(row), email="info@...")
+    journal.close()
+"""
+
+import hashlib
+import json
+import os
+import time
+
+
+def row_key(row: dict) -> str:
+    """Clave estable de una fila de leads: nombre + web normalizados."""
+    nombre = (row.get("nombre") or row.get("Nombre") or "").strip().lower()
+    web = (row.get("web") or row.get("Web") or "").strip().lower().rstrip("/")
+    return hashlib.sha1(f"{nombre}|{web}".encode("utf-8")).hexdigest()
+
+
+class RunJournal:
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        self.settled: dict[str, dict] = self._load() if resume else {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Sin --resume empezamos de cero: un diario viejo no debe colarse
+        self._f = open(path, "a" if resume else "w", encoding="utf-8")
+
+    def _load(self) -> dict[str, dict]:
+        settled = {}
+        if not os.path.exists(self.path):
+            return settled
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # línea truncada por un crash
+                settled[record["key"]] = record
+        return settled
+
+    def append(self, key: str, **fields) -> None:
+        record = {"key": key, "ts": time.time(), **fields}
+        self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self.settled[key] = record
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
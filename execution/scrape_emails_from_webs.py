@@ -3,110 +3,320 @@
 scrape_emails_from_webs.py
 ---------------------------
 Lee inmobiliarias_zaragoza_googlemaps.csv, visita la web de cada una
-(priorizando /contacto, /contacta, /contact) y extrae emails via regex.
+(enlaces de contacto de la homepage, robots.txt/sitemap y, si no hay nada,
+/contacto, /contacta, /contact...) y extrae emails.
+Las peticiones van por http_fetch (pool keep-alive, reintentos, circuit
+breaker por dominio) y la caché en disco de http_cache. Cada página se lee
+en streaming con un tope de bytes y se deja de descargar en cuanto aparece
+un email prioritario (info@, contacto@...).
 No necesita API key — scraping directo.
 
+Las webs se visitan en paralelo (asyncio + pool de hilos): hay un límite
+global de conexiones en vuelo y otro por host, para no saturar a nadie.
+
+Cada web visitada se apunta al momento en un diario (JOURNAL_PATH). Si el
+run se corta, `--resume` continúa donde se quedó; con `--max-minutes` se
+puede trocear un crawl largo en tramos.
+
+Para exports enormes, `--frontier fichero.db --workers N` reparte las filas
+entre N procesos a través de un frontier SQLite (crawl_frontier.py); varias
+máquinas pueden apuntar al mismo fichero. Las filas de un worker caído se
+recuperan al caducar su lease.
+
+Uso:
+    python scrape_emails_from_webs.py [--concurrency 16] [--per-host 2]
+                                      [--resume] [--max-minutes 30]
+    python scrape_emails_from_webs.py --frontier crawl.db --workers 8
+    python scrape_emails_from_webs.py --prom-textfile /var/lib/node_exporter/livix_crawl.prom
+
+Cada run deja su telemetría (latencias por fase, bytes, status, errores y
+qué página dio cada email) en METRICS_JSON; con `--prom-textfile` también
+en formato Prometheus. Ver crawl_metrics.py.
+
 Salida: ~/Downloads/inmobiliarias_con_email.csv
 """
 
+import argparse
+import asyncio
 import csv
-import re
 import time
+import multiprocessing
 import os
-from urllib.parse import urljoin, urlparse
+import socket
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 
-import requests
 from requests.exceptions import RequestException
 
+from contact_discovery import FetchBudget, discover_contact_pages
+from crawl_frontier import Frontier, FrontierJournal
+from crawl_metrics import load_report, metrics
+from domains import SiteMemo, registrable_domain
+from contact_extract import EmailStreamScanner, best_email
+from http_cache import ScanResult, cached_scan
+from run_journal import RunJournal, row_key
+
 # ── Config ─────────────────────────────────────────────────────────────────
 INPUT_CSV  = os.path.expanduser("~/Downloads/inmobiliarias_zaragoza_googlemaps.csv")
 OUTPUT_CSV = os.path.expanduser("~/Downloads/inmobiliarias_con_email.csv")
+JOURNAL_PATH = OUTPUT_CSV + ".journal.jsonl"   # diario para --resume
+METRICS_JSON = OUTPUT_CSV + ".metrics.json"    # informe de telemetría del último run
 
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/122.0.0.0 Safari/537.36"
-    ),
-    "Accept-Language": "es-ES,es;q=0.9",
-}
-TIMEOUT = 8
-DELAY   = 0.5   # segundos entre requests
-
-# Sufijos de contacto para probar
-CONTACT_SLUGS = ["/contacto", "/contacta", "/contactanos", "/contact", "/quienes-somos", "/sobre-nosotros"]
+DELAY   = 0.5   # segundos de cortesía entre visitas al mismo host
 
-EMAIL_REGEX = re.compile(
-    r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}"
-)
+CONCURRENCY = 16  # webs en vuelo a la vez (global)
+PER_HOST    = 2   # webs en vuelo a la vez contra un mismo host
+FRONTIER_BATCH = 4  # lote que pide cada worker al frontier = CONCURRENCY * esto
 
-# Dominios/patrones que NO son emails reales
-IGNORE_PATTERNS = [
-    "example.com", "wixpress.com", "sentry.io", "yourdomain",
-    ".png", ".jpg", ".gif", ".svg", "schema.org",
-]
-
-
-def is_valid_email(email: str) -> bool:
-    email = email.lower()
-    return not any(p in email for p in IGNORE_PATTERNS)
+# Sufijos de contacto a ciegas, en orden de prioridad, si el descubrimiento
+# (contact_discovery) no encuentra candidatas
+CONTACT_SLUGS = ["/contacto", "/contacta", "/contactanos", "/contact", "/quienes-somos", "/sobre-nosotros"]
+PROBE_BUDGET  = 3   # slugs de contacto en vuelo a la vez contra el mismo host
+SITE_FETCHES  = 1 + len(CONTACT_SLUGS)   # tope de peticiones por web: homepage + slugs, como siempre
 
 
-def fetch(url: str) -> str | None:
+def scan_page(url: str, cancel: threading.Event | None = None) -> ScanResult:
+    """
+    Descarga `url` en streaming (tope MAX_PAGE_BYTES) extrayendo emails por
+    el camino; deja de leer en cuanto aparece uno prioritario (info@...) o
+    se activa `cancel`.
+    """
     try:
-        r = requests.get(url, headers=HEADERS, timeout=TIMEOUT, allow_redirects=True)
-        if r.status_code == 200 and "text" in r.headers.get("content-type", ""):
-            return r.text
+        return cached_scan(url, EmailStreamScanner(), cancel=cancel)
     except RequestException:
-        pass
-    return None
-
-
-def extract_emails(html: str) -> list[str]:
-    found = EMAIL_REGEX.findall(html)
-    return [e for e in set(found) if is_valid_email(e)]
+        return ScanResult(0)
 
 
-def best_email(emails: list[str]) -> str:
-    """Prioriza emails genéricos tipo info@, contacto@, admin@..."""
-    priority = ("info", "contacto", "contact", "hola", "inmobiliaria", "oficina", "admin")
-    for prefix in priority:
-        for e in emails:
-            if e.startswith(prefix):
-                return e
-    return emails[0] if emails else ""
+def fetch_emails(url: str, cancel: threading.Event | None = None) -> list[str]:
+    return scan_page(url, cancel).emails
 
 
-def scrape_website(base_url: str) -> str:
-    """Intenta homepage + páginas de contacto y devuelve el mejor email."""
-    all_emails: list[str] = []
+def probe_contact_pages(urls: list[str], domain: str | None = None) -> tuple[str, str]:
+    """
+    Prueba `urls` en paralelo (como mucho PROBE_BUDGET a la vez) y devuelve
+    (mejor email, url) de la primera URL, en el orden dado, que tenga alguno.
 
+    Una URL gana en cuanto tiene emails y todas las anteriores ya han
+    terminado sin ellos; entonces se cancelan las sondas pendientes y las
+    que están descargando dejan de leer. `domain` (el del lead) desempata
+    a favor de los emails del propio dominio.
+    """
+    if not urls:
+        return "", ""
+    cancel = threading.Event()
+    results: dict[int, list[str]] = {}
+    pool = ThreadPoolExecutor(max_workers=min(PROBE_BUDGET, len(urls)))
+    try:
+        futures = {pool.submit(fetch_emails, url, cancel): i for i, url in enumerate(urls)}
+        for fut in as_completed(futures):
+            results[futures[fut]] = fut.result()
+            for i in range(len(urls)):
+                if i not in results:
+                    break  # una URL más prioritaria sigue en vuelo
+                email = best_email(results[i], domain)
+                if email:
+                    return email, urls[i]
+        return "", ""
+    finally:
+        cancel.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def scrape_website(base_url: str, memo: SiteMemo | None = None) -> str:
+    """
+    Intenta homepage + páginas de contacto y devuelve el mejor email.
+    Con `memo`, si la homepage redirige a otro sitio ya resuelto en este
+    run se reutiliza su resultado en vez de volver a buscar.
+    """
+    started = time.perf_counter()
+    email, source, path = _scrape_website(base_url, memo)
+    metrics.observe("site", time.perf_counter() - started)
+    metrics.observe_row(email, source, path)
+    return email
+
+
+def _scrape_website(base_url: str, memo: SiteMemo | None) -> tuple[str, str, str]:
+    """(email, origen, ruta): origen es home, redirect, discovery o slug (para la telemetría)."""
     # 1. Homepage
-    html = fetch(base_url)
-    if html:
-        all_emails.extend(extract_emails(html))
+    home = scan_page(base_url)
 
     # Si ya tenemos algo bueno, paramos
-    if all_emails:
-        return best_email(all_emails)
+    site_url = home.url or base_url
+    email = best_email(home.emails, registrable_domain(site_url))
+    if email:
+        return email, "home", "/"
+
+    # Dominio viejo que redirige a uno nuevo: mismo sitio a partir de aquí
+    if memo is not None:
+        requested, final = registrable_domain(base_url), registrable_domain(site_url)
+        memo.alias(requested, final)
+        known = memo.get(final) if final else None
+        if known is not None:
+            return known, "redirect", "/"
+
+    # 2. Páginas de contacto descubiertas (enlaces, robots.txt, sitemap);
+    #    si no aparece ninguna y el descubrimiento no agotó su tope, los
+    #    slugs de siempre. En paralelo, sin pasar de SITE_FETCHES en total.
+    source = "discovery"
+    budget = FetchBudget()
+    candidates = discover_contact_pages(site_url, home.text, budget=budget)
+    if not candidates and not budget.spent:
+        source = "slug"
+        parsed = urlparse(site_url)
+        base = f"{parsed.scheme}://{parsed.netloc}"
+        candidates = [base + slug for slug in CONTACT_SLUGS]
+    candidates = candidates[:SITE_FETCHES - 1 - budget.used]
+    email, url = probe_contact_pages(candidates, registrable_domain(site_url))
+    return email, source, urlparse(url).path or "/"
+
+
+# ── Crawl concurrente ───────────────────────────────────────────────────────
+def host_of(url: str) -> str:
+    """Host normalizado (sin www.) para agrupar la cortesía por servidor."""
+    parsed = urlparse(url if "://" in url else f"http://{url}")
+    host = parsed.netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+async def crawl(rows: list[dict], concurrency: int, per_host: int,
+                journal: RunJournal, deadline: float | None = None) -> dict[str, int]:
+    """
+    Visita en paralelo las webs de `rows` y rellena row["email"] in-place.
+
+    `scrape_website()` sigue siendo bloqueante (requests); se ejecuta en un
+    pool de hilos del tamaño de `concurrency`. Cada host tiene su propio
+    semáforo de `per_host` plazas y, al terminar, retiene su plaza DELAY
+    segundos: la cortesía se paga por host, no en el reloj global.
+
+    Cada web visitada se apunta en `journal` en cuanto termina; las filas
+    que ya estaban en el diario (--resume) no se vuelven a visitar. Pasado
+    `deadline` (time.monotonic) no se empiezan filas nuevas.
+
+    Las filas que comparten dominio registrable (oficinas de una franquicia,
+    "cunza.es/nuestra-empresa/") se visitan una sola vez: la primera hace
+    el scrape y las demás esperan su resultado (SiteMemo, con alias por
+    redirección).
+
+    Devuelve los contadores del run (already, resumed, found, missing, shared, pending);
+    cada fila cuenta en uno solo: found/missing son las webs visitadas y
+    shared las filas resueltas con la visita de otra. Un error inesperado al
+    visitar una web se registra y la fila queda como missing.
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    global_slots = asyncio.Semaphore(concurrency)
+    host_slots: dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(per_host))
+    memo = SiteMemo()
+    in_flight: dict[str, asyncio.Future] = {}   # sitio → resultado de la fila que lo visita
+
+    total = len(rows)
+    stats = {"already": 0, "resumed": 0, "found": 0, "missing": 0, "shared": 0, "pending": 0}
+    done = 0
+
+    async def visit(row: dict) -> None:
+        nonlocal done
+        nombre = row.get("nombre", "—")
+        web    = row.get("web", "").strip()
+        site   = memo.canonical(registrable_domain(web) or host_of(web))
+
+        owner = in_flight.get(site)
+        shared = owner is not None
+        if shared:
+            # Otra fila ya visita este sitio: esperar y repartir su resultado
+            found = await asyncio.shield(owner)
+            if found is None:
+                stats["pending"] += 1  # la otra fila no llegó a empezar (deadline)
+                return
+            journal.append(row_key(row), nombre=nombre, web=web, email=found)
+        else:
+            future = in_flight[site] = loop.create_future()
+            found = None
+            try:
+                # Primero la plaza del host y luego la global: así una cola de filas
+                # del mismo host no bloquea conexiones que otros hosts podrían usar.
+                async with host_slots[host_of(web)]:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        stats["pending"] += 1
+                        return
+                    async with global_slots:
+                        try:
+                            found = await loop.run_in_executor(executor, scrape_website, web, memo)
+                        except Exception as e:
+                            # Un fallo en una web no tumba el crawl: se apunta como sin email
+                            print(f"  ⚠️  {nombre} ({web}): error inesperado, se salta: {type(e).__name__}: {e}")
+                            metrics.observe_row("")
+                            found = ""
+                    memo.put(site, found)
+                    journal.append(row_key(row), nombre=nombre, web=web, email=found)
+                    await asyncio.sleep(DELAY)
+            finally:
+                if not future.done():
+                    future.set_result(found)
+
+        done += 1
+        via = " (mismo sitio que otra fila)" if shared else ""
+        if shared:
+            stats["shared"] += 1
+        else:
+            stats["found" if found else "missing"] += 1
+        if found:
+            row["email"] = found
+            print(f"  [{done}/{total}] ✅ {nombre} ({web}) → {found}{via}")
+        else:
+            print(f"  [{done}/{total}] ❌ {nombre} ({web}): no encontrado{via}")
 
-    # 2. Páginas de contacto
-    parsed = urlparse(base_url)
-    base = f"{parsed.scheme}://{parsed.netloc}"
-    for slug in CONTACT_SLUGS:
-        url = base + slug
-        html = fetch(url)
-        if html:
-            emails = extract_emails(html)
-            if emails:
-                return best_email(emails)
-        time.sleep(0.2)
+    pending = []
+    for row in rows:
+        email_existente = row.get("email", "").strip()
+        if email_existente:
+            done += 1
+            stats["already"] += 1
+            print(f"  [{done}/{total}] ✅ {row.get('nombre', '—')}: ya tiene → {email_existente}")
+            continue
+        settled = journal.settled.get(row_key(row))
+        if settled is not None:
+            done += 1
+            stats["resumed"] += 1
+            if settled.get("email"):
+                row["email"] = settled["email"]
+            continue
+        pending.append(visit(row))
 
-    return ""
+    if stats["resumed"]:
+        print(f"  ⏩ {stats['resumed']} filas ya resueltas en el diario, no se revisitan")
+
+    try:
+        await asyncio.gather(*pending)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return stats
 
 
 # ── Main ────────────────────────────────────────────────────────────────────
-def main():
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Busca emails en las webs de las inmobiliarias.")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY,
+                        help=f"webs visitadas a la vez (por defecto {CONCURRENCY})")
+    parser.add_argument("--per-host", type=int, default=PER_HOST,
+                        help=f"webs a la vez contra un mismo host (por defecto {PER_HOST})")
+    parser.add_argument("--resume", action="store_true",
+                        help="continuar el run anterior saltando las filas ya apuntadas en el diario")
+    parser.add_argument("--max-minutes", type=float, default=None,
+                        help="no empezar filas nuevas pasados N minutos (crawl por tramos con --resume)")
+    parser.add_argument("--frontier", default=None,
+                        help="fichero SQLite compartido: reparte las filas entre procesos/máquinas")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="procesos que trabajan el frontier en esta máquina (con --frontier)")
+    parser.add_argument("--prom-textfile", default=None,
+                        help="escribir también las métricas en formato Prometheus (textfile collector)")
+    return parser.parse_args()
+
+
+def load_rows() -> tuple[list[dict], list[dict]]:
+    """Devuelve (todas las filas, filas con web y dentro de España)."""
     with open(INPUT_CSV, newline="", encoding="utf-8") as f:
         rows = list(csv.DictReader(f))
 
@@ -119,47 +329,157 @@ def main():
         skip_countries = ["md ", "california", "texas", "new york", ", al ", "ontario"]
         if web and not any(c in addr for c in skip_countries):
             spain_rows.append(r)
+    return rows, spain_rows
+
+
+# ── Modo frontier (varios procesos) ─────────────────────────────────────────
+def run_worker(frontier_path: str, worker_id: int, concurrency: int, per_host: int,
+               deadline: float | None) -> None:
+    """
+    Bucle de un worker: pide lotes al frontier, los crawlea con crawl() y
+    cada resultado se guarda en SQLite al momento (FrontierJournal).
+    `deadline` es time.time() absoluto, porque cruza procesos.
+    """
+    frontier = Frontier(frontier_path)
+    journal = FrontierJournal(frontier)
+    owner = f"{socket.gethostname()}:{os.getpid()}:{worker_id}"
+    try:
+        while deadline is None or time.time() < deadline:
+            batch = frontier.lease(owner, concurrency * FRONTIER_BATCH)
+            if not batch:
+                break
+            mono_deadline = time.monotonic() + (deadline - time.time()) if deadline else None
+            stats = asyncio.run(crawl(batch, concurrency, per_host, journal, mono_deadline))
+            if stats["pending"]:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        frontier.release(owner)
+        frontier.close()
+        metrics.write_json(f"{METRICS_JSON}.worker{worker_id}")
+
+
+def run_frontier(args: argparse.Namespace, spain_rows: list[dict]) -> None:
+    frontier = Frontier(args.frontier)
+    added = frontier.seed(spain_rows)
+    print(f"🗂️  Frontier {args.frontier}: {added} filas nuevas, {frontier.counts()}")
+
+    deadline = time.time() + args.max_minutes * 60 if args.max_minutes else None
+    workers = [
+        multiprocessing.Process(
+            target=run_worker,
+            args=(args.frontier, i, max(1, args.concurrency), max(1, args.per_host), deadline),
+        )
+        for i in range(max(1, args.workers))
+    ]
+    for w in workers:
+        w.start()
+    try:
+        for w in workers:
+            w.join()
+    except KeyboardInterrupt:
+        for w in workers:
+            w.join()
+
+    rows = frontier.export_rows()
+    counts = frontier.counts()
+    frontier.close()
+    write_output(rows)
+
+    total_with_email = sum(1 for r in rows if r.get("email", "").strip())
+    print(f"\n📊 Resultado (frontier):")
+    print(f"   - {counts.get('done', 0)} filas terminadas, {counts.get('pending', 0)} pendientes, "
+          f"{counts.get('leased', 0)} prestadas ({counts['failed']} abandonadas)")
+    print(f"   - {total_with_email} en total con email")
+    print(f"\n💾 Guardado en: {OUTPUT_CSV}")
 
-    print(f"📋 {len(rows)} inmobiliarias en CSV")
-    print(f"🇪🇸 {len(spain_rows)} con web válida (filtrando resultados fuera de España)\n")
-
-    found_count = 0
-    already_count = 0
-
-    for i, row in enumerate(spain_rows, 1):
-        nombre = row.get("nombre", "—")
-        web    = row.get("web", "").strip()
-        email_existente = row.get("email", "").strip()
+    # La telemetría de cada worker se suma en el informe de este proceso
+    for i in range(len(workers)):
+        fragment = f"{METRICS_JSON}.worker{i}"
+        report = load_report(fragment)
+        if report:
+            metrics.merge(report)
+            os.remove(fragment)
+    write_metrics(args, {"frontier": counts})
+
+
+def write_output(rows: list[dict]) -> None:
+    """Escribe OUTPUT_CSV de forma atómica (tmp + os.replace)."""
+    tmp = OUTPUT_CSV + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp, OUTPUT_CSV)
+
+
+def write_metrics(args: argparse.Namespace, extra: dict) -> None:
+    """Vuelca la telemetría del run (JSON y, si se pidió, textfile de Prometheus) y un resumen."""
+    config = {"concurrency": args.concurrency, "per_host": args.per_host,
+              "workers": args.workers if args.frontier else 1, "contact_slugs": CONTACT_SLUGS}
+    metrics.write_json(METRICS_JSON, {"config": config, **extra})
+    if args.prom_textfile:
+        metrics.write_prometheus(args.prom_textfile)
+
+    report = metrics.to_dict()
+    latency = report["latency"]
+    print(f"\n⏱️  Telemetría: {report['requests']} peticiones, {report['cache_hits']} de caché, "
+          f"{report['bytes'] / 1e6:.1f} MB, {sum(report['errors'].values())} errores")
+    print(f"   - TTFB p50/p90: {latency['ttfb']['p50']}s / {latency['ttfb']['p90']}s · "
+          f"web p50/p90: {latency['site']['p50']}s / {latency['site']['p90']}s")
+    if report["sources"]:
+        top = sorted(report["sources"].items(), key=lambda kv: -kv[1])[:5]
+        print(f"   - Origen del email: {', '.join(f'{src} {n}' for src, n in top)}")
+    print(f"   - Informe: {METRICS_JSON}")
 
-        if email_existente:
-            print(f"  [{i}/{len(spain_rows)}] ✅ {nombre}: ya tiene → {email_existente}")
-            already_count += 1
-            continue
 
-        print(f"  [{i}/{len(spain_rows)}] 🔍 {nombre} ({web})")
-        found = scrape_website(web)
+def main():
+    args = parse_args()
+    rows, spain_rows = load_rows()
 
-        if found:
-            row["email"] = found
-            print(f"     ✅ {found}")
-            found_count += 1
-        else:
-            print(f"     ❌ No encontrado")
+    print(f"📋 {len(rows)} inmobiliarias en CSV")
+    print(f"🇪🇸 {len(spain_rows)} con web válida (filtrando resultados fuera de España)")
+    print(f"⚡ {args.concurrency} conexiones en paralelo, {args.per_host} por host\n")
 
-        time.sleep(DELAY)
+    if args.frontier:
+        run_frontier(args, spain_rows)
+        return
 
-    # Guardar resultado (solo filas España)
-    with open(OUTPUT_CSV, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=spain_rows[0].keys())
-        writer.writeheader()
-        writer.writerows(spain_rows)
+    deadline = time.monotonic() + args.max_minutes * 60 if args.max_minutes else None
+    journal = RunJournal(JOURNAL_PATH, resume=args.resume)
+    interrupted = False
+    stats = None
+    try:
+        stats = asyncio.run(crawl(
+            spain_rows, max(1, args.concurrency), max(1, args.per_host), journal, deadline,
+        ))
+    except KeyboardInterrupt:
+        interrupted = True
+        # Lo ya apuntado en el diario no se pierde: volcarlo a las filas
+        for row in spain_rows:
+            settled = journal.settled.get(row_key(row))
+            if settled and settled.get("email") and not row.get("email", "").strip():
+                row["email"] = settled["email"]
+    finally:
+        journal.close()
+
+    # Guardar resultado (solo filas España), también si el run fue parcial
+    write_output(spain_rows)
 
     total_with_email = sum(1 for r in spain_rows if r.get("email", "").strip())
     print(f"\n📊 Resultado:")
-    print(f"   - {already_count} ya tenían email")
-    print(f"   - {found_count} emails encontrados ahora")
+    if stats:
+        print(f"   - {stats['already']} ya tenían email")
+        print(f"   - {stats['resumed']} recuperadas del diario")
+        print(f"   - {stats['found']} emails encontrados ahora ({stats['missing']} webs sin email)")
+        print(f"   - {stats['shared']} filas resueltas con la visita de otra del mismo sitio")
     print(f"   - {total_with_email} en total con email")
     print(f"\n💾 Guardado en: {OUTPUT_CSV}")
+    write_metrics(args, {"stats": stats or {}, "interrupted": interrupted})
+
+    if interrupted or (stats and stats["pending"]):
+        print(f"⏸️  Run parcial: relanza con --resume para continuar (diario: {JOURNAL_PATH})")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los scripts de execution/ se importan entre sí por nombre (from contact_extract import ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
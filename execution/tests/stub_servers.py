@@ -0,0 +1,338 @@
+"""
+stub_servers.py
+---------------
+Servidores de pruebas locales (solo stdlib) para los tests de execution/:
+un DNS (UDP y TCP en el mismo puerto) y un SMTP que contesta RCPT TO según
+los buzones que se le den (asyncio), y una API de Hunter con rate limit y
+cuota y una web estática (http.server en un hilo). Escuchan en 127.0.0.1 en un puerto libre y
+registran lo que reciben, para comprobar cachés, esperas y reutilización de
+conexiones.
+
+Uso:
+    async with StubDns({"inmo.es": [(10, "127.0.0.1")]}) as dns, \\
+            StubSmtp(mailboxes={"info@inmo.es"}) as smtp:
+        resolver = UdpResolver(dns.address)
+        checker = DeliverabilityChecker(resolver, smtp=True, smtp_port=smtp.port)
+
+    with StubHunter({"inmo.es": ["info@inmo.es"]}, quota=10) as hunter:
+        client = HunterClient("clave", base_url=hunter.url)
+
+    with StubWeb({"/": "<html>...</html>", "/robots.txt": "Sitemap: ..."}) as web:
+        scrape_website(web.url)
+"""
+
+import asyncio
+import json
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from deliverability import QTYPE_A, QTYPE_MX, FLAG_TC, _read_name
+
+HOST = "127.0.0.1"
+
+
+def _encode_name(name: str) -> bytes:
+    return b"".join(bytes([len(label)]) + label.encode() for label in name.split(".") if label) + b"\x00"
+
+
+def _free_port() -> int:
+    """Un puerto libre a la vez para UDP y TCP (el DNS escucha en los dos)."""
+    while True:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as udp:
+            udp.bind((HOST, 0))
+            port = udp.getsockname()[1]
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as tcp:
+                try:
+                    tcp.bind((HOST, port))
+                except OSError:
+                    continue
+                return port
+
+
+class StubDns(asyncio.DatagramProtocol):
+    """
+    DNS autoritativo de juguete.
+
+    mx        {dominio: [(preferencia, host)]}   ("." = MX nulo)
+    a         {dominio: ip}
+    nxdomain  dominios que no existen
+    silent    dominios a los que no se contesta (timeout)
+    truncated dominios cuya respuesta UDP llega con el bit TC y sin
+              registros: solo por TCP se obtienen
+    """
+
+    def __init__(self, mx: dict | None = None, a: dict | None = None, nxdomain=(), silent=(), truncated=()):
+        self.mx = mx or {}
+        self.a = a or {}
+        self.nxdomain = set(nxdomain)
+        self.silent = set(silent)
+        self.truncated = set(truncated)
+        self.queries: list[tuple[str, str, int]] = []   # (udp|tcp, dominio, tipo)
+        self.port = 0
+        self._transport = None
+        self._server = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return HOST, self.port
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        self.port = _free_port()
+        self._transport, _ = await loop.create_datagram_endpoint(lambda: self, local_addr=self.address)
+        self._server = await asyncio.start_server(self._tcp_client, HOST, self.port)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._transport.close()
+        self._server.close()
+        await self._server.wait_closed()
+
+    def answer(self, query: bytes, protocol: str) -> bytes | None:
+        query_id, = struct.unpack_from("!H", query)
+        name, offset = _read_name(query, 12)
+        qtype, = struct.unpack_from("!H", query, offset)
+        self.queries.append((protocol, name, qtype))
+        if name in self.silent:
+            return None
+        flags = 0x8180 | (3 if name in self.nxdomain else 0)   # respuesta, RD, RA
+        records = []
+        if name in self.truncated and protocol == "udp":
+            flags |= FLAG_TC
+        elif qtype == QTYPE_MX:
+            records = [(QTYPE_MX, struct.pack("!H", pref) + _encode_name(host)) for pref, host in self.mx.get(name, [])]
+        elif qtype == QTYPE_A and name in self.a:
+            records = [(QTYPE_A, socket.inet_aton(self.a[name]))]
+        answers = b"".join(b"\xc0\x0c" + struct.pack("!HHIH", rtype, 1, 300, len(rdata)) + rdata
+                           for rtype, rdata in records)
+        return struct.pack("!HHHHHH", query_id, flags, 1, len(records), 0, 0) + query[12:offset + 4] + answers
+
+    def datagram_received(self, data, addr):
+        reply = self.answer(data, "udp")
+        if reply is not None:
+            self._transport.sendto(reply, addr)
+
+    async def _tcp_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            length, = struct.unpack("!H", await reader.readexactly(2))
+            reply = self.answer(await reader.readexactly(length), "tcp")
+            if reply is not None:
+                writer.write(struct.pack("!H", len(reply)) + reply)
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+
+
+class StubSmtp:
+    """
+    SMTP que solo conversa hasta RCPT TO.
+
+    mailboxes           direcciones que existen (250); el resto, 550
+    catch_all           dominios que aceptan cualquier dirección
+    greylisted          direcciones que reciben 450
+    replies             {dirección: respuesta} a medida para RCPT TO
+                        (b"550 5.7.1 ...", b"554 ..."; rechazos por política)
+    drop_after          cierra la conexión sin avisar tras N RCPT (0 = nunca),
+                        como un MX que caduca las sesiones ociosas
+    """
+
+    def __init__(self, mailboxes=(), catch_all=(), greylisted=(), replies: dict | None = None,
+                 drop_after: int = 0):
+        self.mailboxes = {m.lower() for m in mailboxes}
+        self.catch_all = set(catch_all)
+        self.greylisted = {m.lower() for m in greylisted}
+        self.replies = {m.lower(): reply for m, reply in (replies or {}).items()}
+        self.drop_after = drop_after
+        self.connections = 0
+        self.rcpts: list[str] = []
+        self.port = 0
+        self._server = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._client, HOST, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+
+    def _rcpt_reply(self, address: str) -> bytes:
+        if address in self.replies:
+            return self.replies[address]
+        if address in self.greylisted:
+            return b"450 4.7.1 greylisted, try again later"
+        if address in self.mailboxes or address.rpartition("@")[2] in self.catch_all:
+            return b"250 2.1.5 ok"
+        return b"550 5.1.1 no such user"
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._writers.add(writer)
+        rcpts = 0
+        try:
+            writer.write(b"220 stub ESMTP\r\n")
+            while line := (await reader.readline()).decode("ascii", "replace").strip():
+                verb = line.split(" ", 1)[0].upper()
+                if verb == "EHLO":
+                    reply = b"250-stub\r\n250 PIPELINING"
+                elif verb == "RCPT":
+                    address = line.partition(":")[2].strip().strip("<>").lower()
+                    self.rcpts.append(address)
+                    reply = self._rcpt_reply(address)
+                    rcpts += 1
+                elif verb == "QUIT":
+                    writer.write(b"221 bye\r\n")
+                    break
+                else:
+                    reply = b"250 ok"
+                writer.write(reply + b"\r\n")
+                await writer.drain()
+                if verb == "RSET" and self.drop_after and rcpts >= self.drop_after:
+                    break   # sin 421: la siguiente orden encuentra la conexión cerrada
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+class StubHunter:
+    """
+    API de Hunter de juguete: /v2/domain-search y /v2/account.
+
+    emails      {dominio: [email, ...]}; un dominio que no está no tiene ninguno
+    quota       búsquedas que quedan este mes; agotadas, 429 "usage limit"
+    script      {dominio: [(estado, cabeceras), ...]}: respuestas que se dan
+                antes de la buena, una por petición (429 con Retry-After, 503...)
+    rate        peticiones/s que se toleran (0 = sin límite): más rápido → 429
+                de rate limit con Retry-After: 1
+
+    `requests` guarda (instante monotonic, dominio, estado) de cada búsqueda.
+    """
+
+    def __init__(self, emails: dict | None = None, quota: int = 1000, script: dict | None = None,
+                 rate: float = 0):
+        self.emails = emails or {}
+        self.quota = quota
+        self.used = 0
+        self.script = {domain: list(replies) for domain, replies in (script or {}).items()}
+        self.rate = rate
+        self.requests: list[tuple[float, str, int]] = []
+        self._last = 0.0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{HOST}:{self._server.server_port}/v2"
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                if url.path == "/v2/account":
+                    status, headers, body = 200, {}, {"data": {"requests": {"searches": {
+                        "available": stub.quota, "used": stub.used}}}}
+                elif url.path == "/v2/domain-search":
+                    status, headers, body = stub.search(query.get("domain", ""))
+                else:
+                    status, headers, body = 404, {}, {"errors": [{"details": "not found"}]}
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                for name, value in {"Content-Type": "application/json", **headers}.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((HOST, 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def search(self, domain: str) -> tuple[int, dict, dict]:
+        with self._lock:
+            now = time.monotonic()
+            status, headers, body = self._reply(domain, now)
+            self.requests.append((now, domain, status))
+            return status, headers, body
+
+    def _reply(self, domain: str, now: float) -> tuple[int, dict, dict]:
+        if self.used >= self.quota:
+            return 429, {}, {"errors": [{"id": "too_many_requests",
+                                         "details": "You have reached your monthly usage limit."}]}
+        if self.rate and now - self._last < 1 / self.rate:
+            return 429, {"Retry-After": "1"}, {"errors": [{"id": "too_many_requests",
+                                                           "details": "Rate limit exceeded."}]}
+        self._last = now
+        if self.script.get(domain):
+            status, headers = self.script[domain].pop(0)
+            return status, headers, {"errors": [{"details": f"HTTP {status}"}]}
+        self.used += 1
+        return 200, {}, {"data": {"domain": domain,
+                                  "emails": [{"value": e, "type": "generic"} for e in self.emails.get(domain, [])]}}
+
+
+class StubWeb:
+    """
+    Web estática: {ruta: cuerpo}; lo que no está, 404. `requests` guarda la
+    ruta de cada GET.
+    """
+
+    def __init__(self, pages: dict[str, str]):
+        self.pages = pages
+        self.requests: list[str] = []
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{HOST}:{self._server.server_port}"
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append(self.path)
+                body = stub.pages.get(self.path)
+                payload = (body or "not found").encode()
+                self.send_response(200 if body is not None else 404)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                try:
+                    self.wfile.write(payload)
+                except ConnectionError:
+                    pass   # el cliente cortó la lectura (tope de bytes)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((HOST, 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
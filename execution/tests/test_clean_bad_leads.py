@@ -0,0 +1,22 @@
+"""clean_bad_leads.py: el CSV de rechazados siempre corresponde al último run."""
+
+import argparse
+import os
+
+from clean_bad_leads import clean_file
+
+
+def test_rejects_file_follows_last_run(tmp_path):
+    path = tmp_path / "leads.csv"
+    rejects = tmp_path / "leads_rechazados.csv"
+    args = argparse.Namespace(workers=0, chunk_rows=2)
+
+    path.write_text("nombre,email\nInmo,info@inmo.es\nMala,sin-arroba\n", encoding="utf-8")
+    clean_file(str(path), args, None)
+    assert "sin-arroba" in rejects.read_text(encoding="utf-8")
+
+    # Segundo run sobre el fichero ya limpio: no hay rechazados y no queda el viejo
+    clean_file(str(path), args, None)
+    assert path.read_text(encoding="utf-8").splitlines() == ["nombre,email", "Inmo,info@inmo.es"]
+    assert not os.path.exists(rejects)
+    assert sorted(os.listdir(tmp_path)) == ["leads.csv"]
@@ -0,0 +1,59 @@
+"""Tope de descargas del descubrimiento de páginas de contacto y sitemaps leídos con tope de bytes."""
+
+import pytest
+
+import contact_discovery
+import http_cache
+import scrape_emails_from_webs
+from contact_discovery import MAX_DISCOVERY_FETCHES, FetchBudget, discover_contact_pages
+from http_cache import HttpCache, cached_get
+from stub_servers import StubWeb
+
+
+def sitemap_index(children: list[str]) -> str:
+    locs = "".join(f"<sitemap><loc>{child}</loc></sitemap>" for child in children)
+    return f'<?xml version="1.0"?><sitemapindex>{locs}</sitemapindex>'
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    cache = HttpCache(str(tmp_path / "http_cache"))
+    monkeypatch.setattr(http_cache, "_default_cache", cache)
+    return cache
+
+
+def test_discovery_never_passes_its_budget():
+    pages = {"/": "<html><a href='/servicios'>Servicios</a></html>"}
+    with StubWeb(pages) as web:
+        # Tres índices con cinco hijos cada uno, ninguno con páginas de contacto
+        pages["/robots.txt"] = "".join(f"Sitemap: {web.url}/index-{i}.xml\n" for i in range(3))
+        for i in range(3):
+            pages[f"/index-{i}.xml"] = sitemap_index([f"{web.url}/page-sitemap-{i}-{j}.xml" for j in range(5)])
+        budget = FetchBudget()
+        assert discover_contact_pages(web.url + "/", pages["/"], budget=budget) == []
+        assert len(web.requests) == MAX_DISCOVERY_FETCHES
+        assert budget.spent
+
+
+def test_spent_budget_skips_contact_slugs():
+    pages = {"/": "<html><p>Sin enlaces de contacto</p></html>"}
+    with StubWeb(pages) as web:
+        pages["/robots.txt"] = f"Sitemap: {web.url}/sitemap_index.xml\n"
+        pages["/sitemap_index.xml"] = sitemap_index([f"{web.url}/post-sitemap.xml"])
+        pages["/post-sitemap.xml"] = "<urlset><url><loc>/blog/piso-centro</loc></url></urlset>"
+        assert scrape_emails_from_webs.scrape_website(web.url + "/") == ""
+        assert len(web.requests) <= scrape_emails_from_webs.SITE_FETCHES
+        assert not any(path in web.requests for path in scrape_emails_from_webs.CONTACT_SLUGS)
+
+
+def test_sitemap_body_is_capped(cache, monkeypatch):
+    entry = "<url><loc>/inmueble/123</loc></url>"
+    big = "<urlset>" + entry * 20_000 + "</urlset>"
+    monkeypatch.setattr(contact_discovery, "MAX_PAGE_BYTES", 10_000)
+    with StubWeb({"/sitemap.xml": big}) as web:
+        assert len(contact_discovery.sitemap_urls(web.url)) <= 10_000 // len(entry)
+        assert cache.load(web.url + "/sitemap.xml")["partial"]
+        # El cuerpo cortado vale para otra lectura con tope, no para una sin él
+        assert len(cached_get(web.url + "/sitemap.xml", max_bytes=10_000).text) == 10_000
+        assert web.requests == ["/robots.txt", "/sitemap.xml"]
+        assert len(cached_get(web.url + "/sitemap.xml").text) == len(big)
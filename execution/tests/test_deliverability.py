@@ -0,0 +1,130 @@
+"""Comprobaciones DNS/SMTP de deliverability.py contra los servidores de stub_servers.py."""
+
+import asyncio
+
+from deliverability import DeliverabilityCache, DeliverabilityChecker, UdpResolver
+from lead_store import LeadStore
+from stub_servers import StubDns, StubSmtp
+
+MX = {
+    "inmo.es": [(10, "127.0.0.1")],
+    "catch.es": [(10, "127.0.0.1")],
+    "nullmx.es": [(0, ".")],
+    "big.es": [(10, "127.0.0.1")],
+}
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def checker(dns: StubDns, tmp_path, smtp: StubSmtp | None = None) -> DeliverabilityChecker:
+    return DeliverabilityChecker(UdpResolver(dns.address, timeout=0.3, retries=1), smtp=smtp is not None,
+                                 cache=DeliverabilityCache(str(tmp_path / "cache.json")),
+                                 smtp_port=smtp.port if smtp else 25)
+
+
+def test_dns_statuses_and_domain_cache(tmp_path):
+    async def scenario():
+        async with StubDns(MX, a={"amx.es": "127.0.0.1"}, nxdomain={"gmial.com"}, silent={"slow.es"}) as dns:
+            c = checker(dns, tmp_path)
+            statuses = await c.check_many(["info@inmo.es", "ventas@inmo.es", "x@gmial.com", "x@nullmx.es",
+                                           "x@amx.es", "x@slow.es", "no-es-un-email"])
+            lookups = c.lookups
+            # Segunda vez: todo sale de la caché salvo el "unknown", que no se guarda
+            again = await c.check_many(["info@inmo.es", "x@gmial.com", "x@slow.es"])
+            return statuses, lookups, again, c.lookups - lookups
+
+    statuses, lookups, again, second_lookups = run(scenario())
+    assert statuses == {"info@inmo.es": "mx_ok", "ventas@inmo.es": "mx_ok", "x@gmial.com": "no_domain",
+                        "x@nullmx.es": "no_mx", "x@amx.es": "mx_ok", "x@slow.es": "unknown",
+                        "no-es-un-email": "invalid"}
+    assert lookups == 5   # un dominio, una consulta, aunque tenga dos emails
+    assert again == {"info@inmo.es": "mx_ok", "x@gmial.com": "no_domain", "x@slow.es": "unknown"}
+    assert second_lookups == 1
+
+
+def test_truncated_udp_answer_is_retried_over_tcp():
+    async def scenario():
+        async with StubDns(MX, truncated={"big.es"}) as dns:
+            records = await UdpResolver(dns.address, timeout=1).mx("big.es")
+            return records, dns.queries
+
+    records, queries = run(scenario())
+    assert records == [(10, "127.0.0.1")]
+    assert [protocol for protocol, _, _ in queries] == ["udp", "tcp"]
+
+
+def test_smtp_probe_states(tmp_path):
+    async def scenario():
+        async with StubDns(MX) as dns, StubSmtp(mailboxes={"info@inmo.es"}, catch_all={"catch.es"},
+                                                 greylisted={"gris@inmo.es"}) as smtp:
+            c = checker(dns, tmp_path, smtp)
+            try:
+                statuses = await c.check_many(["info@inmo.es", "nadie@inmo.es", "x@catch.es", "gris@inmo.es"])
+            finally:
+                await c.close()
+            return statuses, c.cache.emails, smtp
+
+    statuses, cached, smtp = run(scenario())
+    assert statuses == {"info@inmo.es": "deliverable", "nadie@inmo.es": "undeliverable",
+                        "x@catch.es": "catch_all", "gris@inmo.es": "unknown"}
+    assert "gris@inmo.es" not in cached   # 4xx: se vuelve a sondear la próxima vez
+    # Un único MX para los dos dominios: una sola conexión para todos los RCPT TO
+    assert smtp.connections == 1
+    assert any(r.startswith("noexiste-") and r.endswith("@inmo.es") for r in smtp.rcpts)
+
+
+def test_policy_rejections_are_unknown_not_undeliverable(tmp_path):
+    replies = {
+        "info@inmo.es": b"550 5.7.1 Service unavailable, client host blocked",
+        "hola@inmo.es": b"554 Transaction failed: sender rejected",
+        "ventas@inmo.es": b"550 no such user",   # sin código extendido: no se sabe
+        "borrado@inmo.es": b"551 5.1.6 user has moved",
+        "lleno@inmo.es": b"552 5.2.2 mailbox full",
+    }
+
+    async def scenario():
+        async with StubDns(MX) as dns, StubSmtp(replies=replies) as smtp:
+            c = checker(dns, tmp_path, smtp)
+            try:
+                statuses = await c.check_many(list(replies) + ["nadie@inmo.es"])
+            finally:
+                await c.close()
+            return statuses, c.cache.emails
+
+    statuses, cached = run(scenario())
+    assert statuses == {"info@inmo.es": "unknown", "hola@inmo.es": "unknown", "ventas@inmo.es": "unknown",
+                        "borrado@inmo.es": "undeliverable", "lleno@inmo.es": "unknown",
+                        "nadie@inmo.es": "undeliverable"}   # 550 5.1.1
+    assert set(cached) == {"borrado@inmo.es", "nadie@inmo.es"}
+
+
+def test_smtp_reconnects_when_the_server_drops_an_idle_connection(tmp_path):
+    async def scenario():
+        async with StubDns(MX) as dns, StubSmtp(mailboxes={"info@inmo.es", "hola@inmo.es"}, drop_after=1) as smtp:
+            c = checker(dns, tmp_path, smtp)
+            try:
+                first = await c.check("info@inmo.es")
+                await asyncio.sleep(0.05)   # el servidor ya ha cerrado
+                second = await c.check("hola@inmo.es")
+            finally:
+                await c.close()
+            return first, second, smtp.connections
+
+    first, second, connections = run(scenario())
+    assert first == "deliverable"   # el catch-all se sondea en una conexión nueva
+    assert second == "deliverable"
+    assert connections == 3
+
+
+def test_unknown_status_is_not_stored(tmp_path):
+    with LeadStore(str(tmp_path / "leads.db"), bootstrap_csv=None) as store:
+        store.upsert_many([{"nombre": "Inmo A", "email": "info@a.es"}, {"nombre": "Inmo B", "email": "info@b.es"}])
+        store.set_email_statuses({"info@a.es": "mx_ok", "info@b.es": "unknown"})
+        rows = {r["email"]: (r["email_status"], r["email_checked_at"]) for r in
+                store.db.execute("SELECT email, email_status, email_checked_at FROM leads")}
+        pending = store.emails_to_verify(3600)
+    assert rows["info@a.es"][0] == "mx_ok" and rows["info@a.es"][1] is not None
+    assert rows["info@b.es"] == ("", None)
+    assert pending == ["info@b.es"]
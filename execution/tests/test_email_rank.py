@@ -0,0 +1,62 @@
+"""email_rank.py elige y rechaza lo mismo que contact_extract.contact_rank / best_email."""
+
+import numpy as np
+import pandas as pd
+
+from contact_extract import DISPOSABLE_DOMAINS, best_email, contact_rank
+from email_rank import best_contacts, rank_candidates, reject_reasons
+
+# Válidos, gratuitos, desechables, mal formados, con mayúsculas/espacios, no ASCII...
+SAMPLE = [
+    "info@inmo.es", "ventas@inmo.es", "Contacto@Inmo.es", "  hola@inmo.es ", "juan.perez@inmo.es",
+    "inmobiliaria.sur@gmail.com", "maria@hotmail.es", "oficina@otra-inmo.com", "admin@inmo.es",
+    "info@mailinator.com", "contacto@yopmail.com",
+    "sin-arroba.inmo.es", "a@@inmo.es", "@inmo.es", "info@", "info@inmo", "info@inmo.e", "info@.es",
+    "info@inmo.e5", "in fo@inmo.es", "info@in_mo.es", "info@inmo.es.", "info@example.com",
+    "logo@2x.png", "ñandú@inmo.es", "info@inmö.es", "info\n@inmo.es", "x" * 250 + "@inmo.es", "",
+]
+LEADS = [
+    (["ventas@inmo.es", "info@inmo.es"], "inmo.es"),
+    (["maria@hotmail.es", "info@mailinator.com", "oficina@otra-inmo.com"], "inmo.es"),
+    (["inmobiliaria.sur@gmail.com", "juan.perez@inmo.es"], "inmo.es"),
+    (["info@mailinator.com", "a@@inmo.es"], "inmo.es"),
+    (["  Contacto@Inmo.es ", "hola@inmo.es", "info@otra-inmo.com"], "inmo.es"),
+    (["admin@otra-inmo.com", "hola@gmail.com"], "otra-inmo.com"),
+    (["hola@gmail.com", "hola@otra-inmo.com"], None),
+    ([], "inmo.es"),
+    (["info@inmo.e"], "inmo.es"),
+]
+
+
+def test_reject_reasons_match_contact_rank():
+    reasons = reject_reasons(pd.Series(SAMPLE)).tolist()
+    for email, reason in zip(SAMPLE, reasons):
+        local, _, host = email.strip().lower().partition("@")
+        if not email.strip():
+            expected = "sin email"
+        elif contact_rank(email) is not None:
+            expected = None
+        elif host in DISPOSABLE_DOMAINS and contact_rank(f"{local}@inmo.es") is not None:
+            expected = "desechable"
+        else:
+            expected = "formato inválido"
+        assert reason == expected, email
+
+
+def test_rank_matches_contact_rank_order():
+    ranked = rank_candidates(pd.DataFrame({"email": SAMPLE, "domain": "inmo.es"}))
+    keys = [contact_rank(email, "inmo.es") for email in SAMPLE]
+    assert ranked["usable"].tolist() == [key is not None for key in keys]
+    usable = [(rank, key) for rank, key in zip(ranked["rank"], keys) if key is not None]
+    # Mismo orden total: rank menor ⇔ clave de contact_rank menor
+    for rank_a, key_a in usable:
+        for rank_b, key_b in usable:
+            assert (rank_a < rank_b) == (key_a < key_b)
+
+
+def test_best_contacts_match_best_email():
+    emails = pd.Series([emails for emails, _ in LEADS], index=np.arange(len(LEADS)) * 10)
+    domains = pd.Series([domain for _, domain in LEADS], index=emails.index)
+    best = best_contacts(emails, domains).tolist()
+    assert best == [best_email(emails, domain) for emails, domain in LEADS]
+    assert best[:3] == ["info@inmo.es", "oficina@otra-inmo.com", "juan.perez@inmo.es"]
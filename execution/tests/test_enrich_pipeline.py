@@ -0,0 +1,65 @@
+"""Niveles de enrich_pipeline.py: lo que ya está en la caché de Hunter no gasta búsquedas."""
+
+import argparse
+import asyncio
+
+from enrich_pipeline import Pipeline
+from hunter_cache import HunterCache
+from hunter_client import HunterResult
+
+
+class CountingHunter:
+    def __init__(self):
+        self.searches: list[str] = []
+
+    async def search(self, domain: str) -> HunterResult:
+        self.searches.append(domain)
+        return HunterResult(domain, email=f"info@{domain}")
+
+    def close(self) -> None:
+        pass
+
+
+class Journal:
+    settled: dict = {}
+
+    def append(self, *args, **kwargs) -> None:
+        pass
+
+
+def pipeline(tmp_path) -> Pipeline:
+    args = argparse.Namespace(hunter=False, hunter_budget=None, hunter_min_value=0.0, scrape=False,
+                              concurrency=2, per_host=1)
+    columns = {"nombre": "nombre", "web": "web", "email": "email"}
+    p = Pipeline(args, columns, Journal(), writer=None, out_file=None)
+    p.hunter_cache = HunterCache(str(tmp_path / "hunter_cache.json"))
+    p.hunter = CountingHunter()
+    p.hunter_budget = 10
+    return p
+
+
+def test_negative_hunter_cache_entry_is_not_searched_again(tmp_path):
+    p = pipeline(tmp_path)
+    p.hunter_cache.put("nada.es", "")
+    try:
+        email, tier, settled = asyncio.run(p.resolve({"nombre": "Nada", "web": "https://www.nada.es/"}))
+    finally:
+        p.close()
+    assert (email, tier, settled) == ("", "", True)
+    assert p.hunter.searches == []
+    assert p.hunter_budget == 10
+
+
+def test_unknown_domain_is_searched_once(tmp_path):
+    p = pipeline(tmp_path)
+
+    async def both():
+        return await asyncio.gather(p.resolve({"nombre": "A", "web": "https://inmo.es"}),
+                                    p.resolve({"nombre": "B", "web": "https://inmo.es/oficina-2"}))
+    try:
+        results = asyncio.run(both())
+    finally:
+        p.close()
+    assert results == [("info@inmo.es", "hunter", True)] * 2
+    assert p.hunter.searches == ["inmo.es"]
+    assert p.hunter_cache.get("inmo.es")["email"] == "info@inmo.es"
@@ -0,0 +1,101 @@
+"""hunter_client.py (y search_plan de enrich_inmobiliarias_email.py) contra la API simulada de stub_servers.py."""
+
+import asyncio
+import time
+
+import hunter_cache
+from enrich_inmobiliarias_email import search_plan
+from hunter_cache import HunterCache, remaining_quota
+from hunter_client import HunterClient
+from stub_servers import StubHunter
+
+EMAILS = {f"inmo{i}.es": [f"ventas@inmo{i}.es", f"info@inmo{i}.es"] for i in range(10)}
+
+
+def search_all(client: HunterClient, domains: list[str]) -> dict:
+    async def collect():
+        return {r.domain: r async for r in client.search_many(domains)}
+
+    try:
+        return asyncio.run(collect())
+    finally:
+        client.close()
+
+
+def test_picks_the_best_email_and_empty_domains():
+    with StubHunter(EMAILS) as hunter:
+        results = search_all(HunterClient("k", base_url=hunter.url), ["inmo1.es", "nada.es"])
+    assert results["inmo1.es"].ok and results["inmo1.es"].email == "info@inmo1.es"
+    assert results["nada.es"].ok and results["nada.es"].email == ""
+
+
+def test_token_bucket_paces_requests():
+    domains = list(EMAILS)
+    with StubHunter(EMAILS) as hunter:
+        started = time.monotonic()
+        results = search_all(HunterClient("k", rate=20, burst=2, concurrency=8, base_url=hunter.url), domains)
+        times = sorted(t for t, _, _ in hunter.requests)
+    assert all(r.ok for r in results.values())
+    assert len(times) == len(domains)
+    # Ráfaga de 2 y luego 20/s: las 8 restantes necesitan al menos 0,4 s
+    assert times[-1] - started >= (len(domains) - 2) / 20 - 0.02
+    # En ninguna ventana llegan más que la ráfaga más lo que da el ritmo (+1 por el reparto de hilos)
+    assert all(j - i + 1 <= 2 + 20 * (times[j] - times[i]) + 1
+               for i in range(len(times)) for j in range(i + 1, len(times)))
+
+
+def test_rate_limit_429_honours_retry_after_for_the_whole_bucket():
+    script = {"inmo0.es": [(429, {"Retry-After": "1"})]}
+    with StubHunter(EMAILS, script=script) as hunter:
+        results = search_all(HunterClient("k", rate=50, burst=1, concurrency=3, base_url=hunter.url),
+                             ["inmo0.es", "inmo1.es", "inmo2.es", "inmo3.es"])
+        log = list(hunter.requests)
+    assert results["inmo0.es"].ok and results["inmo0.es"].email == "info@inmo0.es"
+    assert all(r.ok for r in results.values())
+    limited_at = next(t for t, _, status in log if status == 429)
+    # Nadie vuelve a llamar hasta que pasa el Retry-After
+    assert all(t - limited_at >= 0.95 for t, _, status in log if t > limited_at)
+
+
+def test_server_side_rate_limit_is_retried_until_it_passes():
+    with StubHunter(EMAILS, rate=5) as hunter:
+        results = search_all(HunterClient("k", rate=50, burst=3, concurrency=3, base_url=hunter.url),
+                             ["inmo1.es", "inmo2.es", "inmo3.es"])
+        statuses = [status for _, _, status in hunter.requests]
+    assert all(r.ok for r in results.values())
+    assert 429 in statuses and statuses.count(200) == 3
+
+
+def test_5xx_is_retried_and_4xx_is_not():
+    script = {"inmo0.es": [(503, {})], "inmo1.es": [(401, {})]}
+    with StubHunter(EMAILS, script=script) as hunter:
+        client = HunterClient("k", base_url=hunter.url)
+        client_results = search_all(client, ["inmo0.es", "inmo1.es"])
+        per_domain = [d for _, d, _ in hunter.requests]
+    assert client_results["inmo0.es"].ok and per_domain.count("inmo0.es") == 2
+    assert client_results["inmo1.es"].error == "HTTP 401" and per_domain.count("inmo1.es") == 1
+
+
+def test_quota_exhaustion_stops_spending_and_nothing_is_cached(tmp_path):
+    domains = [f"inmo{i}.es" for i in range(6)]
+    pending = {d: [{"Web": f"https://{d}"}] for d in domains}
+    cache = HunterCache(str(tmp_path / "hunter_cache.json"))
+    with StubHunter(EMAILS, quota=3) as hunter:
+        client = HunterClient("k", concurrency=1, base_url=hunter.url)
+        try:
+            enriched, failed = asyncio.run(search_plan(client, domains, pending, cache))
+        finally:
+            client.close()
+        calls = len(hunter.requests)
+    assert client.quota_exhausted
+    assert (enriched, failed) == (3, 3)
+    assert calls == 4   # 3 búsquedas y la que dice que no queda cuota; el resto no sale
+    assert len(cache.domains) == 3 and cache.used_this_month() == 3
+    assert sum(1 for rows in pending.values() if rows[0].get("Email_enriched")) == 3
+
+
+def test_remaining_quota_asks_the_account_endpoint(tmp_path, monkeypatch):
+    with StubHunter(EMAILS, quota=25) as hunter:
+        monkeypatch.setattr(hunter_cache, "ACCOUNT_URL", hunter.url + "/account")
+        hunter.used = 20
+        assert remaining_quota("k", HunterCache(str(tmp_path / "c.json"))) == 5
@@ -1,12 +1,18 @@
+import argparse
 import os
 import json
 import csv
+
+import pandas as pd
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 
+from plan_diff import PlanState, diff_plan
+
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+CSV_FILE = 'LIVIX_ULTIMATE_TIKTOK_90DAY_PLAN.csv'
 
 def get_service():
     creds = None
@@ -27,42 +33,17 @@ def get_service():
 
     return build('sheets', 'v4', credentials=creds)
 
-def upload_plan():
-    service = get_service()
-    csv_file = 'LIVIX_ULTIMATE_TIKTOK_90DAY_PLAN.csv'
-    
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        values = list(reader)
-
-    # Use the spreadsheet ID from the user's previous project or create a new one
-    # For a "Product of 10", we'll create a new, beautifully named one
-    spreadsheet_body = {
-        'properties': {
-            'title': 'LIVIX - Master Content Plan TikTok (Elite)'
-        }
-    }
-    
-    request = service.spreadsheets().create(body=spreadsheet_body, fields='spreadsheetId')
-    response = request.execute()
-    spreadsheet_id = response.get('spreadsheetId')
-    
-    print(f"Spreadsheet created: https://docs.google.com/spreadsheets/d/{spreadsheet_id}")
-
-    # Get the first sheet's title dynamically
-    sheet_metadata = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-    sheet_title = sheet_metadata['sheets'][0]['properties']['title']
-    sheet_id = sheet_metadata['sheets'][0]['properties']['sheetId']
-
-    # Write data
-    range_name = f"'{sheet_title}'!A1"
-    body = {
-        'values': values
-    }
-    service.spreadsheets().values().update(
-        spreadsheetId=spreadsheet_id, range=range_name,
-        valueInputOption='RAW', body=body).execute()
+def _runs(positions):
+    """Consecutive positions grouped as (start, end) ranges, end exclusive."""
+    runs = []
+    for pos in positions:
+        if runs and runs[-1][1] == pos:
+            runs[-1][1] = pos + 1
+        else:
+            runs.append([pos, pos + 1])
+    return [tuple(r) for r in runs]
 
+def format_header(service, spreadsheet_id, sheet_id):
     # Basic formatting: Bold header
     batch_update_spreadsheet_request_body = {
         'requests': [
@@ -90,7 +71,90 @@ def upload_plan():
     service.spreadsheets().batchUpdate(
         spreadsheetId=spreadsheet_id, body=batch_update_spreadsheet_request_body).execute()
 
-    print("Data uploaded and formatted successfully.")
+def apply_changes(service, spreadsheet_id, sheet_title, sheet_id, values, changes):
+    """Apply a plan_diff.SheetChanges to the sheet: only the rows that changed."""
+    rows = values[1:]   # data rows; row 0 is the header, hence the +1 / +2 offsets below
+    requests = []
+    # Removed rows bottom-up so earlier positions stay valid, then inserts top-down
+    for start, end in reversed(_runs(changes.removed)):
+        requests.append({'deleteDimension': {'range': {
+            'sheetId': sheet_id, 'dimension': 'ROWS', 'startIndex': start + 1, 'endIndex': end + 1}}})
+    for start, end in _runs(changes.added):
+        requests.append({'insertDimension': {'range': {
+            'sheetId': sheet_id, 'dimension': 'ROWS', 'startIndex': start + 1, 'endIndex': end + 1},
+            'inheritFromBefore': True}})
+    if requests:
+        service.spreadsheets().batchUpdate(
+            spreadsheetId=spreadsheet_id, body={'requests': requests}).execute()
+
+    data = [{'range': f"'{sheet_title}'!A{start + 2}", 'values': rows[start:end]}
+            for start, end in _runs(sorted(changes.added + changes.modified))]
+    if data:
+        service.spreadsheets().values().batchUpdate(
+            spreadsheetId=spreadsheet_id,
+            body={'valueInputOption': 'RAW', 'data': data}).execute()
+
+def upload_plan(csv_file=CSV_FILE, spreadsheet_id=None):
+    service = get_service()
+
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        values = list(reader)
+
+    created = not spreadsheet_id
+    if created:
+        # No existing spreadsheet given: create a new, beautifully named one
+        spreadsheet_body = {
+            'properties': {
+                'title': 'LIVIX - Master Content Plan TikTok (Elite)'
+            }
+        }
+
+        request = service.spreadsheets().create(body=spreadsheet_body, fields='spreadsheetId')
+        response = request.execute()
+        spreadsheet_id = response.get('spreadsheetId')
+
+        print(f"Spreadsheet created: https://docs.google.com/spreadsheets/d/{spreadsheet_id}")
+
+    # Get the first sheet's title dynamically
+    sheet_metadata = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
+    sheet_title = sheet_metadata['sheets'][0]['properties']['title']
+    sheet_id = sheet_metadata['sheets'][0]['properties']['sheetId']
+
+    # Diff against what was last uploaded to this sheet (row ids = first column, the day)
+    frame = pd.DataFrame(values[1:], columns=values[0]) if values else pd.DataFrame()
+    state = PlanState.load(f"sheets:{spreadsheet_id}:{sheet_id}")
+    changes, new_state = diff_plan({sheet_title: frame}, state)
+    sheet_changes = changes.sheets.get(sheet_title)
+
+    if sheet_changes is None:
+        print("Sheet already up to date, nothing to upload.")
+        return spreadsheet_id
+
+    if sheet_changes.rewrite:
+        # New sheet, different columns or reordered rows: write it whole
+        range_name = f"'{sheet_title}'!A1"
+        service.spreadsheets().values().clear(
+            spreadsheetId=spreadsheet_id, range=f"'{sheet_title}'", body={}).execute()
+        body = {
+            'values': values
+        }
+        service.spreadsheets().values().update(
+            spreadsheetId=spreadsheet_id, range=range_name,
+            valueInputOption='RAW', body=body).execute()
+        format_header(service, spreadsheet_id, sheet_id)
+    else:
+        apply_changes(service, spreadsheet_id, sheet_title, sheet_id, values, sheet_changes)
+
+    # Only remember the new state once the sheet actually has it
+    new_state.save()
+    print(f"Data uploaded and formatted successfully ({changes.summary()}).")
+    return spreadsheet_id
 
 if __name__ == "__main__":
-    upload_plan()
+    parser = argparse.ArgumentParser(description="Upload the 90-day plan CSV to Google Sheets.")
+    parser.add_argument("--csv", default=CSV_FILE)
+    parser.add_argument("--spreadsheet-id", default=os.getenv("SHEETS_SPREADSHEET_ID"),
+                        help="update this spreadsheet in place (only changed rows) instead of creating a new one")
+    args = parser.parse_args()
+    upload_plan(args.csv, args.spreadsheet_id)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+workbook_export.py
+------------------
+Motor común de exportación a Excel de los planes (TikTok, LinkedIn,
+combinado): un libro openpyxl en modo write-only, que escribe las filas en
+streaming en vez de montar todas las celdas en memoria.
+
+- Anchos de columna calculados sobre los DataFrames, no celda a celda:
+  longitud de cada texto con np.strings.str_len (en C) y un max por
+  columna, min(máx + 2, max_width).
+- Cabeceras con estilos con nombre (NamedStyle) registrados una vez en el
+  libro: las celdas de cabecera solo apuntan al estilo, sin Font/Fill por
+  celda. Ver HEADER_STYLES.
+- Escritura atómica: fichero temporal + os.replace, como lead_store.py.
+- write_plan(): lo mismo pero incremental (plan_diff.py): si ninguna hoja
+  ha cambiado desde la última escritura (ids y hashes de filas, columnas,
+  formato) y nadie ha tocado el fichero, no se reescribe. Devuelve el
+  Changeset para que quien suba el plan aplique solo esas filas.
+
+Uso:
+    from workbook_export import Sheet, write_plan, write_workbook
+    write_workbook("~/Desktop/plan.xlsx", [
+        Sheet("🗓️ Plan 90 Días", df_matrix),
+        Sheet("🪝 Hooks", df_hooks, header_style="header_linkedin", max_width=55),
+    ])
+    changes = write_plan(path, sheets)      # no escribe nada si el plan no cambió
+"""
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+from openpyxl.utils import get_column_letter
+
+from plan_diff import Changeset, PlanState, diff_plan
+
+# ── Config ─────────────────────────────────────────────────────────────────
+MAX_WIDTH = 60   # ancho máximo de columna (caracteres)
+PADDING   = 2
+
+# Nombre del estilo → color de fondo de la cabecera (texto blanco en negrita)
+HEADER_STYLES = {
+    "header_black":    "000000",   # TikTok
+    "header_dark":     "111111",
+    "header_linkedin": "0A66C2",   # azul LinkedIn
+}
+
+
+@dataclass
+class Sheet:
+    title: str
+    frame: pd.DataFrame
+    header_style: str = "header_black"
+    max_width: int = MAX_WIDTH
+    key: str | None = None   # columna con el id estable de cada fila (por defecto, la primera)
+
+
+def header_style(name: str) -> NamedStyle:
+    color = HEADER_STYLES[name]
+    return NamedStyle(
+        name=name,
+        font=Font(bold=True, color="FFFFFF"),
+        fill=PatternFill(start_color=color, end_color=color, fill_type="solid"),
+        alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+    )
+
+
+def column_widths(frame: pd.DataFrame, max_width: int = MAX_WIDTH) -> list[int]:
+    """Ancho de cada columna: el texto más largo (cabecera incluida) + PADDING, hasta max_width."""
+    widths = []
+    for position, name in enumerate(frame.columns):
+        values = frame.iloc[:, position]
+        text = np.asarray(values.where(values.notna(), "").to_numpy(dtype=object), dtype=np.dtypes.StringDType())
+        longest = int(np.strings.str_len(text).max(initial=0))
+        widths.append(min(max(longest, len(str(name))) + PADDING, max_width))
+    return widths
+
+
+def _rows(frame: pd.DataFrame):
+    """Filas como tuplas, con NaN → celda vacía (lo mismo que DataFrame.to_excel)."""
+    cleaned = frame.astype(object).where(frame.notna(), None)
+    return cleaned.itertuples(index=False, name=None)
+
+
+def write_workbook(path: str, sheets: list[Sheet]) -> str:
+    """Escribe `sheets` en `path` (se sobrescribe). Devuelve la ruta final."""
+    path = os.path.expanduser(path)
+    workbook = Workbook(write_only=True)
+    for name in dict.fromkeys(s.header_style for s in sheets):
+        workbook.add_named_style(header_style(name))
+
+    for sheet in sheets:
+        ws = workbook.create_sheet(title=sheet.title)
+        # En write-only los anchos tienen que ir antes de la primera fila
+        for i, width in enumerate(column_widths(sheet.frame, sheet.max_width), start=1):
+            ws.column_dimensions[get_column_letter(i)].width = width
+        header = []
+        for name in sheet.frame.columns:
+            cell = WriteOnlyCell(ws, value=str(name))
+            cell.style = sheet.header_style
+            header.append(cell)
+        ws.append(header)
+        for row in _rows(sheet.frame):
+            ws.append(row)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp.xlsx"
+    try:
+        workbook.save(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return path
+
+
+def write_plan(path: str, sheets: list[Sheet], force: bool = False) -> Changeset:
+    """
+    write_workbook() solo si el plan cambió desde la última vez (o `force`).
+    Devuelve el Changeset respecto a lo que había escrito.
+    """
+    path = os.path.abspath(os.path.expanduser(path))
+    state = PlanState.load(path)
+    changes, new_state = diff_plan(
+        {s.title: s.frame for s in sheets}, state,
+        keys={s.title: s.key for s in sheets if s.key},
+        layouts={s.title: f"{s.header_style}|{s.max_width}" for s in sheets},
+    )
+    state_path = PlanState.path_for(path)
+    # Editado a mano después de exportarlo, o con las hojas en otro orden: se rehace
+    stale = not os.path.exists(path) or not os.path.exists(state_path) \
+        or os.path.getmtime(path) > os.path.getmtime(state_path) or list(state.sheets) != list(new_state.sheets)
+    if changes.empty and not stale and not force:
+        return changes
+    write_workbook(path, sheets)
+    new_state.save()
+    return changes